@@ -1,8 +1,10 @@
 
 from .mom_agent import generate_mom
 from .reasoning_agent import reason_about_user
+from .summary_agent import summarize_turns
 
 __all__ = [
     'generate_mom',
-    'reason_about_user'
+    'reason_about_user',
+    'summarize_turns'
 ]
\ No newline at end of file
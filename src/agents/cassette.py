@@ -0,0 +1,213 @@
+# src/agents/cassette.py
+"""
+Record/replay of Gemini calls.
+
+- record: the real client is called and every response (streamed chunks with
+  the delay before each one, or the full text) is appended to a JSONL cassette
+- replay: a local stand-in with the same surface (client.models.
+  generate_content_stream / generate_content) serves the recorded responses,
+  with the recorded timing scaled by LLM_CASSETTE_SPEED; no network
+- calls are matched on model + prompt + config; a prompt that was never
+  recorded gets the same agent's recordings in turn (unless strict), so a
+  load test can run many more turns than were recorded
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from configs import settings
+from utils.logger import logger
+
+
+class CassetteMiss(LookupError):
+    """Replay found nothing to serve for a call."""
+
+
+class _Response:
+    """What the agents read from a Gemini response or stream chunk."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+def call_key(model: str, contents, config) -> str:
+    payload = json.dumps(
+        {"model": model, "contents": contents, "config": config},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Usage:
+        cassette = Cassette("cassettes/gemini.jsonl", "replay", speed=10)
+        client = cassette.wrap(genai.Client(api_key=...), "reasoning")
+    """
+
+    def __init__(self, path: str, mode: str, speed: float = 1.0, strict: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self.strict = strict
+        self._by_key: Dict[str, List[Dict]] = defaultdict(list)
+        self._by_agent: Dict[str, List[Dict]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key[entry["key"]].append(entry)
+                self._by_agent[entry["agent"]].append(entry)
+        logger.info(f"Cassette {self.path}: {sum(len(v) for v in self._by_agent.values())} recorded calls")
+
+    def wrap(self, client, agent: str):
+        """The client the agent should use: recording proxy or offline stand-in."""
+        return _CassetteClient(self, client if self.mode == "record" else None, agent)
+
+    # ---------------- record ----------------
+
+    def save(self, agent: str, key: str, model: str, prompt, chunks: List[Dict], stream: bool):
+        entry = {"key": key, "agent": agent, "model": model, "stream": stream, "prompt": prompt, "chunks": chunks}
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    # ---------------- replay ----------------
+
+    def lookup(self, agent: str, key: str) -> Dict:
+        """Recordings of one key are served in order and then repeat."""
+        with self._lock:
+            entries = self._by_key.get(key)
+            if entries:
+                self.hits += 1
+                pool, slot = entries, key
+            else:
+                self.misses += 1
+                pool, slot = self._by_agent.get(agent), f"agent:{agent}"
+                if self.strict or not pool:
+                    raise CassetteMiss(f"No recorded {agent} call for key {key[:12]}")
+            entry = pool[self._served[slot] % len(pool)]
+            self._served[slot] += 1
+        return entry
+
+    def delay(self, seconds: float):
+        if self.speed > 0 and seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
+
+
+class _Models:
+    """The client.models surface the agents use."""
+
+    def __init__(self, cassette: Cassette, client, agent: str):
+        self.cassette = cassette
+        self.client = client
+        self.agent = agent
+
+    def generate_content_stream(self, model: str, contents, config=None) -> Iterator[_Response]:
+        key = call_key(model, contents, config)
+        if self.client is None:
+            return self._replay_stream(key)
+        return self._record_stream(key, model, contents, config)
+
+    def generate_content(self, model: str, contents, config=None) -> _Response:
+        key = call_key(model, contents, config)
+        if self.client is None:
+            entry = self.cassette.lookup(self.agent, key)
+            self.cassette.delay(sum(c["delay"] for c in entry["chunks"]))
+            return _Response("".join(c["text"] for c in entry["chunks"]))
+        started = time.perf_counter()
+        response = self.client.models.generate_content(model=model, contents=contents, config=config)
+        chunks = [{"delay": round(time.perf_counter() - started, 4), "text": response.text or ""}]
+        self.cassette.save(self.agent, key, model, contents, chunks, stream=False)
+        return response
+
+    def _replay_stream(self, key: str) -> Iterator[_Response]:
+        entry = self.cassette.lookup(self.agent, key)  # a miss raises before the first chunk
+        return self._play(entry)
+
+    def _play(self, entry: Dict) -> Iterator[_Response]:
+        for chunk in entry["chunks"]:
+            self.cassette.delay(chunk["delay"])
+            yield _Response(chunk["text"])
+
+    def _record_stream(self, key: str, model: str, contents, config) -> Iterator[_Response]:
+        stream = self.client.models.generate_content_stream(model=model, contents=contents, config=config)
+        chunks = []
+        last = time.perf_counter()
+        complete = False
+        try:
+            for chunk in stream:
+                now = time.perf_counter()
+                chunks.append({"delay": round(now - last, 4), "text": chunk.text or ""})
+                last = now
+                yield chunk
+            complete = True
+        finally:
+            # a stream the agent abandoned (cancelled speculation) is not a usable recording
+            if complete:
+                self.cassette.save(self.agent, key, model, contents, chunks, stream=True)
+
+
+class _CassetteClient:
+
+    def __init__(self, cassette: Cassette, client, agent: str):
+        self.models = _Models(cassette, client, agent)
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The process-wide cassette from settings, None when LLM_CASSETTE_MODE is off."""
+    global _cassette
+    if settings.LLM_CASSETTE_MODE == "off":
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(
+                settings.LLM_CASSETTE_PATH,
+                settings.LLM_CASSETTE_MODE,
+                speed=settings.LLM_CASSETTE_SPEED,
+                strict=settings.LLM_CASSETTE_STRICT,
+            )
+        return _cassette
+
+
+def make_client(agent: str, api_key: Optional[str]):
+    """genai client for an agent, wrapped in the cassette if one is configured."""
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        return cassette.wrap(None, agent)
+    from google import genai
+
+    client = genai.Client(api_key=api_key)
+    return cassette.wrap(client, agent) if cassette is not None else client
@@ -1,12 +1,12 @@
 # src/agents/mom_agent.py
 
 import json
-from google import genai
 from configs import settings
 from datetime import datetime
 from data import property_knowledge
+from .cassette import make_client
 
-client=genai.Client(api_key=settings.mom_key)
+client = make_client("mom", settings.mom_key)
 
 def generate_mom(
     transcript: str,
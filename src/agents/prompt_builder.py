@@ -0,0 +1,226 @@
+# src/agents/prompt_builder.py
+"""
+Reasoning prompt assembly under a token budget.
+- static knowledge (company, loans, discounts, price trends, area info) is
+  serialised once at import, compactly
+- sections are picked from the utterance, the location known so far and the
+  previous intent, with one precompiled regex per section
+- summary, history, entities and knowledge share PROMPT_TOKEN_BUDGET: pieces
+  are added in priority order and whatever does not fit is dropped (history
+  from the oldest turn, the summary from its start)
+- tokens per section are logged every turn
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from configs import settings
+from configs.prompts import REASONING_PROMPT
+from data import property_knowledge
+from utils.logger import logger
+
+
+def estimate_tokens(text: str) -> int:
+    """About 4 characters per token for English / JSON; no tokenizer round trip."""
+    return (len(text) + 3) // 4
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _company_section(info: Dict[str, Any]) -> str:
+    return (
+        f"{info.get('name')}, est. {info.get('established')}, head office {info.get('head_office')}; "
+        f"branches: {', '.join(info.get('branch_offices', []))}; "
+        f"{info.get('total_deals')} deals worth {info.get('total_value')}; "
+        f"rating {info.get('customer_rating')}; awards: {'; '.join(info.get('awards', []))}"
+    )
+
+
+def _price_trend_lines(trends: Dict[str, Any]) -> Dict[str, str]:
+    """Locality (lowercase) -> "Powai: 11% growth, ..."."""
+    lines = {}
+    for city, areas in trends.items():
+        if isinstance(areas, dict):
+            for area, trend in areas.items():
+                lines[area.lower()] = f"{area} ({city}): {trend}"
+    return lines
+
+
+COMPANY = _company_section(property_knowledge.COMPANY_INFO)
+LOANS = compact_json(property_knowledge.LOAN_INFO)
+DISCOUNTS = compact_json(property_knowledge.DISCOUNT_POLICY)
+PRICE_TRENDS = compact_json(property_knowledge.PRICE_TRENDS)
+_AREA_TRENDS = _price_trend_lines(property_knowledge.PRICE_TRENDS)
+_AREA_INFO = {area.lower(): f"{area}: {info}" for area, info in property_knowledge.AREA_INFO.items()}
+_AREA_NAMES = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, set(_AREA_INFO) | set(_AREA_TRENDS)), key=len, reverse=True)) + r")\b"
+)
+
+# section -> (utterance pattern, intents that keep it in the next turn)
+_TRIGGERS = {
+    "loans": (
+        re.compile(r"\b(loans?|emis?|banks?|interest rates?|mortgages?|financ\w*|funding|down ?payment)\b"),
+        ("loan", "finance", "emi"),
+    ),
+    "discounts": (
+        re.compile(r"\b(discounts?|offers?|festivals?|deals?|negotiab\w*|cheaper|referrals?|diwali)\b"),
+        ("discount", "negotiation", "price_negotiation", "objection"),
+    ),
+    "price_trends": (
+        re.compile(r"\b(trends?|growth|apprecia\w*|invest\w*|returns?|roi|market|hotspots?|future)\b"),
+        ("investment", "market"),
+    ),
+    "area_info": (
+        re.compile(r"\b(area|locality|neighbou?rhood|connectivity|schools?|hospitals?|nearby|surroundings)\b"),
+        ("area", "location_info", "locality"),
+    ),
+}
+
+# knowledge sections in the order they are dropped last to first
+_KNOWLEDGE_ORDER = ("matching_properties", "loans", "discounts", "area", "price_trends", "recommended", "company")
+
+
+def select_sections(user_text: str, location: Optional[str] = None, last_intent: Optional[str] = None) -> Dict[str, str]:
+    """Knowledge sections relevant to this turn, name -> text."""
+    text = user_text.lower()
+    intent = (last_intent or "").lower()
+    wanted = {
+        name for name, (pattern, intents) in _TRIGGERS.items()
+        if pattern.search(text) or any(i in intent for i in intents)
+    }
+
+    sections = {}
+    if "loans" in wanted:
+        sections["loans"] = f"Loan Information:\n{LOANS}"
+    if "discounts" in wanted:
+        sections["discounts"] = f"Discount Policy:\n{DISCOUNTS}"
+
+    # localities named now, or earlier in the call
+    areas = list(dict.fromkeys(_AREA_NAMES.findall(f"{text} {(location or '').lower()}")))
+    if areas and (wanted & {"area_info", "price_trends"} or _AREA_NAMES.search(text)):
+        lines = [_AREA_INFO[a] for a in areas if a in _AREA_INFO]
+        lines += [_AREA_TRENDS[a] for a in areas if a in _AREA_TRENDS]
+        sections["area"] = "Area Insights:\n" + "\n".join(lines)
+    if "price_trends" in wanted:
+        sections["price_trends"] = f"Price Trends:\n{PRICE_TRENDS}"
+    return sections
+
+
+def _fit_tail(text: str, tokens: int) -> str:
+    """The end of `text` within `tokens` (a running summary is newest last)."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    if tokens <= 0:
+        return ""
+    return "..." + text[-(tokens * 4 - 3):]
+
+
+def _render_turn(turn) -> str:
+    speaker = "User" if turn.role == "user" else "Assistant"
+    suffix = " [interrupted]" if getattr(turn, "interrupted", False) else ""
+    return f"{speaker}: {turn.text}{suffix}"
+
+
+_TEMPLATE_TOKENS = estimate_tokens(REASONING_PROMPT.format(
+    company_context="", summary="", history="", entities="", user_text=""
+))
+
+
+def build_reasoning_prompt(
+    user_text: str,
+    summary: str,
+    history: Sequence,
+    entities: Dict[str, Any],
+    matching_properties: List[Dict[str, Any]],
+    recommended: str = "",
+    location: Optional[str] = None,
+    last_intent: Optional[str] = None,
+    budget: Optional[int] = None,
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Args:
+        history: Turn objects, oldest first, not including user_text.
+        recommended: preformatted recommendation rows with their heading, or "".
+        budget: tokens shared by summary, history, entities and knowledge
+                (PROMPT_TOKEN_BUDGET by default); template and utterance are extra.
+
+    Returns:
+        (prompt, tokens per section)
+    """
+    budget = settings.PROMPT_TOKEN_BUDGET if budget is None else budget
+    remaining = budget
+    used: Dict[str, int] = {}
+
+    def take(name: str, text: str) -> bool:
+        nonlocal remaining
+        cost = estimate_tokens(text)
+        if cost > remaining:
+            return False
+        remaining -= cost
+        used[name] = used.get(name, 0) + cost
+        return True
+
+    # the caller's known requirements, then the last exchange, then the listings
+    entities_text = compact_json(entities)
+    take("entities", entities_text)
+
+    turns = [_render_turn(t) for t in history]
+    kept: List[str] = []
+    for line in reversed(turns[-2:]):
+        if not take("history", line + "\n"):
+            break
+        kept.insert(0, line)
+
+    candidates = select_sections(user_text, location, last_intent)
+    candidates["matching_properties"] = f"Matching Properties:\n{compact_json(matching_properties)}"
+    if recommended:
+        candidates["recommended"] = recommended
+    candidates["company"] = f"Company: {COMPANY}"
+    knowledge: Dict[str, str] = {}
+
+    def add_knowledge(name: str):
+        if name in candidates and take("knowledge", candidates[name] + "\n"):
+            knowledge[name] = candidates[name]
+
+    add_knowledge("matching_properties")
+    summary_text = _fit_tail(summary.strip(), remaining)
+    take("summary", summary_text)
+    for name in _KNOWLEDGE_ORDER[1:]:
+        add_knowledge(name)
+
+    # older turns with whatever is left
+    if len(kept) == len(turns[-2:]):
+        for line in reversed(turns[:-2]):
+            if not take("history", line + "\n"):
+                break
+            kept.insert(0, line)
+
+    company_context = "\n".join(knowledge[name] for name in _KNOWLEDGE_ORDER if name in knowledge)
+    prompt = REASONING_PROMPT.format(
+        company_context=company_context,
+        summary=summary_text,
+        history="\n".join(kept),
+        entities=entities_text,
+        user_text=user_text,
+    )
+
+    counts = {
+        "template": _TEMPLATE_TOKENS,
+        "user_text": estimate_tokens(user_text),
+        "summary": used.get("summary", 0),
+        "history": used.get("history", 0),
+        "entities": used.get("entities", 0),
+        "knowledge": used.get("knowledge", 0),
+    }
+    counts["total"] = sum(counts.values())
+    included = ",".join(name for name in _KNOWLEDGE_ORDER if name in knowledge)
+    dropped = [name for name in candidates if name not in knowledge]
+    logger.info(
+        "Prompt tokens: " + " ".join(f"{k}={v}" for k, v in counts.items())
+        + f" (budget {budget}, {len(kept)}/{len(turns)} turns, knowledge: {included or '-'}"
+        + (f", dropped: {','.join(dropped)})" if dropped else ")")
+    )
+    return prompt, counts
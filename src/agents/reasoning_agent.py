@@ -1,52 +1,88 @@
 import json
 import re
-from google import genai
+import threading
+import time
+from typing import Callable, Optional, Sequence
 from configs import settings
-from configs.prompts import REASONING_PROMPT
 from utils.logger import logger
-from data import property_knowledge
-
-client = genai.Client(api_key=settings.reasoning_key)
-
-
-def reason_about_user(user_text: str, summary: str, entities: dict) -> dict:
-
-    company_info = property_knowledge.COMPANY_INFO
-    properties_sample = property_knowledge.PROPERTIES[:4]
-    loan_info = property_knowledge.LOAN_INFO
-    discount_policy = property_knowledge.DISCOUNT_POLICY
-
-    text_lower = user_text.lower()
-    extra_context = ""
-
-    loan_keywords = ["loan", "emi", "bank", "interest", "mortgage", "finance", "funding"]
-    discount_keywords = ["discount", "offer", "festival", "deal", "negotiable"]
-
-    if any(word in text_lower for word in loan_keywords):
-        extra_context += f"\nLoan Information:\n{json.dumps(loan_info, indent=2)}"
-
-    if any(word in text_lower for word in discount_keywords):
-        extra_context += f"\nDiscount Policy:\n{json.dumps(discount_policy, indent=2)}"
-
-    company_context = f"""
-Company Name: {company_info.get("name")}
-Established: {company_info.get("established")}
-Head Office: {company_info.get("head_office")}
-Customer Rating: {company_info.get("customer_rating")}
-
-Sample Properties:
-{json.dumps(properties_sample, indent=2)}
-
-{extra_context}
-"""
+from utils.text_stream import JSONFieldStreamer, SentenceBuffer
+from data.catalog import open_catalog
+from data.recommender import ROW_HEADER, Recommender, format_rows
+from .cassette import make_client
+from .prompt_builder import build_reasoning_prompt
+
+# live Gemini, or the record/replay cassette (LLM_CASSETTE_MODE)
+client = make_client("reasoning", settings.reasoning_key)
+
+# listings relevant to the utterance and the entities gathered so far; an
+# import into CATALOG_DB shows up on the next turn
+catalog = open_catalog()
+# listings that fit the caller's budget / location / configuration so far
+recommender = Recommender(catalog)
+
+FALLBACK_RESULT = {
+    "intent": "unknown",
+    "entities": {},
+    "sentiment": "neutral",
+    "final_response": "I'm sorry, I am facing a temporary issue. Could you please repeat that?",
+    "lead_stage": "new",
+    "end_call": False
+}
+
+
+def reason_about_user(
+    user_text: str,
+    summary: str,
+    entities: dict,
+    cancel_event: Optional[threading.Event] = None,
+    on_sentence: Optional[Callable[[str], None]] = None,
+    trace=None,
+    business_state: Optional[dict] = None,
+    history: Sequence = (),
+    last_intent: Optional[str] = None,
+) -> dict:
+    """
+    Args:
+        summary: running summary of the call, without the recent turns.
+        cancel_event: set it to abandon the request (speculative calls).
+        on_sentence: receives each complete sentence of final_response while the
+                     JSON is still streaming. The result then has "streamed": True.
+        trace: optional TurnTrace; gets prompt_build, llm_first_token,
+               llm_first_sentence and llm_full_json spans.
+        business_state: session.business_state; adds recommended listings beyond
+                        the ones matching the utterance.
+        history: recent Turn objects before user_text, oldest first; trimmed
+                 to PROMPT_TOKEN_BUDGET together with summary and knowledge.
+        last_intent: intent of the previous turn, keeps e.g. loan details
+                     in context for a follow-up question.
+    """
+    started = time.perf_counter()
+
+    business_state = business_state or {}
+    matching_properties = catalog.match(user_text, entities, k=settings.PROMPT_PROPERTIES_K)
+    recommended = recommender.recommend(
+        business_state,
+        k=settings.PROMPT_RECOMMENDATIONS_K,
+        exclude=[p.get("id") for p in matching_properties],
+    )
 
-    prompt = REASONING_PROMPT.format(
-        summary=summary,
-        entities=json.dumps(entities),
+    prompt, _ = build_reasoning_prompt(
         user_text=user_text,
-        company_context=company_context
+        summary=summary,
+        history=history,
+        entities=entities,
+        matching_properties=matching_properties,
+        recommended=f"Recommended For This Caller ({ROW_HEADER}):\n{format_rows(recommended)}" if recommended else "",
+        location=business_state.get("location") or entities.get("location"),
+        last_intent=last_intent,
     )
 
+    extractor = JSONFieldStreamer("final_response")
+    streamed = False
+    requested = time.perf_counter()
+    if trace is not None:
+        trace.span("prompt_build", started, requested)
+
     try:
         stream = client.models.generate_content_stream(
             model=settings.GEMINI_MODEL,
@@ -56,16 +92,52 @@ Sample Properties:
             }
         )
         full_text = ""
+        sentences = SentenceBuffer()
+
+        def emit(sentence: str):
+            nonlocal streamed
+            if trace is not None and not streamed:
+                trace.span("llm_first_sentence", requested)
+            streamed = True
+            on_sentence(sentence)
+
         for chunk in stream:
+            if cancel_event is not None and cancel_event.is_set():
+                # speculative request superseded, stop reading the stream
+                return dict(FALLBACK_RESULT, cancelled=True)
             if chunk.text:
+                if trace is not None and not full_text:
+                    trace.span("llm_first_token", requested)
                 full_text += chunk.text
-        
+                if on_sentence is not None and not extractor.done:
+                    for sentence in sentences.push(extractor.feed(chunk.text)):
+                        emit(sentence)
+                    if extractor.done:
+                        # last sentence has no trailing space, speak it now
+                        rest = sentences.flush()
+                        if rest:
+                            emit(rest)
+        if on_sentence is not None:
+            rest = sentences.flush()
+            if rest:
+                emit(rest)
+        if trace is not None:
+            trace.span("llm_full_json", requested)
+
         text = full_text.strip()
         match = re.search(r'\{.*\}', text, re.DOTALL)
         if match:
-            result = json.loads(match.group(0))
-
-            if not result.get("final_response"):
+            try:
+                result = json.loads(match.group(0))
+            except json.JSONDecodeError as e:
+                if not streamed:
+                    raise
+                logger.error(f"Reasoning JSON invalid after streaming: {e}")
+                result = dict(FALLBACK_RESULT, final_response=extractor.text)
+
+            if streamed:
+                result["streamed"] = True
+            elif not result.get("final_response"):
                 result["final_response"] = "Could you please clarify that?"
 
             return result
@@ -75,11 +147,7 @@ Sample Properties:
     except Exception as e:
         logger.error(f"Reasoning model call failed: {e}")
 
-    return {
-        "intent": "unknown",
-        "entities": {},
-        "sentiment": "neutral",
-        "final_response": "I'm sorry, I am facing a temporary issue. Could you please repeat that?",
-        "lead_stage": "new",
-        "end_call": False
-    }
\ No newline at end of file
+    if streamed:
+        # part of the reply was already spoken, record that instead of the apology
+        return dict(FALLBACK_RESULT, final_response=extractor.text, streamed=True)
+    return dict(FALLBACK_RESULT)
\ No newline at end of file
@@ -0,0 +1,148 @@
+# src/agents/speculative.py
+"""
+Speculative reasoning on stable partial transcripts.
+- once the partial transcript has not changed for `stable_ms`, the reasoning
+  call is started in the background with that text
+- at end of speech, if the final transcript matches the speculative input
+  (ignoring case, punctuation and filler words) the result is reused,
+  otherwise the speculative request is cancelled and re-issued
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from utils.logger import logger
+from utils.metrics import LatencyStats
+
+
+FILLER_WORDS = {"um", "uh", "erm", "hmm", "ah", "oh", "like", "so", "okay", "ok"}
+
+
+def normalize_transcript(text: str) -> str:
+    words = re.sub(r"[^\w\s']", " ", text.lower()).split()
+    return " ".join(w for w in words if w not in FILLER_WORDS)
+
+
+class SpeculativeReasoner:
+    """
+    One instance per call.
+
+    Args:
+        reason_func: (user_text, cancel_event, on_sentence=None, trace=None) -> reasoning dict.
+                     Must build the same prompt the final path would build for that text.
+        stable_ms: how long a partial must stay unchanged before speculating.
+    """
+
+    def __init__(self, reason_func: Callable[[str, threading.Event], Dict], stable_ms: int):
+        self.reason_func = reason_func
+        self.stable_seconds = stable_ms / 1000.0
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._lock = threading.Lock()
+
+        self._partial = ""
+        self._partial_raw = ""
+        self._partial_since = 0.0
+        self._spec_text: Optional[str] = None
+        self._spec_started = 0.0
+        self._spec_future: Optional[Future] = None
+        self._spec_cancel: Optional[threading.Event] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.launched = 0
+        self.latency_saved = LatencyStats()
+
+    def observe_partial(self, text: str):
+        """Record the latest partial transcript."""
+        norm = normalize_transcript(text)
+        with self._lock:
+            self._partial_raw = text
+            if norm != self._partial:
+                self._partial = norm
+                self._partial_since = time.perf_counter()
+
+    def maybe_start(self):
+        """Start a speculative request if the partial has been stable long enough."""
+        with self._lock:
+            if not self._partial:
+                return
+            if time.perf_counter() - self._partial_since < self.stable_seconds:
+                return
+            if self._spec_text == self._partial:
+                return
+            self._cancel_locked()
+            self._spec_text = self._partial
+            self._spec_started = time.perf_counter()
+            self._spec_cancel = threading.Event()
+            self._spec_future = self._executor.submit(self.reason_func, self._partial_raw, self._spec_cancel)
+            self.launched += 1
+            logger.debug(f"Speculative reasoning started on: {self._partial_raw}")
+
+    def _cancel_locked(self):
+        if self._spec_future is not None:
+            self._spec_cancel.set()
+            self._spec_future.cancel()
+        self._spec_text = None
+        self._spec_future = None
+        self._spec_cancel = None
+
+    def resolve(self, final_text: str, on_sentence: Optional[Callable[[str], None]] = None, trace=None) -> Dict:
+        """
+        Reasoning result for the final transcript, reusing the speculative
+        request when its input matches. A re-issued request streams its
+        sentences to `on_sentence` and records its spans on `trace`; a reused
+        one is returned whole.
+        """
+        with self._lock:
+            future, spec_text, started = self._spec_future, self._spec_text, self._spec_started
+            matched = future is not None and spec_text == normalize_transcript(final_text)
+            if not matched:
+                if future is not None:
+                    self.misses += 1
+                self._cancel_locked()
+            else:
+                self._spec_text = None
+                self._spec_future = None
+                self._spec_cancel = None
+            self._partial = ""
+
+        if matched:
+            final_ready = time.perf_counter()
+            try:
+                result = future.result()
+                if not result.get("cancelled"):
+                    self.hits += 1
+                    # the final request would have started now and taken as long as the speculative one
+                    done = time.perf_counter()
+                    self.latency_saved.record(min(final_ready - started, done - started))
+                    if trace is not None:
+                        trace.span("speculative_wait", final_ready, done)
+                    return result
+            except Exception as e:
+                logger.error(f"Speculative reasoning failed: {e}")
+            self.misses += 1
+
+        return self.reason_func(final_text, threading.Event(), on_sentence, trace)
+
+    def reset(self):
+        """Drop any speculation, e.g. when the utterance is discarded."""
+        with self._lock:
+            self._cancel_locked()
+            self._partial = ""
+
+    def stats(self) -> Dict:
+        resolved = self.hits + self.misses
+        return {
+            "launched": self.launched,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / resolved, 3) if resolved else 0.0,
+            "latency_saved": self.latency_saved.summary(),
+        }
+
+    def close(self):
+        self.reset()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,30 @@
+# src/agents/summary_agent.py
+
+from configs import settings
+from configs.prompts import SUMMARY_PROMPT
+from .cassette import make_client
+
+client = make_client("summary", settings.summarizer_key or settings.GEMINI_API_KEY)
+
+
+def summarize_turns(summary: str, transcript: str) -> str:
+    """
+    Running summary extended with `transcript` (older turns, one per line).
+    Raises on failure so the caller keeps the previous summary and retries later.
+    """
+    prompt = SUMMARY_PROMPT.format(
+        summary=summary or "(nothing yet)",
+        transcript=transcript,
+        max_words=settings.SUMMARY_MAX_WORDS,
+    )
+    response = client.models.generate_content(
+        model=settings.GEMINI_MODEL,
+        contents=prompt,
+        config={
+            "temperature": 0.2,
+        }
+    )
+    text = (response.text or "").strip()
+    if not text:
+        raise ValueError("empty summary")
+    return text
@@ -0,0 +1,112 @@
+# src/benchmarks/bench_catalog.py
+"""
+Catalog benchmark: synthetic inventory in the SQLite catalog.
+- N listings (default 100k) over the localities of the seed catalog plus more,
+  random type / BHK / price / amenities
+- reports bulk import time, then p50/p99 latency of indexed filters
+  (location + price range, type + BHK), of utterance matching (FTS + budget)
+  and of the vectorized recommender over the whole catalog
+
+Usage:
+    python src/benchmarks/bench_catalog.py [listings] [--db catalog.db]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data.catalog import CatalogStore
+from data.recommender import Recommender
+
+
+LOCALITIES = [
+    "Andheri East, Mumbai", "Andheri West, Mumbai", "Powai, Mumbai", "Borivali West, Mumbai",
+    "Malad East, Mumbai", "Worli, Mumbai", "Juhu, Mumbai", "Bandra West, Mumbai", "Lonavala",
+    "Kharghar, Navi Mumbai", "Vashi, Navi Mumbai", "Thane West, Thane", "Kalyan, Thane",
+    "Hinjewadi, Pune", "Baner, Pune", "Wakad, Pune",
+]
+TYPES = ["flat", "flat", "flat", "villa", "penthouse", "plot", "farm house", "sea-facing villa"]
+AMENITIES = ["gym", "swimming pool", "parking", "security", "club house", "garden", "park",
+             "children's play area", "private terrace", "jacuzzi", "orchard", "party lawn"]
+UTTERANCES = [
+    "Do you have plots in Lonavala?",
+    "I want a 3 bhk flat in Powai under 2 crore",
+    "any villa near Juhu with a swimming pool",
+    "something in Thane around 80 lakhs",
+    "2 bhk apartment in Baner",
+    "show me penthouses above 5 crore",
+]
+
+
+def synthetic_listings(n: int):
+    rng = random.Random(0)
+    for i in range(n):
+        kind = rng.choice(TYPES)
+        bhk = None if kind == "plot" else rng.randint(1, 6)
+        lakhs = rng.uniform(40, 1500)
+        price = f"{lakhs / 100:.2f} Crore" if lakhs >= 100 else f"{lakhs:.0f} Lakhs"
+        yield {
+            "id": f"S{i:06d}",
+            "type": kind,
+            "bhk": bhk,
+            "price": price,
+            "location": rng.choice(LOCALITIES),
+            "area": f"{rng.randint(400, 6000)} sq.ft.",
+            "amenities": rng.sample(AMENITIES, rng.randint(0, 4)),
+            "description": f"{bhk or ''} {kind} {rng.choice(['with a view', 'near the station', 'gated community', 'corner unit'])}",
+            "status": rng.choice(["ready to move", "under construction"]),
+        }
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("listings", nargs="?", type=int, default=100_000)
+    parser.add_argument("--db", default=":memory:")
+    parser.add_argument("--repeats", type=int, default=500)
+    args = parser.parse_args()
+
+    catalog = CatalogStore(args.db)
+    records = list(synthetic_listings(args.listings))
+    start = time.perf_counter()
+    catalog.import_records(records, replace=True)
+    print(f"import {args.listings} listings: {time.perf_counter() - start:.2f} s (fts={catalog.fts})")
+
+    recommender = Recommender(catalog)
+    start = time.perf_counter()
+    recommender.recommend({"location": "Powai"})
+    print(f"recommender features: {time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(1)
+    filters = [
+        ("location + price", lambda i: catalog.filter(location=rng.choice(LOCALITIES).split(",")[0],
+                                                      min_price=5e6, max_price=2e7, limit=10)),
+        ("type + bhk", lambda i: catalog.filter(type="flat", bhk=rng.randint(1, 4), limit=10)),
+        ("city + bhk + max", lambda i: catalog.filter(location="pune", bhk=2, max_price=1e7, limit=10)),
+        ("match utterance", lambda i: catalog.match(UTTERANCES[i % len(UTTERANCES)], k=3)),
+        ("match + entities", lambda i: catalog.match("what about amenities", {"location": "Powai", "budget": "under 3 crore"}, k=3)),
+        ("recommend", lambda i: recommender.recommend(
+            {"location": rng.choice(LOCALITIES), "budget": "under 2 crore", "configuration": "3 BHK flat"},
+            k=3, amenities=["gym"])),
+    ]
+    for name, fn in filters:
+        p50, p99 = timed(fn, args.repeats)
+        print(f"  {name:<18} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
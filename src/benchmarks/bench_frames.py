@@ -0,0 +1,136 @@
+# src/benchmarks/bench_frames.py
+"""
+Allocation benchmark: bytearray buffering vs AudioFrame + UtteranceRingBuffer.
+- 10 minute synthetic call at 16 kHz in 512-sample chunks, about half speech
+- both paths do the same work per chunk as the live pipeline minus the models:
+  float32 for the VAD, buffering, a streaming-STT pass every 500 ms over the
+  growing utterance and the final ASR input at end of speech
+- reports wall time, bytes allocated (sum of per-chunk tracemalloc peaks),
+  float32 conversions and peak traced memory (the ring is allocated before
+  tracing starts and stays fixed, the bytearray grows with the utterance)
+
+Usage:
+    python src/benchmarks/bench_frames.py [minutes]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mainflow.utterance_buffer import UtteranceRingBuffer
+from utils.audio_frame import AudioFrame
+
+
+SAMPLE_RATE = 16000
+CHUNK = 512
+PARTIAL_EVERY = SAMPLE_RATE // 2 // CHUNK   # chunks between streaming passes
+PARTIAL_MIN = SAMPLE_RATE                   # first pass after 1 s of speech
+
+
+def synthetic_call(minutes: float):
+    rng = np.random.default_rng(0)
+    n_chunks = int(minutes * 60 * SAMPLE_RATE) // CHUNK
+    chunks, speech = [], []
+    talking, left = False, 0
+    for _ in range(n_chunks):
+        if left <= 0:
+            talking = not talking
+            left = rng.integers(60, 250) if talking else rng.integers(40, 300)
+        left -= 1
+        level = 4000 if talking else 100
+        chunks.append(rng.normal(0, level, CHUNK).clip(-32768, 32767).astype(np.int16))
+        speech.append(talking)
+    return chunks, speech
+
+
+class Legacy:
+    """bytearray + tobytes/frombuffer, float32 made by every consumer."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.since_partial = 0
+        self.conversions = 0
+
+    def to_float(self, pcm):
+        self.conversions += 1
+        return pcm.astype(np.float32) / 32768.0
+
+    def step(self, chunk, talking):
+        self.to_float(chunk)  # VAD
+        if talking:
+            self.buffer.extend(chunk.tobytes())
+            self.since_partial += 1
+            if self.since_partial >= PARTIAL_EVERY and len(self.buffer) // 2 >= PARTIAL_MIN:
+                self.since_partial = 0
+                self.to_float(np.frombuffer(bytes(self.buffer), dtype=np.int16))
+        elif self.buffer:
+            audio = np.frombuffer(self.buffer, dtype=np.int16).copy()
+            self.buffer.clear()
+            self.since_partial = 0
+            self.to_float(audio)  # final ASR
+
+
+class Frames:
+    """AudioFrame + ring buffer, float32 made once per chunk."""
+
+    def __init__(self):
+        self.ring = UtteranceRingBuffer(SAMPLE_RATE, pre_roll_ms=500, max_utterance_ms=20000)
+        self.since_partial = 0
+        self.conversions = 0
+
+    def step(self, chunk, talking):
+        frame = AudioFrame(chunk, SAMPLE_RATE)
+        frame.float32  # VAD
+        self.conversions += 1
+        self.ring.write(frame)
+        if talking:
+            if not self.ring.in_utterance:
+                self.ring.start_utterance()
+            self.since_partial += 1
+            if self.since_partial >= PARTIAL_EVERY and self.ring.utterance_samples >= PARTIAL_MIN:
+                self.since_partial = 0
+                self.ring.utterance().float32
+        elif self.ring.in_utterance:
+            self.ring.end_utterance().copy().float32  # final ASR
+            self.since_partial = 0
+
+
+def measure(cls, chunks, speech):
+    pipeline = cls()
+    start = time.perf_counter()
+    for chunk, talking in zip(chunks, speech):
+        pipeline.step(chunk, talking)
+    elapsed = time.perf_counter() - start
+
+    pipeline = cls()
+    tracemalloc.start()
+    allocated = peak = 0
+    for chunk, talking in zip(chunks, speech):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        pipeline.step(chunk, talking)
+        step_peak = tracemalloc.get_traced_memory()[1]
+        allocated += step_peak - base
+        peak = max(peak, step_peak)
+    tracemalloc.stop()
+    return elapsed, allocated, pipeline.conversions, peak
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    chunks, speech = synthetic_call(minutes)
+    print(f"{minutes:g} min call, {len(chunks)} chunks, {np.mean(speech):.0%} speech")
+    for name, cls in (("bytearray", Legacy), ("AudioFrame", Frames)):
+        elapsed, allocated, conversions, peak = measure(cls, chunks, speech)
+        print(
+            f"  {name:<11} {elapsed * 1000:8.1f} ms   allocated {allocated / 1e6:9.1f} MB   "
+            f"float32 conversions {conversions:6d}   peak traced {peak / 1e6:6.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
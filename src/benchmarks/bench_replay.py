@@ -0,0 +1,193 @@
+# src/benchmarks/bench_replay.py
+"""
+Offline replay benchmark: recorded caller WAVs through the real media pipeline.
+- VAD (shared silero, batched like the server), pre-roll ring buffer,
+  Transcriber and Synthesizer exactly as a call uses them, no microphone,
+  no Gemini: the reply is the transcript itself (or --reply text)
+- audio is read from the WAVs as fast as the pipeline takes it and the
+  synthesized reply goes to a null sink, so runs are faster than real time
+- 1..N simulated calls run concurrently on shared models (SharedModels)
+- reports real-time factor, per-stage latency (p50/p95/p99), CPU seconds and
+  RSS per simulated call
+
+Usage:
+    python src/benchmarks/bench_replay.py recordings/*.wav --streams 1,4,8
+    python src/benchmarks/bench_replay.py caller.wav --streams 1 --json replay.json
+"""
+import argparse
+import glob
+import json
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from configs import settings
+from mainflow.audio_io import NullSink, WavFileSource
+from mainflow.models import SharedModels
+from mainflow.utterance_buffer import UtteranceRingBuffer
+from utils.audio_frame import AudioFrame
+from utils.tracing import StageHistograms, Tracer
+
+
+def rss_mb() -> float:
+    """Current resident set size."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def replay_call(models: SharedModels, source: WavFileSource, call_id: str, reply: str, tts: bool) -> Dict:
+    """One simulated call: the same VAD -> ring -> ASR -> TTS steps as VoiceAssistant."""
+    tracer = Tracer(call_id)
+    ended = []
+    vad = models.create_vad(
+        sample_rate=source.RATE,
+        threshold=0.35,
+        min_speech_duration_ms=250,
+        min_silence_duration_ms=200,
+        on_speech_end=lambda: ended.append(time.perf_counter()),
+    )
+    ring = UtteranceRingBuffer(source.RATE, settings.VAD_PRE_ROLL_MS, settings.MAX_UTTERANCE_MS)
+    synthesizer = models.create_synthesizer()
+    sink = NullSink()
+    transcripts = []
+
+    started = time.perf_counter()
+    for chunk in source.generate_chunks():
+        frame = AudioFrame(chunk, source.RATE)
+        t0 = time.perf_counter()
+        speaking = vad.process_chunk(frame)
+        tracer.histograms.observe("vad_chunk", time.perf_counter() - t0)
+        ring.write(frame)
+        if speaking and not ring.in_utterance:
+            ring.start_utterance()
+        if ended and ring.in_utterance:
+            trace = tracer.new_turn(ended.pop())
+            utterance = ring.end_utterance().copy()
+            with trace.stage("asr"):
+                text = models.transcriber.transcribe_array(utterance)
+            transcripts.append(text)
+            if tts and (reply or text):
+                tts_start = time.perf_counter()
+
+                def play(audio, trace=trace, tts_start=tts_start):
+                    if not trace.has("tts_first_chunk"):
+                        trace.span("tts_first_chunk", tts_start)
+                        trace.span("first_audio_out", trace.origin)
+                    sink.play_audio_chunk(audio)
+
+                pipeline = synthesizer.open_pipeline(play)
+                pipeline.push(reply or text)
+                pipeline.close()
+                synthesizer.play_pipeline(pipeline)
+                trace.span("tts_total", tts_start)
+            trace.span("turn_total", trace.origin)
+            tracer.finish(trace)
+        ended.clear()
+    wall = time.perf_counter() - started
+    models.release_vad(vad)
+
+    return {
+        "call_id": call_id,
+        "audio_seconds": round(source.duration, 2),
+        "wall_seconds": round(wall, 3),
+        "rtf": round(wall / source.duration, 4),
+        "turns": len(transcripts),
+        "tts_seconds": round(sink.samples / synthesizer.sample_rate, 2),
+        "transcripts": transcripts,
+        "stages": tracer.histograms,
+    }
+
+
+def run_level(models: SharedModels, paths: List[str], streams: int, reply: str, tts: bool) -> Dict:
+    replays = [WavFileSource(paths, paced=False) for _ in range(streams)]
+    results: List[Dict] = [None] * streams
+
+    def worker(i):
+        results[i] = replay_call(models, replays[i], f"replay_{streams}_{i}", reply, tts)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(streams)]
+    cpu0, rss0 = cpu_seconds(), rss_mb()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    cpu = cpu_seconds() - cpu0
+
+    stages = StageHistograms()
+    for r in results:
+        stages.merge(r.pop("stages"))
+    audio = sum(r["audio_seconds"] for r in results)
+    return {
+        "streams": streams,
+        "wall_seconds": round(wall, 3),
+        "rtf": round(wall / replays[0].duration, 4),  # < 1: every call kept up with real time
+        "throughput_x_realtime": round(audio / wall, 2),
+        "cpu_seconds_per_call": round(cpu / streams, 3),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_mb_per_call": round(max(0.0, rss_mb() - rss0) / streams, 2),
+        "stages": stages.summary(),
+        "calls": results,
+    }
+
+
+def print_level(level: Dict):
+    print(
+        f"\n{level['streams']} stream(s): wall {level['wall_seconds']:.2f} s, RTF {level['rtf']:.3f}, "
+        f"{level['throughput_x_realtime']:.1f}x real time, CPU {level['cpu_seconds_per_call']:.2f} s/call, "
+        f"RSS {level['rss_mb']:.0f} MB (+{level['rss_mb_per_call']:.1f} MB/call)"
+    )
+    print(f"  {'stage':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, s in level["stages"].items():
+        if s.get("count"):
+            print(f"  {stage:<18}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay caller WAVs through VAD/STT/TTS faster than real time")
+    parser.add_argument("wavs", nargs="*", help="caller recordings, played back to back as one call")
+    parser.add_argument("--streams", default="1,2,4", help="comma separated concurrent call counts")
+    parser.add_argument("--reply", default="", help="fixed reply text (default: speak the transcript)")
+    parser.add_argument("--no-tts", action="store_true", help="skip synthesis")
+    parser.add_argument("--json", help="write the full results here")
+    args = parser.parse_args()
+
+    paths = args.wavs or sorted(glob.glob(str(settings.RECORDINGS_DIR / "*.wav")))
+    if not paths:
+        parser.error("no WAV files given and none found in recordings/")
+    levels = [int(n) for n in args.streams.split(",")]
+
+    print(f"Loading models (max {max(levels)} concurrent calls)...")
+    rss_before = rss_mb()
+    models = SharedModels(whisper_workers=settings.WHISPER_NUM_WORKERS)
+    print(f"Models loaded, RSS {rss_mb():.0f} MB (+{rss_mb() - rss_before:.0f} MB)")
+
+    report = []
+    for streams in levels:
+        level = run_level(models, paths, streams, args.reply, not args.no_tts)
+        print_level(level)
+        report.append(level)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# src/benchmarks/bench_vad.py
+"""
+VAD benchmark: per-call VAD.process_chunk vs MultiStreamVAD.process_tick.
+- N streams of synthetic call audio (noise with tone bursts as "speech")
+- both paths share one Silero model, only the number of forward calls differs
+- reports frames/s, real-time streams supported and whether the speech
+  segments detected by the two paths agree
+
+Usage:
+    python src/benchmarks/bench_vad.py [seconds]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mainflow.vad import VAD, VADModel
+from mainflow.batch_vad import MultiStreamVAD
+
+
+SAMPLE_RATE = 16000
+CHUNK = 512
+STREAM_COUNTS = [1, 4, 16, 32, 64]
+
+
+def synthetic_call(seconds: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = seconds * SAMPLE_RATE
+    audio = rng.normal(0, 200, n)
+    t = np.arange(n) / SAMPLE_RATE
+    pos = rng.integers(0, SAMPLE_RATE)
+    while pos < n:
+        length = rng.integers(SAMPLE_RATE // 2, 3 * SAMPLE_RATE)
+        end = min(n, pos + length)
+        f0 = rng.uniform(110, 220)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t[pos:end]) / k for k in range(1, 8))
+        audio[pos:end] += voiced * 6000 * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[pos:end]))
+        pos = end + rng.integers(SAMPLE_RATE // 2, 2 * SAMPLE_RATE)
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def make_vads(count, model, events):
+    vads = []
+    for i in range(count):
+        vads.append(VAD(model=model, on_speech_end=lambda i=i: events[i].append(1)))
+    return vads
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    model = VADModel()
+    engine = MultiStreamVAD(model)
+
+    for count in STREAM_COUNTS:
+        calls = [synthetic_call(seconds, seed) for seed in range(count)]
+        ticks = len(calls[0]) // CHUNK
+
+        per_call_events = [[] for _ in range(count)]
+        vads = make_vads(count, model, per_call_events)
+        start = time.perf_counter()
+        for t in range(ticks):
+            for vad, audio in zip(vads, calls):
+                vad.process_chunk(audio[t * CHUNK:(t + 1) * CHUNK])
+        per_call = time.perf_counter() - start
+
+        batched_events = [[] for _ in range(count)]
+        vads = make_vads(count, model, batched_events)
+        start = time.perf_counter()
+        for t in range(ticks):
+            engine.process_tick(vads, [audio[t * CHUNK:(t + 1) * CHUNK] for audio in calls])
+        batched = time.perf_counter() - start
+
+        frames = ticks * count
+        agree = [len(a) for a in per_call_events] == [len(b) for b in batched_events]
+        print(
+            f"{count:>3} streams   per-call {frames / per_call:>8.0f} frames/s "
+            f"({count * seconds / per_call:>6.1f} x real time)   "
+            f"batched {frames / batched:>8.0f} frames/s "
+            f"({count * seconds / batched:>6.1f} x real time)   "
+            f"speedup {per_call / batched:4.1f}x   segments agree: {agree}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -73,6 +73,9 @@ COMPANY CONTEXT:
 Conversation summary:
 {summary}
 
+Recent exchanges:
+{history}
+
 Previously extracted entities:
 {entities}
 
@@ -117,4 +120,31 @@ Rules:
 Do not write any explanation, commentary, or text outside the JSON.
 Do not wrap JSON inside markdown.
 Do not add backticks.
-"""
\ No newline at end of file
+"""
+
+SUMMARY_PROMPT = """
+You maintain the running summary of a phone call between a real estate assistant and a caller.
+
+Summary so far:
+{summary}
+
+Turns to fold in:
+{transcript}
+
+Rewrite the summary so it also covers these turns. Keep what the caller asked for
+(budget, location, configuration, properties discussed, objections), anything the
+assistant promised or offered, and open questions. Drop greetings and small talk.
+Stay under {max_words} words, plain sentences, no markdown.
+Return only the summary.
+"""
+
+
+# ----------------------------------------------------------------------
+# Fixed spoken phrases (pre-rendered into the TTS cache at startup)
+# ----------------------------------------------------------------------
+GREETING_TEXT = "Hello, thank you for calling our chakka real estate team. How may I assist you today?"
+REMINDER_TEXT = "Are you still there? Could you please respond?"
+FAREWELL_TEXT = "Thank you for contacting our chakka real estate team. Have a wonderful day."
+FALLBACK_TEXT = "I apologize, I am experiencing a temporary issue. Could you please repeat that?"
+
+FIXED_PHRASES = [GREETING_TEXT, REMINDER_TEXT, FAREWELL_TEXT, FALLBACK_TEXT]
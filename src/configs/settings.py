@@ -57,19 +57,112 @@ SAMPLE_RATE = 16000          # Hz, for VAD/STT/TTS (Piper may use 22050 internal
 CHUNK_SIZE = 512            # frames per buffer
 CHANNELS = 1                  # mono
 
+# Per-call pipeline queues (capture drops oldest audio when full, inner stages block)
+CAPTURE_QUEUE_CHUNKS = 200      # ~6 s of 512-sample chunks
+ASR_QUEUE_SIZE = 4              # utterances waiting for transcription
+AGENT_QUEUE_SIZE = 4            # transcripts waiting for the reasoning agent
+
+# TTS pipelining: synthesize the next sentences while the current one plays
+TTS_PIPELINE = os.getenv("TTS_PIPELINE", "true").lower() == "true"
+TTS_LOOKAHEAD = 8               # max synthesized chunks queued ahead of playback
+TTS_MAX_CLAUSE_CHARS = 120      # longer sentences are split at , ; :
+
+# Playback: frame size written to the output and how far ahead of the listener it may run
+PLAYBACK_FRAME_MS = 20
+PLAYBACK_LEAD_MS = 60
+
+# TTS audio cache (LRU in memory, optional raw PCM files on disk)
+TTS_CACHE = os.getenv("TTS_CACHE", "true").lower() == "true"
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "64"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR")  # e.g. "tts_cache"; unset keeps it in memory only
+
 # VAD parameters
 VAD_THRESHOLD = 0.5
 VAD_MIN_SPEECH_MS = 250
 VAD_MIN_SILENCE_MS = 700
+# RMS / zero-crossing pre-gate: clearly silent frames skip the neural VAD
+VAD_ENERGY_GATE = os.getenv("VAD_ENERGY_GATE", "true").lower() == "true"
+# audio kept from before the VAD triggers (it fires only after min speech duration)
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "500"))
+# longer utterances are cut and transcribed in pieces
+MAX_UTTERANCE_MS = int(os.getenv("MAX_UTTERANCE_MS", "20000"))
+
+# Streaming (partial) transcription while the caller speaks
+STREAMING_STT = os.getenv("STREAMING_STT", "true").lower() == "true"
+STREAMING_STT_STEP_MS = 500     # re-transcribe the uncommitted audio this often
+STREAMING_STT_MIN_MS = 1000     # shorter utterances go straight to the final pass
+
+# Start the reasoning call once the partial transcript is stable for this long
+SPECULATIVE_REASONING = os.getenv("SPECULATIVE_REASONING", "false").lower() == "true"
+SPECULATIVE_STABLE_MS = int(os.getenv("SPECULATIVE_STABLE_MS", "300"))
+
+# Property catalog (SQLite); unset keeps it in memory, seeded from data/property_knowledge.py.
+# Import a feed with: python src/data/catalog.py import listings.csv --db <CATALOG_DB> --replace
+CATALOG_DB = os.getenv("CATALOG_DB")
+
+# Listings from the catalog that best match the caller, sent with each reasoning prompt
+PROMPT_PROPERTIES_K = int(os.getenv("PROMPT_PROPERTIES_K", "3"))
+
+# Extra listings scored against the caller's budget / location / configuration (0 disables)
+PROMPT_RECOMMENDATIONS_K = int(os.getenv("PROMPT_RECOMMENDATIONS_K", "3"))
+
+# Reasoning prompt: estimated tokens shared by summary, history, entities and knowledge
+# sections (the fixed instructions come on top), and how many recent turns to offer
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+PROMPT_HISTORY_TURNS = int(os.getenv("PROMPT_HISTORY_TURNS", "6"))
+
+# Rolling call summary: older turns are folded into session.summary in the background
+# once SUMMARY_EVERY_TURNS turns or SUMMARY_EVERY_TOKENS estimated tokens have piled up
+# beyond the SUMMARY_KEEP_TURNS most recent ones, which stay verbatim in the prompt
+ROLLING_SUMMARY = os.getenv("ROLLING_SUMMARY", "true").lower() == "true"
+SUMMARY_EVERY_TURNS = int(os.getenv("SUMMARY_EVERY_TURNS", "6"))
+SUMMARY_EVERY_TOKENS = int(os.getenv("SUMMARY_EVERY_TOKENS", "400"))
+SUMMARY_KEEP_TURNS = int(os.getenv("SUMMARY_KEEP_TURNS", "4"))
+SUMMARY_MAX_WORDS = int(os.getenv("SUMMARY_MAX_WORDS", "150"))
 
 # ----------------------------------------------------------------------
 # Debug / Development
 # ----------------------------------------------------------------------
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# Gemini record/replay: "off", "record" (live calls, saved to the cassette) or
+# "replay" (served from the cassette, no network)
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", str(ROOT_DIR / "cassettes" / "gemini.jsonl"))
+# replay timing: 1.0 = as recorded, 10 = ten times faster, 0 = no delays
+LLM_CASSETTE_SPEED = float(os.getenv("LLM_CASSETTE_SPEED", "1.0"))
+# a prompt that was never recorded: error, or the agent's recordings in turn
+LLM_CASSETTE_STRICT = os.getenv("LLM_CASSETTE_STRICT", "false").lower() == "true"
+
 # ----------------------------------------------------------------------
 # Telephony (for future Asterisk integration)
 # ----------------------------------------------------------------------
 # These will be used when integrating with a phone line
 ASTERISK_HOST = os.getenv("ASTERISK_HOST", "localhost")
-ASTERISK_PORT = int(os.getenv("ASTERISK_PORT", "4573"))
\ No newline at end of file
+ASTERISK_PORT = int(os.getenv("ASTERISK_PORT", "4573"))
+
+# AudioSocket media: line sample rate, payload codec ("ulaw" or "slin") and frame size
+AUDIOSOCKET_LINE_RATE = 8000
+AUDIOSOCKET_CODEC = os.getenv("AUDIOSOCKET_CODEC", "ulaw")
+AUDIOSOCKET_FRAME_MS = 20
+
+# ----------------------------------------------------------------------
+# Multi-call server
+# ----------------------------------------------------------------------
+# Maximum simultaneous calls handled by one process (shared models)
+SERVER_MAX_CALLS = int(os.getenv("SERVER_MAX_CALLS", "32"))
+
+# Parallel whisper workers on the shared model
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "4"))
+
+# Cross-call batched transcription (batch size 1 disables the scheduler)
+STT_BATCH_SIZE = int(os.getenv("STT_BATCH_SIZE", "8"))
+STT_BATCH_WINDOW_MS = int(os.getenv("STT_BATCH_WINDOW_MS", "30"))
+
+# Cross-call batched VAD: frames from all calls in one Silero forward pass per tick
+VAD_BATCHING = os.getenv("VAD_BATCHING", "true").lower() == "true"
+VAD_BATCH_SIZE = int(os.getenv("VAD_BATCH_SIZE", "64"))
+VAD_BATCH_WINDOW_MS = int(os.getenv("VAD_BATCH_WINDOW_MS", "8"))
+
+# How often the server logs aggregate latency (seconds)
+SERVER_STATS_INTERVAL = int(os.getenv("SERVER_STATS_INTERVAL", "30"))
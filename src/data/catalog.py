@@ -0,0 +1,416 @@
+"""
+catalog.py - Property catalog in SQLite.
+
+Provides:
+- CatalogStore: listings with numeric columns (price in INR, BHK, area) and
+  B-tree indexes for location / price / type+BHK filters, plus an FTS5 index
+  over location, type, amenities and description for free-text matching.
+  Bulk import from CSV or JSON replaces or upserts listings in one
+  transaction, so calls keep reading the old inventory until the new one is
+  committed (hot reload, also from another process on a file database).
+- open_catalog: the store configured by CATALOG_DB, seeded from
+  property_knowledge when empty.
+
+Usage (command line):
+    python src/data/catalog.py import listings.csv --db catalog.db --replace
+    python src/data/catalog.py stats --db catalog.db
+"""
+
+import csv
+import json
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).parent.parent))
+
+from data import property_knowledge
+from data.property_index import PropertyIndex, parse_area, parse_price, parse_query, tokenize
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    bhk INTEGER,
+    price_inr REAL,
+    area_sqft REAL,
+    location TEXT,
+    locality TEXT,
+    city TEXT,
+    amenities TEXT,
+    description TEXT,
+    status TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_locality ON listings(locality, price_inr);
+CREATE INDEX IF NOT EXISTS listings_city ON listings(city, price_inr);
+CREATE INDEX IF NOT EXISTS listings_type_bhk ON listings(type, bhk, price_inr);
+CREATE INDEX IF NOT EXISTS listings_price ON listings(price_inr);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+INSERT OR IGNORE INTO meta VALUES ('generation', 0);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+    location, type, amenities, description, content='listings', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS listings_ai AFTER INSERT ON listings BEGIN
+    INSERT INTO listings_fts(rowid, location, type, amenities, description)
+    VALUES (new.rowid, new.location, new.type, new.amenities, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS listings_ad AFTER DELETE ON listings BEGIN
+    INSERT INTO listings_fts(listings_fts, rowid, location, type, amenities, description)
+    VALUES ('delete', old.rowid, old.location, old.type, old.amenities, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS listings_au AFTER UPDATE ON listings BEGIN
+    INSERT INTO listings_fts(listings_fts, rowid, location, type, amenities, description)
+    VALUES ('delete', old.rowid, old.location, old.type, old.amenities, old.description);
+    INSERT INTO listings_fts(rowid, location, type, amenities, description)
+    VALUES (new.rowid, new.location, new.type, new.amenities, new.description);
+END;
+"""
+
+_COLUMNS = ("id", "type", "bhk", "price_inr", "area_sqft", "location", "locality", "city",
+            "amenities", "description", "status", "doc")
+
+# candidates fetched per access path before ranking in Python
+_CANDIDATES = 50
+
+
+def _normalize(record: Dict[str, Any]) -> tuple:
+    """One listing dict (property_knowledge shape, or a CSV row) -> table row."""
+    doc = {k: v for k, v in record.items() if v not in (None, "")}
+    if "id" not in doc:
+        raise ValueError(f"Listing without id: {record}")
+    doc["id"] = str(doc["id"])
+    amenities = doc.get("amenities") or []
+    if isinstance(amenities, str):
+        amenities = [a.strip() for a in re.split(r"[;|]", amenities) if a.strip()]
+        doc["amenities"] = amenities
+    bhk = doc.get("bhk")
+    if bhk is not None:
+        bhk = doc["bhk"] = int(float(bhk))
+    location = str(doc.get("location", ""))
+    locality, _, city = (part.strip().lower() for part in location.partition(","))
+    return (
+        doc["id"],
+        str(doc.get("type", "")).lower(),
+        bhk,
+        parse_price(doc.get("price_inr", doc.get("price"))),
+        parse_area(doc.get("area_sqft", doc.get("area"))),
+        location,
+        locality,
+        city or locality,
+        "; ".join(amenities),
+        doc.get("description", ""),
+        doc.get("status"),
+        json.dumps(doc, ensure_ascii=False),
+    )
+
+
+def read_json(path: str) -> List[Dict[str, Any]]:
+    """A JSON list of listings, or JSON lines."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def read_csv(path: str) -> List[Dict[str, Any]]:
+    """Header row with property_knowledge field names; amenities separated by ';'."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _prefix_range(prefix: str):
+    """[low, high) covering every string that starts with prefix (index range scan)."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class CatalogStore:
+    """
+    Usage:
+        catalog = CatalogStore("catalog.db")
+        catalog.import_csv("listings.csv", replace=True)
+        catalog.filter(location="Powai", max_price=2e7, bhk=3)
+        catalog.match("any villas near Juhu under 15 crore", session.entities, k=3)
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._index: Optional[PropertyIndex] = None
+        self._index_generation = -1
+        self._vocab: Optional[Dict[str, List[str]]] = None
+        self._vocab_generation = -1
+        with self._lock:
+            if path != ":memory:":
+                # readers keep going while an import commits
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: free text is ranked in memory instead
+                self.fts = False
+            self._conn.commit()
+
+    # ---------------- import ----------------
+
+    def import_records(self, records: Iterable[Dict[str, Any]], replace: bool = False) -> int:
+        """Upsert listings (or replace the whole catalog) in one transaction. Returns the count."""
+        rows = [_normalize(r) for r in records]
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS[1:])
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                if replace:
+                    self._conn.execute("DELETE FROM listings")
+                self._conn.executemany(
+                    f"INSERT INTO listings ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                    rows,
+                )
+                self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return len(rows)
+
+    def import_json(self, path: str, replace: bool = False) -> int:
+        return self.import_records(read_json(path), replace)
+
+    def import_csv(self, path: str, replace: bool = False) -> int:
+        return self.import_records(read_csv(path), replace)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        with self._lock:
+            cursor = self._conn.executemany("DELETE FROM listings WHERE id = ?", [(i,) for i in ids])
+            self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+            self._conn.commit()
+        return cursor.rowcount
+
+    # ---------------- reads ----------------
+
+    def generation(self) -> int:
+        """Bumped by every import; caches over the catalog rebuild when it changes."""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def get(self, listing_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT doc FROM listings WHERE id = ?", (listing_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def first(self, k: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT doc FROM listings ORDER BY rowid LIMIT ?", (k,)).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT doc FROM listings ORDER BY rowid").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def rows(self, columns: Iterable[str]) -> List[tuple]:
+        """Raw column values for every listing in catalog order (feature extraction)."""
+        names = ", ".join(c for c in columns if c in _COLUMNS)
+        with self._lock:
+            return self._conn.execute(f"SELECT {names} FROM listings ORDER BY rowid").fetchall()
+
+    def filter(
+        self,
+        location: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        type: Optional[str] = None,
+        bhk: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Indexed structured search, cheapest first. location matches the start
+        of the locality ("andheri" -> "Andheri East, Mumbai") or the city.
+        """
+        where, params = [], []
+        location = (location or "").strip().lower()
+        if location:
+            low, high = _prefix_range(location)
+            where.append("((locality >= ? AND locality < ?) OR city = ?)")
+            params += [low, high, location]
+        if type:
+            where.append("type = ?")
+            params.append(type.lower())
+        if bhk is not None:
+            where.append("bhk = ?")
+            params.append(int(bhk))
+        if min_price is not None:
+            where.append("price_inr >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("price_inr <= ?")
+            params.append(max_price)
+        sql = "SELECT doc FROM listings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY price_inr LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def match(self, user_text: str, entities: Optional[Dict[str, Any]] = None, k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Top-k listings for an utterance plus the entities gathered so far.
+        Location, type, BHK and budget found in the query narrow the catalog
+        through the indexes (relaxed one by one if nothing is left), the rest
+        of the words pull in FTS matches within the same filter, and the
+        candidates are ranked with PropertyIndex.
+        """
+        query = parse_query(user_text, entities)
+        if query.empty:
+            return self.first(k)
+        if not self.fts:
+            return self._memory_index().search(user_text, entities, k)
+
+        words = set(query.words)
+        vocab = self._vocabulary()
+        localities = [v for v in vocab["locality"] if tokenize(v)[:1] and tokenize(v)[0] in words]
+        cities = [v for v in vocab["city"] if tokenize(v) and set(tokenize(v)) <= words]
+        types = [v for v in vocab["type"] if set(tokenize(v)) & words]
+        used = set()
+        for value in localities + cities + types:
+            used.update(tokenize(value))
+        free_words = [w for w in dict.fromkeys(query.words) if w not in used and len(w) > 2 and w.isalnum()]
+
+        conditions = []  # most important first, relaxed from the end
+        if localities or cities:
+            conditions.append((
+                "(l.locality IN ({}) OR l.city IN ({}))".format(
+                    ", ".join("?" * len(localities)) or "NULL", ", ".join("?" * len(cities)) or "NULL"),
+                localities + cities,
+            ))
+        if types:
+            conditions.append(("l.type IN ({})".format(", ".join("?" * len(types))), types))
+        if query.has_budget:
+            low, high = query.price_range()
+            conditions.append(("l.price_inr BETWEEN ? AND ?", [low, min(high, 1e18)]))
+        if query.bhk is not None:
+            conditions.append(("l.bhk = ?", [query.bhk]))
+
+        docs: Dict[str, str] = {}
+        with self._lock:
+            for pid in query.property_ids:
+                row = self._conn.execute("SELECT id, doc FROM listings WHERE id = ?", (pid,)).fetchone()
+                if row:
+                    docs[row[0]] = row[1]
+            for n in range(len(conditions), -1, -1):
+                where = " AND ".join(c for c, _ in conditions[:n])
+                params = [p for _, ps in conditions[:n] for p in ps]
+                if n:
+                    for listing_id, doc in self._conn.execute(
+                        f"SELECT l.id, l.doc FROM listings l WHERE {where} LIMIT ?", params + [_CANDIDATES]
+                    ):
+                        docs.setdefault(listing_id, doc)
+                if free_words:
+                    # e.g. amenities: FTS within the same filter, no global ranking needed
+                    expr = " OR ".join(f'"{w}"' for w in free_words)
+                    # the subquery runs the MATCH once instead of once per filtered row
+                    for listing_id, doc in self._conn.execute(
+                        "SELECT l.id, l.doc FROM listings l WHERE "
+                        f"{where + ' AND ' if where else ''}"
+                        "l.rowid IN (SELECT rowid FROM listings_fts WHERE listings_fts MATCH ?) LIMIT ?",
+                        params + [expr, _CANDIDATES],
+                    ):
+                        docs.setdefault(listing_id, doc)
+                if len(docs) >= k:
+                    break
+        if not docs:
+            return self.first(k)
+        return PropertyIndex(json.loads(d) for d in docs.values()).search(user_text, entities, k)
+
+    def _vocabulary(self) -> Dict[str, List[str]]:
+        """Distinct localities, cities and types (from the indexes), cached per generation."""
+        generation = self.generation()
+        if self._vocab is None or self._vocab_generation != generation:
+            with self._lock:
+                self._vocab = {
+                    column: [r[0] for r in self._conn.execute(
+                        f"SELECT DISTINCT {column} FROM listings WHERE {column} != ''")]
+                    for column in ("locality", "city", "type")
+                }
+            self._vocab_generation = generation
+        return self._vocab
+
+    def _memory_index(self) -> PropertyIndex:
+        generation = self.generation()
+        if self._index is None or self._index_generation != generation:
+            self._index = PropertyIndex(self.all())
+            self._index_generation = generation
+        return self._index
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_type = dict(self._conn.execute("SELECT type, COUNT(*) FROM listings GROUP BY type").fetchall())
+        return {"listings": self.count(), "generation": self.generation(), "fts": self.fts, "by_type": by_type}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_catalog: Optional[CatalogStore] = None
+_catalog_lock = threading.Lock()
+
+
+def open_catalog(path: Optional[str] = None) -> CatalogStore:
+    """
+    The process-wide catalog: CATALOG_DB (or `path`), in memory when unset.
+    An empty catalog is seeded from property_knowledge.
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            if path is None:
+                from configs import settings
+                path = settings.CATALOG_DB
+            _catalog = CatalogStore(path or ":memory:")
+            if _catalog.count() == 0:
+                _catalog.import_records(property_knowledge.PROPERTIES)
+        return _catalog
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Property catalog maintenance")
+    parser.add_argument("command", choices=["import", "stats"])
+    parser.add_argument("files", nargs="*", help="CSV, JSON or JSON-lines listing files")
+    parser.add_argument("--db", required=True, help="catalog database file")
+    parser.add_argument("--replace", action="store_true", help="replace the whole catalog (daily feed)")
+    args = parser.parse_args()
+
+    catalog = CatalogStore(args.db)
+    if args.command == "import":
+        records = []
+        for path in args.files:
+            records += read_csv(path) if path.lower().endswith(".csv") else read_json(path)
+        # one transaction: running calls see the old catalog or the new one, never half
+        print(f"Imported {catalog.import_records(records, args.replace)} listings")
+    print(json.dumps(catalog.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
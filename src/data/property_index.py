@@ -0,0 +1,221 @@
+"""
+property_index.py - Pick the listings worth putting in the prompt.
+
+Provides:
+- parse_price / parse_area: "2.5 Crore" -> 25000000, "1200 sq.ft." -> 1200.
+- parse_query: location words, property type, BHK and budget from the
+  caller's utterance plus the entities gathered so far.
+- PropertyIndex: inverted index over the catalog (location, type, amenities,
+  description) with parsed numeric price/BHK; search() returns the top-k
+  listings for a query, or the first k when the query says nothing.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+_UNITS = {
+    "crore": 1e7, "crores": 1e7, "cr": 1e7,
+    "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5, "l": 1e5,
+    "million": 1e6, "mn": 1e6,
+}
+_AMOUNT = re.compile(r"(\d+(?:\.\d+)?)\s*(crores?|cr|lakhs?|lacs?|l|million|mn)\b")
+_PLAIN_AMOUNT = re.compile(r"\d[\d,]{5,}")
+_BHK = re.compile(r"(\d)\s*-?\s*(?:bhk|bed(?:room)?s?)\b")
+_WORD = re.compile(r"[a-z0-9]+")
+_MAX_WORDS = ("under", "below", "within", "upto", "up to", "max", "maximum", "less than", "not more than")
+_MIN_WORDS = ("above", "over", "more than", "at least", "minimum", "min")
+
+# caller wording -> catalog wording
+_ALIASES = {
+    "apartment": "flat", "apartments": "flat", "flats": "flat",
+    "villas": "villa", "bungalow": "villa", "bungalows": "villa",
+    "plots": "plot", "land": "plot",
+    "farmhouse": "farm", "farmhouses": "farm",
+    "penthouses": "penthouse",
+}
+_STOPWORDS = {"a", "an", "and", "any", "for", "i", "in", "is", "it", "me", "of", "the", "to", "with", "want", "looking"}
+
+# weight of a query word found in each field
+_FIELD_WEIGHTS = {"location": 3.0, "type": 2.0, "amenities": 1.0, "description": 0.5}
+
+
+def parse_price(value: Any) -> Optional[float]:
+    """INR amount from 2.5e7, "2.5 Crore", "95 Lakhs", "Rs 9,500,000"; None if there is none."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).lower()
+    match = _AMOUNT.search(text)
+    if match:
+        return float(match.group(1)) * _UNITS[match.group(2)]
+    match = _PLAIN_AMOUNT.search(text)
+    if match:
+        return float(match.group(0).replace(",", ""))
+    return None
+
+
+def parse_area(value: Any) -> Optional[float]:
+    """Square feet from "1200 sq.ft." (None if missing)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"\d+(?:\.\d+)?", str(value).replace(",", ""))
+    return float(match.group(0)) if match else None
+
+
+def tokenize(text: Any) -> List[str]:
+    words = _WORD.findall(str(text).lower())
+    return [_ALIASES.get(w, w) for w in words if w not in _STOPWORDS]
+
+
+def parse_bhk(text: Any) -> Optional[int]:
+    """3 from "3 BHK", "3bhk", "3 bedroom"; None if there is none."""
+    match = _BHK.search(str(text or "").lower())
+    return int(match.group(1)) if match else None
+
+
+def parse_budget(text: str):
+    """(min_price, max_price, target) from one piece of text, any of them None."""
+    text = text.lower()
+    match = _AMOUNT.search(text)
+    amount = parse_price(match.group(0)) if match else None
+    if amount is None:
+        return None, None, None
+    before = text[max(0, match.start() - 20):match.start()]
+    if any(w in before for w in _MAX_WORDS):
+        return None, amount, None
+    if any(w in before for w in _MIN_WORDS):
+        return amount, None, None
+    return None, None, amount
+
+
+class Query:
+    """What the caller is after, as far as it is known."""
+
+    __slots__ = ("words", "bhk", "min_price", "max_price", "target_price", "property_ids")
+
+    def __init__(self):
+        self.words: List[str] = []
+        self.bhk: Optional[int] = None
+        self.min_price: Optional[float] = None
+        self.max_price: Optional[float] = None
+        self.target_price: Optional[float] = None
+        self.property_ids: List[str] = []
+
+    @property
+    def has_budget(self) -> bool:
+        return bool(self.min_price or self.max_price or self.target_price)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.words or self.bhk or self.property_ids or self.has_budget)
+
+    def price_range(self):
+        """(low, high) worth looking at, for an indexed range scan."""
+        if self.target_price:
+            return self.target_price * 0.7, self.target_price * 1.3
+        return self.min_price or 0.0, self.max_price or float("inf")
+
+
+def numeric_score(query: Query, price: Optional[float], bhk: Optional[int]) -> float:
+    """BHK and budget fit of one listing; 0 when the query has neither."""
+    score = 0.0
+    if query.bhk is not None and bhk is not None:
+        if bhk == query.bhk:
+            score += 2.0
+        elif abs(bhk - query.bhk) == 1:
+            score += 0.5
+    if price is not None:
+        if query.max_price:
+            over = price / query.max_price - 1
+            score += 2.0 if over <= 0 else -4.0 * over
+        if query.min_price:
+            score += 1.0 if price >= query.min_price else -1.0
+        if query.target_price:
+            score += 2.0 * max(-1.0, 1 - abs(price - query.target_price) / query.target_price)
+    return score
+
+
+def parse_query(user_text: str, entities: Optional[Dict[str, Any]] = None) -> Query:
+    """The utterance wins over earlier entities for the same constraint."""
+    query = Query()
+    entities = entities or {}
+    sources = [str(user_text or "")]
+    for key in ("location", "property_type", "configuration", "budget", "property_id"):
+        if entities.get(key):
+            sources.append(str(entities[key]))
+
+    for text in sources:
+        lower = text.lower()
+        if query.bhk is None:
+            query.bhk = parse_bhk(lower)
+        if query.min_price is None and query.max_price is None and query.target_price is None:
+            query.min_price, query.max_price, query.target_price = parse_budget(lower)
+        query.property_ids.extend(re.findall(r"\b[a-z]{1,2}\d{3}\b", lower))
+        query.words.extend(tokenize(lower))
+    query.property_ids = [pid.upper() for pid in dict.fromkeys(query.property_ids)]
+    return query
+
+
+class PropertyIndex:
+    """
+    Usage:
+        index = PropertyIndex(property_knowledge.PROPERTIES)
+        index.search("any 3 bhk villa in Powai under 2 crore", session.entities, k=3)
+    """
+
+    def __init__(self, properties: Iterable[Dict[str, Any]]):
+        self.properties: List[Dict[str, Any]] = list(properties)
+        self.by_id = {p.get("id"): i for i, p in enumerate(self.properties)}
+        # catalog rows may carry only the parsed price_inr column (see catalog._normalize)
+        self.prices = [parse_price(p.get("price_inr", p.get("price"))) for p in self.properties]
+        self.bhk = [p.get("bhk") for p in self.properties]
+        # word -> field -> listing positions
+        self.postings: Dict[str, Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        for i, prop in enumerate(self.properties):
+            for field in _FIELD_WEIGHTS:
+                value = prop.get(field)
+                if isinstance(value, list):
+                    value = " ".join(value)
+                for word in tokenize(value or ""):
+                    self.postings[word][field].add(i)
+        n = max(1, len(self.properties))
+        self.idf = {
+            word: math.log(1 + n / len(set().union(*fields.values())))
+            for word, fields in self.postings.items()
+        }
+
+    def score(self, query: Query) -> Dict[int, float]:
+        scores: Dict[int, float] = defaultdict(float)
+        for word in set(query.words):
+            fields = self.postings.get(word)
+            if not fields:
+                continue
+            idf = self.idf[word]
+            for field, positions in fields.items():
+                for i in positions:
+                    scores[i] += _FIELD_WEIGHTS[field] * idf
+
+        if query.bhk is not None or query.has_budget:
+            for i, (price, bhk) in enumerate(zip(self.prices, self.bhk)):
+                scores[i] += numeric_score(query, price, bhk)
+
+        for pid in query.property_ids:
+            if pid in self.by_id:
+                scores[self.by_id[pid]] += 100.0
+        return scores
+
+    def search(self, user_text: str, entities: Optional[Dict[str, Any]] = None, k: int = 3) -> List[Dict[str, Any]]:
+        query = parse_query(user_text, entities)
+        if query.empty:
+            return self.properties[:k]
+        scores = self.score(query)
+        ranked = sorted((i for i, s in scores.items() if s > 0), key=lambda i: (-scores[i], i))
+        if not ranked:
+            return self.properties[:k]
+        return [self.properties[i] for i in ranked[:k]]
@@ -0,0 +1,241 @@
+"""
+recommender.py - Listings that fit what the caller has told us so far.
+
+Provides:
+- Recommender: feature arrays over the whole catalog (price in INR, BHK,
+  area, locality / city / type codes, amenity bitsets of the 64 most common
+  amenities), rebuilt when the catalog changes and stored as codes into
+  their distinct values; recommend() scores the distinct values against
+  session.business_state and gathers the result over every listing.
+- format_rows: listings as compact one-line rows for the prompt.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from data.property_index import parse_area, parse_bhk, parse_budget, parse_price, tokenize
+
+ROW_HEADER = "id|type|bhk|price|location|area|amenities"
+
+
+def format_rows(listings: Iterable[Dict[str, Any]]) -> str:
+    """One line per listing, about a third of the tokens of the JSON."""
+    lines = []
+    for p in listings:
+        bhk = f"{p['bhk']}BHK" if p.get("bhk") else "-"
+        lines.append("|".join([
+            str(p.get("id", "")), str(p.get("type", "")), bhk, str(p.get("price", "")),
+            str(p.get("location", "")), str(p.get("area", "")), ", ".join(p.get("amenities", [])),
+        ]))
+    return "\n".join(lines)
+
+
+class _Features:
+    """
+    Feature columns of one catalog generation; built once, never mutated.
+    Every column is stored as codes into its distinct values (np.unique), so a
+    query scores the few distinct values and one gather per column spreads the
+    result over the whole catalog.
+    """
+
+    __slots__ = (
+        "generation", "ids", "position",
+        # distinct (locality, city) places: locality first word / city word -> place codes
+        "locality_index", "city_index", "city_size",
+        # distinct (type, bhk) kinds: type word -> kind codes
+        "kind_bhk", "type_index",
+        # distinct (place, kind) pairs, so location and configuration cost one gather
+        "pair_code", "pair_place", "pair_kind",
+        "price_values", "price_code", "area_values", "area_code",
+        # distinct amenity bitsets of the 64 most common amenities
+        "amenity_sets", "amenity_code", "amenity_names",
+    )
+
+
+def _distinct(values, dtype=None):
+    """(distinct values, code per row)."""
+    uniq, code = np.unique(np.array(values, dtype=dtype), return_inverse=True)
+    return uniq, code.reshape(-1)
+
+
+def _word_index(names, words_of) -> Dict[str, np.ndarray]:
+    """word -> codes of the names it occurs in (once per name)."""
+    index: Dict[str, List[int]] = {}
+    for code, name in enumerate(names):
+        for word in words_of(name):
+            index.setdefault(word, []).append(code)
+    return {word: np.array(codes, dtype=np.intp) for word, codes in index.items()}
+
+
+class Recommender:
+    """
+    Usage:
+        recommender = Recommender(open_catalog())
+        recommender.recommend(session.business_state, k=3)
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._features: Optional[_Features] = None
+        self._lock = threading.Lock()
+
+    def _snapshot(self) -> _Features:
+        """Features of the current catalog; published with one assignment, so a
+        score pass never mixes arrays from two generations."""
+        generation = self.catalog.generation()
+        features = self._features
+        if features is not None and features.generation == generation:
+            return features
+        with self._lock:
+            features = self._features
+            if features is not None and features.generation == generation:
+                return features
+            rows = self.catalog.rows(["id", "type", "bhk", "price_inr", "area_sqft", "locality", "city", "amenities"])
+            ids, types, bhk, price, area, locality, city, amenities = zip(*rows) if rows else ([],) * 8
+            f = _Features()
+            f.generation = generation
+            f.ids = np.array(ids, dtype=object)
+            f.position = {pid: i for i, pid in enumerate(ids)}
+
+            places, place_code = _distinct([f"{l or ''}\x1f{c or ''}" for l, c in zip(locality, city)], str)
+            places = [p.split("\x1f") for p in places]
+            f.locality_index = _word_index(places, lambda p: tokenize(p[0])[:1])
+            f.city_index = _word_index(places, lambda p: set(tokenize(p[1])))
+            f.city_size = np.array([len(set(tokenize(p[1]))) for p in places], dtype=np.int64)
+
+            kinds, kind_code = _distinct([f"{t or ''}\x1f{'' if b is None else b}" for t, b in zip(types, bhk)], str)
+            kinds = [k.split("\x1f") for k in kinds]
+            f.type_index = _word_index(kinds, lambda k: set(tokenize(k[0])))
+            f.kind_bhk = np.array([float(k[1]) if k[1] else np.nan for k in kinds], dtype=np.float64)
+            pairs, f.pair_code = _distinct(place_code * len(kinds) + kind_code, np.int64)
+            f.pair_place, f.pair_kind = pairs // max(1, len(kinds)), pairs % max(1, len(kinds))
+
+            f.price_values, f.price_code = _distinct([np.nan if v is None else v for v in price], np.float64)
+            f.area_values, f.area_code = _distinct([np.nan if v is None else v for v in area], np.float64)
+            bits, f.amenity_names = self._amenity_bitsets(amenities)
+            f.amenity_sets, f.amenity_code = _distinct(bits, np.uint64)
+            self._features = f
+            return f
+
+    @staticmethod
+    def _amenity_bitsets(amenities):
+        """One bitset per listing, a bit per amenity for the 64 most common ones."""
+        lists = [[a.strip().lower() for a in (text or "").split(";") if a.strip()] for text in amenities]
+        counts: Dict[str, int] = {}
+        for names in lists:
+            for a in names:
+                counts[a] = counts.get(a, 0) + 1
+        names = sorted(counts, key=lambda a: -counts[a])[:64]
+        bit = {a: 1 << i for i, a in enumerate(names)}
+        return [sum(bit.get(a, 0) for a in set(listing)) for listing in lists], names
+
+    def scores(self, business_state: Dict[str, Any], amenities: Iterable[str] = ()) -> np.ndarray:
+        """Score of every listing in catalog order; 0 where nothing is known."""
+        return self._scores(self._snapshot(), business_state, amenities)
+
+    def _scores(self, f: _Features, business_state: Dict[str, Any], amenities: Iterable[str]) -> np.ndarray:
+        # (table over distinct values, codes) per column the query says something about
+        parts = []
+        pair_table = None
+
+        location_words = set(tokenize(business_state.get("location") or ""))
+        if location_words:
+            # locality by its first word ("powai", "andheri"), city by all of its words
+            table = np.zeros(len(f.city_size), dtype=np.float64)
+            city_hits = np.zeros(len(f.city_size), dtype=np.int64)
+            for word in location_words:
+                if word in f.locality_index:
+                    table[f.locality_index[word]] = 3.0
+                if word in f.city_index:
+                    city_hits[f.city_index[word]] += 1
+            table += 1.5 * ((city_hits == f.city_size) & (f.city_size > 0))
+            pair_table = table[f.pair_place]
+
+        configuration = str(business_state.get("configuration") or "").lower()
+        if configuration:
+            table = np.zeros(len(f.kind_bhk), dtype=np.float64)
+            bhk = parse_bhk(configuration)
+            if bhk is not None:
+                diff = np.abs(f.kind_bhk - bhk)
+                table += np.where(diff == 0, 2.0, np.where(diff == 1, 0.5, 0.0))
+            type_match = np.zeros(len(f.kind_bhk), dtype=bool)
+            for word in set(tokenize(configuration)):
+                if word in f.type_index:
+                    type_match[f.type_index[word]] = True
+            table += 2.0 * type_match
+            pair_table = table[f.pair_kind] if pair_table is None else pair_table + table[f.pair_kind]
+        if pair_table is not None:
+            parts.append((pair_table, f.pair_code))
+
+        budget = business_state.get("budget")
+        if budget:
+            low, high, target = parse_budget(str(budget))
+            if low is None and high is None and target is None:
+                target = parse_price(budget)
+            price = f.price_values
+            known = ~np.isnan(price)
+            table = np.zeros(len(price), dtype=np.float64)
+            if high:
+                over = price / high - 1
+                table += np.where(known, np.where(over <= 0, 2.0, -4.0 * over), 0.0)
+            if low:
+                table += np.where(known, np.where(price >= low, 1.0, -1.0), 0.0)
+            if target:
+                fit = np.maximum(-1.0, 1 - np.abs(price - target) / target)
+                table += np.where(known, 2.0 * fit, 0.0)
+            parts.append((table, f.price_code))
+
+        area = parse_area(business_state.get("area"))
+        if area:
+            fit = np.maximum(0.0, 1 - np.abs(f.area_values - area) / area)
+            parts.append((np.where(np.isnan(f.area_values), 0.0, fit), f.area_code))
+
+        wanted = [f.amenity_names.index(a) for a in set(a.lower() for a in amenities) if a in f.amenity_names]
+        if wanted:
+            table = np.zeros(len(f.amenity_sets), dtype=np.float64)
+            for i in wanted:
+                table += 0.5 * ((f.amenity_sets & (np.uint64(1) << np.uint64(i))) != 0)
+            parts.append((table, f.amenity_code))
+
+        if not parts:
+            return np.zeros(len(f.ids), dtype=np.float64)
+        # codes are in range by construction; mode="clip" skips the bounds check
+        table, codes = parts[0]
+        score = table.take(codes, mode="clip")
+        for table, codes in parts[1:]:
+            score += table.take(codes, mode="clip")
+        return score
+
+    def recommend(
+        self,
+        business_state: Dict[str, Any],
+        k: int = 3,
+        amenities: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """Top-k listings with a positive score; empty until budget, location or configuration is known."""
+        if not any(business_state.get(key) for key in ("budget", "location", "configuration")):
+            return []
+        f = self._snapshot()
+        score = self._scores(f, business_state, amenities)
+        score[[f.position[pid] for pid in set(exclude) if pid in f.position]] = -np.inf
+        n = len(score)
+        top = min(n, k)
+        if top == 0:
+            return []
+
+        # the top-th score of a strided sample is a lower bound of the real one,
+        # so one comparison pass keeps every candidate; only positive scores count
+        sample = score[::8] if n >= 8 * top else score
+        bound = np.partition(sample, len(sample) - top)[len(sample) - top]
+        candidates = np.flatnonzero(score >= max(bound, np.nextafter(0.0, 1.0)))
+        if len(candidates) > top:
+            values = score[candidates]
+            kth = np.partition(values, len(values) - top)[len(values) - top]
+            above = candidates[values > kth]
+            # ties at the cut in catalog order (candidates are ascending)
+            candidates = np.concatenate([above, candidates[values == kth][:top - len(above)]])
+        best = candidates[np.argsort(-score[candidates], kind="stable")]
+        return [self.catalog.get(f.ids[i]) for i in best]
@@ -0,0 +1,122 @@
+# src/fake_asterisk.py
+"""
+Local stand-in for Asterisk's AudioSocket application.
+- connects to the gateway, sends a call UUID
+- streams a caller WAV as 8 kHz mu-law 20 ms frames in real time, then silence
+- records the assistant's reply audio and reports end-to-end latency
+  (end of caller audio -> first reply frame)
+
+Usage:
+    python src/fake_asterisk.py caller.wav --listen 15 --out reply.wav
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from configs import settings
+from mainflow.audiosocket import (
+    KIND_AUDIO,
+    KIND_HANGUP,
+    KIND_UUID,
+    decode_audio,
+    encode_audio,
+    encode_message,
+    read_message,
+)
+from utils.audio_utils import load_wav, resample, save_wav
+
+
+async def run_call(wav_path: str, host: str, port: int, listen_seconds: float, out_path: str):
+    line_rate = settings.AUDIOSOCKET_LINE_RATE
+    codec = settings.AUDIOSOCKET_CODEC
+    frame_samples = line_rate * settings.AUDIOSOCKET_FRAME_MS // 1000
+    frame_seconds = settings.AUDIOSOCKET_FRAME_MS / 1000.0
+
+    samples, sr = load_wav(wav_path)
+    if sr != line_rate:
+        samples = resample(samples, sr, line_rate)
+    silence = np.zeros(int(listen_seconds * line_rate), dtype=np.int16)
+    caller_audio = np.concatenate([samples, silence])
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_message(KIND_UUID, uuid.uuid4().bytes))
+
+    received = []
+    speech_end_time = None
+    first_reply_time = None
+    hung_up = asyncio.Event()
+
+    async def receive():
+        nonlocal first_reply_time
+        last_frame_time = 0.0
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == KIND_AUDIO:
+                    now = time.monotonic()
+                    received.append(decode_audio(payload, codec))
+                    # the reply is the first burst after a gap, so a greeting
+                    # still playing when the caller stops is not counted
+                    if (
+                        first_reply_time is None
+                        and speech_end_time is not None
+                        and now - last_frame_time > 0.1
+                    ):
+                        first_reply_time = now
+                    last_frame_time = now
+                elif kind == KIND_HANGUP:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        hung_up.set()
+
+    receiver = asyncio.create_task(receive())
+
+    start = time.monotonic()
+    n_frames = len(caller_audio) // frame_samples
+    speech_frames = len(samples) // frame_samples
+    for i in range(n_frames):
+        if hung_up.is_set():
+            break
+        frame = caller_audio[i * frame_samples:(i + 1) * frame_samples]
+        writer.write(encode_message(KIND_AUDIO, encode_audio(frame, codec)))
+        await writer.drain()
+        if i + 1 == speech_frames:
+            speech_end_time = time.monotonic()
+        await asyncio.sleep(max(0.0, start + (i + 1) * frame_seconds - time.monotonic()))
+
+    if not hung_up.is_set():
+        writer.write(encode_message(KIND_HANGUP))
+        await writer.drain()
+    await asyncio.wait_for(receiver, timeout=60)
+    writer.close()
+
+    if received:
+        save_wav(np.concatenate(received), out_path, sample_rate=line_rate)
+        print(f"Reply audio saved to {out_path}")
+    if first_reply_time is not None and speech_end_time is not None:
+        print(f"End-to-end latency: {(first_reply_time - speech_end_time) * 1000:.0f} ms")
+    else:
+        print("No reply audio received after caller speech")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Asterisk AudioSocket client")
+    parser.add_argument("wav", help="caller audio (mono 16-bit WAV)")
+    parser.add_argument("--host", default=settings.ASTERISK_HOST)
+    parser.add_argument("--port", type=int, default=settings.ASTERISK_PORT)
+    parser.add_argument("--listen", type=float, default=15.0, help="seconds of silence sent after the caller audio")
+    parser.add_argument("--out", default="reply.wav")
+    args = parser.parse_args()
+    asyncio.run(run_call(args.wav, args.host, args.port, args.listen, args.out))
+
+
+if __name__ == "__main__":
+    main()
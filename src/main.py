@@ -1,88 +1,341 @@
 # src/main.py
+import argparse
 import time
 import numpy as np
 import sys
 from pathlib import Path
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
 
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from mainflow.audio import AudioStream
-from mainflow.vad import VAD
+from mainflow.audio_io import CallAudio, NullSink, WavFileSink, WavFileSource
+from mainflow.vad import VAD, EnergyGate
 from mainflow.audio2text import Transcriber
-from mainflow.text2audio import Synthesizer
+from mainflow.text2audio import Synthesizer, SynthesisPipeline
+from mainflow.models import SharedModels
+from mainflow.streaming_transcriber import StreamingTranscriber
+from mainflow.stages import StageQueue
+from mainflow.playback import PlaybackActor, PlaybackEngine, PlaybackJob
+from mainflow.utterance_buffer import UtteranceRingBuffer
+from utils.audio_frame import AudioFrame
 from utils.session import Session
 from utils.logger import logger
+from utils.metrics import LatencyStats
+from utils.tracing import Tracer, TurnTrace
+from utils.clock import SYSTEM_CLOCK, Clock, SimulatedClock
 from configs import settings
+from configs.prompts import GREETING_TEXT, REMINDER_TEXT, FAREWELL_TEXT, FALLBACK_TEXT, FIXED_PHRASES
 
 # Import from src.agents (note the src. prefix)
 from src.agents import (
     generate_mom,
     reason_about_user,
+    summarize_turns,
 )
+from src.agents.cassette import get_cassette
+from src.agents.speculative import SpeculativeReasoner
 
 
 class VoiceAssistant:
-    def __init__(self):
+    def __init__(
+        self,
+        models: Optional[SharedModels] = None,
+        audio=None,
+        call_id: Optional[str] = None,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
         logger.info("Starting Real Estate Voice Assistant...")
-        self.audio = AudioStream(rate=settings.SAMPLE_RATE, chunk=settings.CHUNK_SIZE) # creates microphone stream creates object of class
-        self.vad = VAD(
+        # reminder/inactivity timers and playback pacing; simulated for offline replays
+        self.clock = clock
+        vad_params = dict(
             sample_rate=settings.SAMPLE_RATE,
             threshold=0.35,
             min_speech_duration_ms=250,
             min_silence_duration_ms=200,
-            on_speech_end=self.on_speech_end
+            on_speech_end=self.on_speech_end,
+            energy_gate=EnergyGate() if settings.VAD_ENERGY_GATE else None,
+        )
+        if models is not None:
+            # shared weights, per-call state
+            self.vad = models.create_vad(**vad_params)
+            self.transcriber = models.transcriber
+            self.synthesizer = models.create_synthesizer()
+        else:
+            self.vad = VAD(**vad_params)
+            self.transcriber = Transcriber()
+            self.synthesizer = Synthesizer()
+            self.synthesizer.prerender(FIXED_PHRASES)
+        # audio defaults to the local microphone; the server passes its own per-call stream
+        if audio is None:
+            from mainflow.audio import AudioStream  # PyAudio only when a device is used
+
+            audio = AudioStream(
+                rate=settings.SAMPLE_RATE,
+                chunk=settings.CHUNK_SIZE,
+                output_source_rate=self.synthesizer.sample_rate,
+            )
+        self.audio = audio
+        # small paced frames, so barge-in silences the output within one frame
+        self.playback = PlaybackEngine(
+            self._play_chunk,
+            self.synthesizer.sample_rate,
+            flush=getattr(self.audio, "flush_output", None),
+            clock=self.clock,
+        )
+        call_id = call_id or f"call_{int(time.time())}"
+        # the only writer to the output: greeting, responses, reminders, farewell
+        self.player = PlaybackActor(
+            self.playback,
+            self.synthesizer,
+            on_idle=self._on_playback_idle,
+            name=f"{call_id}-playback",
         )
-        self.transcriber = Transcriber()
-        self.synthesizer = Synthesizer()
-        call_id = f"call_{int(time.time())}"
         self.session = Session(call_id)
         self.session.start_time = time.time()
-        self.audio_buffer = bytearray() # stores raw speech bytes until call ends
+        # recent audio incl. pre-roll before the VAD triggers, fixed size per call
+        self.ring = UtteranceRingBuffer(
+            sample_rate=settings.SAMPLE_RATE,
+            pre_roll_ms=settings.VAD_PRE_ROLL_MS,
+            max_utterance_ms=settings.MAX_UTTERANCE_MS,
+        )
         self.call_active = True
-        self.last_activity_time = time.time()
+        self.last_activity_time = self.clock.time()
         self.max_silence_seconds = 40
         self.reminder_sent = False
-        self.ai_speaking = False
-        self.ai_interrupted = False
+        self.turn_latency = LatencyStats()  # speech end -> first audio out
+        self.tracer = Tracer(self.session.call_id)
+        self._turn_trace: Optional[TurnTrace] = None  # turn waiting for its first audio
+        self._end_lock = threading.Lock()
+        self._capture_thread: Optional[threading.Thread] = None
+
+        # capture -> VAD -> ASR -> reasoning, connected by bounded queues
+        self._capture_q = StageQueue("capture", settings.CAPTURE_QUEUE_CHUNKS)
+        self._asr_q = StageQueue("asr", settings.ASR_QUEUE_SIZE)
+        self._agent_q = StageQueue("agent", settings.AGENT_QUEUE_SIZE)
+
+        # partial transcription while the caller is still speaking
+        self.streaming_stt = None
+        if settings.STREAMING_STT:
+            self.streaming_stt = StreamingTranscriber(
+                self.transcriber,
+                sample_rate=settings.SAMPLE_RATE,
+                on_partial=self.on_partial_transcript,
+            )
+        self._partial_executor = ThreadPoolExecutor(max_workers=1)
+        self._partial_future = None
+        self._last_partial_time = 0.0
+
+        # older turns folded into session.summary in the background, so prompts stay
+        # the same size however long the call runs
+        self._summary_executor = ThreadPoolExecutor(max_workers=1)
+        self._summary_future = None
+
+        # reasoning started early on a stable partial transcript
+        self.speculation = None
+        if settings.SPECULATIVE_REASONING and self.streaming_stt is not None:
+            self.speculation = SpeculativeReasoner(self._reason, settings.SPECULATIVE_STABLE_MS)
+
+    def _play_chunk(self, chunk: np.ndarray):
+        trace = self._turn_trace
+        if trace is not None:
+            self._turn_trace = None
+            now = time.perf_counter()
+            self.turn_latency.record(now - trace.origin)
+            trace.span("first_audio_out", trace.origin, now)
+        self.audio.play_audio_chunk(chunk)
+
+    def on_partial_transcript(self, text: str):
+        logger.debug(f"Partial: {text}")
+        if self.speculation is not None:
+            self.speculation.observe_partial(text)
+
+    def _reason(
+        self,
+        user_text: str,
+        cancel_event: Optional[threading.Event] = None,
+        on_sentence: Optional[Callable[[str], None]] = None,
+        trace: Optional[TurnTrace] = None,
+    ) -> dict:
+        # user_text is not in history yet; the prompt builder trims history to the token budget
+        summary = "\n".join(part for part in (self.session.summary, self.session.call_state) if part)
+        return reason_about_user(
+            user_text=user_text,
+            summary=summary,
+            history=self.session.unsummarized_history(settings.PROMPT_HISTORY_TURNS),
+            last_intent=self.session.insights.get("last_intent"),
+            entities=self.session.entities,
+            cancel_event=cancel_event,
+            on_sentence=on_sentence,
+            trace=trace,
+            business_state=self.session.business_state,
+        )
 
-    # triggered when silence is detected by VAD
-    def on_speech_end(self):
-        if len(self.audio_buffer) == 0:
+    def _maybe_summarize(self):
+        """Start a background summary update once enough turns have piled up."""
+        if not settings.ROLLING_SUMMARY:
+            return
+        if self._summary_future is not None and not self._summary_future.done():
             return
-        
-        # Transcribe
-        logger.info("Processing speech...")
-        audio_np = np.frombuffer(self.audio_buffer, dtype=np.int16).copy()
-        self.audio_buffer.clear()
-        
+        if not self.session.should_summarize(
+            settings.SUMMARY_EVERY_TURNS, settings.SUMMARY_EVERY_TOKENS, settings.SUMMARY_KEEP_TURNS
+        ):
+            return
+        self._summary_future = self._summary_executor.submit(self._update_summary)
+
+    def _update_summary(self):
+        started = time.perf_counter()
         try:
-            user_text = self.transcriber.transcribe_array(audio_np)
+            before = self.session.summarized_turns
+            if self.session.update_summary(summarize_turns, keep_recent=settings.SUMMARY_KEEP_TURNS):
+                logger.info(
+                    f"Summary updated: turns {before}-{self.session.summarized_turns} folded in, "
+                    f"{len(self.session.summary)} chars, {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
         except Exception as e:
-            logger.error(f"Transcription failed: {e}")
+            # previous summary stays; the same turns are retried after the next turn
+            logger.error(f"Summary update failed: {e}")
+
+    def _start_sentence_speaker(self) -> Tuple[SynthesisPipeline, PlaybackJob]:
+        """
+        Speak sentences as they are pushed to the returned pipeline; close() ends the turn.
+        Lets TTS start on the first sentence while the reasoning JSON is still streaming,
+        and synthesizes the next sentence while the current one plays.
+        The job resolves to what was actually played once the turn is over.
+        """
+        pipeline = self.synthesizer.open_pipeline(self._play_chunk)
+        return pipeline, self.player.submit("response", pipeline)
+
+    def _on_playback_idle(self):
+        # the inactivity timer counts from the end of the assistant's speech
+        self.last_activity_time = self.clock.time()
+
+    def _maybe_run_partial(self):
+        """Start a partial pass on the growing buffer if none is running and enough audio arrived."""
+        if self.streaming_stt is None or not self.call_active:
             return
-        self.last_activity_time = time.time()
-
-        if not user_text: # empty
+        if self._partial_future is not None and not self._partial_future.done():
             return
-        
-        if len(user_text.strip()) <= 1:
+        n_samples = self.ring.utterance_samples
+        if n_samples < settings.SAMPLE_RATE * settings.STREAMING_STT_MIN_MS // 1000:
             return
-            
+        now = time.perf_counter()
+        if now - self._last_partial_time < settings.STREAMING_STT_STEP_MS / 1000.0:
+            return
+        self._last_partial_time = now
+        utterance = self.ring.utterance()  # view, stays valid while the utterance is open
+        try:
+            self._partial_future = self._partial_executor.submit(self.streaming_stt.update, utterance)
+        except RuntimeError:
+            pass  # executor shut down by end_call
+
+    def _detach_partial_state(self):
+        """Finish the in-flight partial pass and take the utterance's committed words."""
+        if self.streaming_stt is None:
+            return None
+        if self._partial_future is not None:
+            try:
+                self._partial_future.result()
+            except Exception as e:
+                logger.error(f"Partial transcription failed: {e}")
+            self._partial_future = None
+        return self.streaming_stt.detach()
+
+    def _transcribe_utterance(self, utterance: AudioFrame, stt_state) -> str:
+        if self.streaming_stt is None:
+            return self.transcriber.transcribe_array(utterance)
+        # only the uncommitted tail is transcribed here
+        return self.streaming_stt.finish(utterance, stt_state)
+
+    # triggered when silence is detected by VAD (VAD stage)
+    def on_speech_end(self, forced: bool = False):
+        if not self.ring.in_utterance:
+            return
+
+        trace = self.tracer.new_turn()
+        if forced:
+            logger.info("Utterance reached the length limit, segmenting...")
+            audio_view = self.ring.split_utterance()
+        else:
+            logger.info("Processing speech...")
+            audio_view = self.ring.end_utterance()
+            # the VAD waited min_silence_duration before calling this
+            hangover = (self.vad.current_sample - self.vad.silence_start_sample) / self.vad.sample_rate
+            trace.span("vad_end", trace.origin - hangover, trace.origin)
+        stt_state = self._detach_partial_state()
+        # the ring keeps moving while ASR runs, the utterance gets its own buffers
+        utterance = audio_view.copy()
+        if not getattr(self.audio, "live", True):
+            # replay: back-pressure, nothing is lost while ASR catches up
+            self._asr_q.put((utterance, stt_state, trace))
+        elif not self._asr_q.offer((utterance, stt_state, trace)):
+            # this runs on the VAD thread, which must keep up with barge-in and the ring buffer
+            logger.warning(f"ASR is behind, dropped the oldest queued utterance ({self._asr_q.stats()['dropped']} so far)")
+
+    # ASR stage: utterance audio -> user text
+    def _asr_loop(self):
+        while True:
+            item = self._asr_q.get()
+            if item is None:
+                self._agent_q.put(None)
+                break
+            utterance, stt_state, trace = item
+            trace.span("asr_queue", trace.origin)
+            try:
+                with trace.stage("asr"):
+                    user_text = self._transcribe_utterance(utterance, stt_state)
+            except Exception as e:
+                if self.speculation is not None:
+                    self.speculation.reset()
+                logger.error(f"Transcription failed: {e}")
+                continue
+            self.last_activity_time = self.clock.time()
+
+            if not user_text or len(user_text.strip()) <= 1: # empty
+                if self.speculation is not None:
+                    self.speculation.reset()
+                continue
+            self._agent_q.put((user_text, trace, time.perf_counter()))
+
+    # reasoning stage: user text -> response (playback runs on its own thread)
+    def _agent_loop(self):
+        while True:
+            item = self._agent_q.get()
+            if item is None:
+                break
+            if not self.call_active:
+                continue
+            user_text, trace, queued = item
+            trace.span("agent_queue", queued)
+            self._turn_trace = trace
+            self._respond(user_text, trace)
+            self.tracer.finish(trace)
+
+    def _respond(self, user_text: str, trace: Optional[TurnTrace] = None):
         try:
             logger.user(user_text)
-            self.session.add_user_message(user_text)
             
             logger.info("🤖 Running reasoning agent...")
-            recent_history = self.session.get_context_for_prompt(3)
-
-            reasoning_output = reason_about_user(
-                user_text=user_text,
-                summary=self.session.summary + "\n" + recent_history,
-                entities=self.session.entities,
-            )
+            speaker, played = self._start_sentence_speaker()
+            try:
+                reasoning_started = time.perf_counter()
+                if self.speculation is not None:
+                    reasoning_output = self.speculation.resolve(user_text, on_sentence=speaker.push, trace=trace)
+                else:
+                    reasoning_output = self._reason(user_text, on_sentence=speaker.push, trace=trace)
+                if trace is not None:
+                    trace.span("reasoning", reasoning_started)
+            except Exception:
+                speaker.close()
+                # the caller still said it: keep it for history, summary and MoM
+                self.session.add_user_message(user_text)
+                raise
+            # recorded only now, the prompt renders user_text as the latest turn itself
+            self.session.add_user_message(user_text)
 
             intent = reasoning_output.get("intent", "unknown")
             entities = reasoning_output.get("entities", {})
@@ -103,56 +356,49 @@ class VoiceAssistant:
             # Speak response
             logger.ai(final_response)
 
-            def speak_response():
-                self.ai_speaking = True
-                self.ai_interrupted = False
-                self.synthesizer.synthesize_stream(final_response, self.audio.play_audio_chunk)
-                self.ai_speaking = False
-
-            threading.Thread(target=speak_response).start()
-            # Save to session
-            self.session.add_ai_message(final_response, {
+            if not reasoning_output.get("streamed"):
+                speaker.push(final_response)
+            speaker.close()
+
+            # the caller may cut the answer short: remember only what they heard
+            result = played.wait()
+            if trace is not None:
+                trace.span("tts_first_chunk", speaker.first_text_at, speaker.first_audio_at)
+                trace.span("turn_total", trace.origin)
+            interrupted = result is None or result.interrupted or speaker.cancelled.is_set()
+            spoken = final_response
+            if interrupted:
+                spoken = speaker.spoken_text(result.segments) if result is not None else ""
+                played_samples = result.samples_played if result is not None else 0
+                logger.info(f"Response interrupted after {played_samples} samples, heard: {spoken!r}")
+            self.session.add_ai_message(spoken, {
                 'intent': intent,
                 'sentiment': sentiment,
                 'entities': entities,
+                'interrupted': interrupted,
             })
-            profile = f"""
-            Customer Profile:
-            - Name: {self.session.business_state.get('customer_name')}
-            - Budget: {self.session.business_state.get('budget')}
-            - Location: {self.session.business_state.get('location')}
-            - Configuration: {self.session.business_state.get('configuration')}
-            - Interested Properties: {self.session.insights.get('properties_discussed')}
-            """
-
-            call_state = f"""
-            Call State:
-            - Lead Stage: {lead_stage}
-            - Last Intent: {intent}
-            - Last Sentiment: {sentiment}
-            - Objections Raised: {self.session.insights.get('objections')}
-            """
-
-            self.session.summary = profile + call_state
+            # rewritten every turn; the conversation itself goes into session.summary
+            self.session.call_state = (
+                f"Customer Profile: name {self.session.business_state.get('customer_name')}, "
+                f"budget {self.session.business_state.get('budget')}, "
+                f"location {self.session.business_state.get('location')}, "
+                f"configuration {self.session.business_state.get('configuration')}, "
+                f"interested properties {self.session.insights.get('properties_discussed')}\n"
+                f"Call State: lead stage {lead_stage}, last intent {intent}, last sentiment {sentiment}, "
+                f"objections raised {self.session.insights.get('objections')}"
+            )
+            self._maybe_summarize()
             # Respect supervisor lifecycle control
             if end_call_flag:
                 self.end_call()
                 return
         except Exception as e:
             logger.error(f"Agent failure: {e}")
-            fallback_response = "I apologize, I am experiencing a temporary issue. Could you please repeat that?"
-            self.synthesizer.synthesize_stream(fallback_response, self.audio.play_audio_chunk)
+            self.player.say(FALLBACK_TEXT, "fallback")
 
     def run(self):
-        greeting = "Hello, thank you for calling our chakka real estate team. How may I assist you today?"
-        def speak_greeting():
-            self.ai_speaking = True
-            self.ai_interrupted = False
-            self.synthesizer.synthesize_stream(greeting, self.audio.play_audio_chunk)
-            self.ai_speaking = False
-            self.last_activity_time = time.time()
-
-        threading.Thread(target=speak_greeting).start()
+        greeting = GREETING_TEXT
+        self.player.say(greeting, "greeting")
         self.session.add_ai_message(greeting, {
             "intent": "greeting",
             "sentiment": "neutral",
@@ -160,54 +406,133 @@ class VoiceAssistant:
         })
         self.audio.start_input_stream()
 
+        workers = [
+            threading.Thread(target=self._asr_loop, name=f"{self.session.call_id}-asr"),
+            threading.Thread(target=self._agent_loop, name=f"{self.session.call_id}-agent"),
+        ]
+        for worker in workers:
+            worker.start()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name=f"{self.session.call_id}-capture", daemon=True)
+        self._capture_thread.start()
+
+        interrupted = False
+        try:
+            self._vad_loop()
+        except KeyboardInterrupt:
+            interrupted = True
+
+        self._asr_q.put(None)
+        for worker in workers:
+            worker.join()
+        if self.call_active:
+            if not interrupted:
+                # audio source ran out, e.g. the caller hung up
+                logger.system("Caller disconnected")
+            self.end_call()
+        logger.info(f"Pipeline stages: {self.stage_stats()}")
+
+    # capture stage: never blocks on the rest of the pipeline (unless replaying)
+    def _capture_loop(self):
+        live = getattr(self.audio, "live", True)
         try:
             for chunk in self.audio.generate_chunks():
-                silence_duration = time.time() - self.last_activity_time
-
-                if (
-                    silence_duration > 12
-                    and not self.reminder_sent
-                    and not self.ai_speaking
-                ):
-                    reminder = "Are you still there? Could you please respond?"
-
-                    def speak_reminder():
-                        self.ai_speaking = True
-                        self.synthesizer.synthesize_stream(reminder, self.audio.play_audio_chunk)
-                        self.ai_speaking = False
-
-                    threading.Thread(target=speak_reminder).start()
-                    self.reminder_sent = True
-
-                if silence_duration > self.max_silence_seconds:
-                    logger.system("Call ended due to inactivity")
-                    self.end_call()
-                    break
+                if live:
+                    self._capture_q.offer(chunk)
+                else:
+                    self._capture_q.put(chunk)
                 if not self.call_active:
                     break
-                speaking = self.vad.process_chunk(chunk)
-                if speaking:
-                    self.reminder_sent = False
-
-                    if self.ai_speaking:
-                        self.ai_interrupted = True
-                        self.synthesizer.stop()
-                    
-                    self.last_activity_time = time.time()
-                    self.audio_buffer.extend(chunk.tobytes())
-        except KeyboardInterrupt:
-            self.end_call()
+        except Exception as e:
+            logger.error(f"Audio capture failed: {e}")
+        finally:
+            self._capture_q.offer(None)
+
+    # VAD stage: speech detection, barge-in, inactivity timers
+    def _vad_loop(self):
+        while True:
+            try:
+                chunk = self._capture_q.get(timeout=0.5)
+            except queue.Empty:
+                chunk = np.zeros(0, dtype=np.int16)  # no audio, still run the timers
+            if chunk is None:
+                break
+
+            silence_duration = self.clock.time() - self.last_activity_time
+
+            if (
+                silence_duration > 12
+                and not self.reminder_sent
+                and not self.player.busy
+            ):
+                self.player.say(REMINDER_TEXT, "reminder")
+                self.reminder_sent = True
+
+            if silence_duration > self.max_silence_seconds:
+                logger.system("Call ended due to inactivity")
+                self.end_call()
+                break
+            if not self.call_active:
+                break
+            if len(chunk) == 0:
+                continue
+            frame = AudioFrame(chunk, settings.SAMPLE_RATE)
+            # VAD first: it fills the frame's float32 view that the ring then stores
+            speaking = self.vad.process_chunk(frame)
+            self.ring.write(frame)
+            if speaking:
+                self.reminder_sent = False
+                if not self.ring.in_utterance:
+                    self.ring.start_utterance()
+
+                # also fires while the agent is still thinking: the pending reply is dropped
+                self.player.interrupt()
+                
+                self.last_activity_time = self.clock.time()
+                if self.ring.utterance_full:
+                    self.on_speech_end(forced=True)
+                self._maybe_run_partial()
+                if self.speculation is not None:
+                    self.speculation.maybe_start()
+
+    def stage_stats(self) -> dict:
+        return {q.name: q.stats() for q in (self._capture_q, self._asr_q, self._agent_q)}
 
     def end_call(self):
-        if not self.call_active:
-            return
-
-        self.call_active = False
+        with self._end_lock:
+            if not self.call_active:
+                return
+            self.call_active = False
+
+        self._partial_executor.shutdown(wait=False)
+        self._summary_executor.shutdown(wait=False, cancel_futures=True)
+        if self.vad.energy_gate is not None:
+            logger.info(f"VAD energy gate: {self.vad.energy_gate.stats()}")
+        logger.info(f"Interrupt-to-silence latency: {self.playback.interrupt_latency.summary()}")
+        if self.speculation is not None:
+            logger.info(f"Speculative reasoning: {self.speculation.stats()}")
+            self.speculation.close()
         logger.system("Call ended")
-        farewell = "Thank you for contacting our chakka real estate team. Have a wonderful day."
-        self.synthesizer.synthesize_stream(farewell, self.audio.play_audio_chunk)
+        # cuts anything still queued and plays last
+        self.player.say(FAREWELL_TEXT, "farewell").wait(timeout=30)
+        self.player.close(timeout=1.0)
+        if self._capture_thread is not None and self._capture_thread is not threading.current_thread():
+            # capture exits within a chunk once call_active is False; don't close the device under it.
+            # A replayed source may be blocked in put() on the full queue, drain it until it exits
+            deadline = time.monotonic() + 1.0
+            while self._capture_thread.is_alive() and time.monotonic() < deadline:
+                self._capture_q.drain()
+                self._capture_thread.join(timeout=0.05)
         self.audio.close()
         self.session.business_state["call_status"] = "completed"
+        logger.info(f"Turn stages: {self.tracer.summary()}")
+        cassette = get_cassette()
+        if cassette is not None:
+            logger.info(f"LLM cassette: {cassette.stats()}")
+        try:
+            # mom/<call_id>_trace.json and mom/<call_id>_metrics.prom
+            self.tracer.save("mom")
+        except Exception as e:
+            logger.error(f"Saving turn traces failed: {e}")
         try:
             transcript = self.session.get_full_transcript()
 
@@ -245,5 +570,20 @@ class VoiceAssistant:
         logger.info(f"📄 MoM saved to {filename}")
 
 if __name__ == "__main__":
-    assistant = VoiceAssistant()
+    parser = argparse.ArgumentParser(description="Real estate voice assistant")
+    parser.add_argument("--wav", nargs="+", help="run headless on recorded caller audio instead of the microphone")
+    parser.add_argument("--out", help="with --wav: write the assistant's audio to this WAV file")
+    parser.add_argument("--realtime", action="store_true", help="with --wav: replay at real-time speed")
+    args = parser.parse_args()
+
+    if args.wav:
+        # simulated time: the call runs at full CPU speed, timers follow the recording
+        clock = SYSTEM_CLOCK if args.realtime else SimulatedClock()
+        sink = WavFileSink(args.out) if args.out else NullSink()
+        audio = CallAudio(WavFileSource(args.wav, clock=clock), sink)
+        assistant = VoiceAssistant(audio=audio, clock=clock)
+        if args.out:
+            sink.sample_rate = assistant.synthesizer.sample_rate  # known once the voice is loaded
+    else:
+        assistant = VoiceAssistant()
     assistant.run()
\ No newline at end of file
@@ -4,19 +4,29 @@
 - Gracefully start and stop streams.
 """
 
+import threading
 import pyaudio
 import numpy as np
 from typing import Optional, Generator
+from mainflow.audio_io import AudioSink, AudioSource
+from utils.audio_utils import Resampler
 
 
-class AudioStream:
-    def __init__(self, rate: int = 16000, chunk: int = 1024, channels: int = 1):
+class AudioStream(AudioSource, AudioSink):
+    def __init__(self, rate: int = 16000, chunk: int = 1024, channels: int = 1, output_source_rate: Optional[int] = None):
         
         self.FORMAT = pyaudio.paInt16  
         self.CHANNELS = channels
         self.RATE = rate
         self.CHUNK = chunk
 
+        # audio handed to play_* arrives at output_source_rate (e.g. Piper's 22050)
+        # and is converted to the device rate with filter state kept across chunks
+        self._out_resampler = None
+        if output_source_rate and output_source_rate != rate:
+            self._out_resampler = Resampler(output_source_rate, rate)
+        self._out_lock = threading.Lock()
+
         self.audio = pyaudio.PyAudio()
         self.input_stream: Optional[pyaudio.Stream] = None # hold microphone stream object
         self.output_stream: Optional[pyaudio.Stream] = None # hold speaker stream object
@@ -72,6 +82,12 @@ class AudioStream:
                 print(f"Error reading audio chunk: {e}")
                 break
 
+    def _to_device_rate(self, audio: np.ndarray) -> np.ndarray:
+        if self._out_resampler is None:
+            return audio
+        with self._out_lock:
+            return self._out_resampler.process(audio)
+
     def play_audio(self, audio_data: np.ndarray):
         # Open output stream if not already open
         if self.output_stream is None:
@@ -82,7 +98,7 @@ class AudioStream:
                 output=True,
                 frames_per_buffer=self.CHUNK
             )
-        self.output_stream.write(audio_data.tobytes())
+        self.output_stream.write(self._to_device_rate(audio_data).tobytes())
 
     def play_audio_chunk(self, audio_chunk: np.ndarray):
         if self.output_stream is None:
@@ -93,7 +109,7 @@ class AudioStream:
                 output=True,
                 frames_per_buffer=self.CHUNK
             )
-        self.output_stream.write(audio_chunk.tobytes())
+        self.output_stream.write(self._to_device_rate(audio_chunk).tobytes())
 
     def close(self):
         self.stop_input_stream()
@@ -2,10 +2,22 @@ import numpy as np
 import os
 os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
 from faster_whisper import WhisperModel
-from typing import Optional, Union
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import get_compression_ratio
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps
+from typing import List, Optional, Tuple, Union
 import io
 import wave
 
+from utils.audio_frame import AudioFrame, as_frame
+
+# decode options of every utterance transcription, batched or not
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOG_PROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+VAD_PARAMETERS = dict(min_silence_duration_ms=200)
+
 
 class Transcriber:
 
@@ -15,6 +27,7 @@ class Transcriber:
         device: str = "cpu",
         compute_type: str = "int8",
         language: Optional[str] = "en",
+        num_workers: int = 1,
     ):
     
         self.model_size = model_size
@@ -22,16 +35,23 @@ class Transcriber:
         self.compute_type = compute_type
         self.language = language
 
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        # num_workers > 1 lets several calls transcribe on the same model in parallel
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            num_workers=num_workers,
+        )
 
     def transcribe_array(
         self,
-        audio: np.ndarray,
+        audio: Union[np.ndarray, AudioFrame],
         sample_rate: int = 16000,
         initial_prompt: Optional[str] = None,
     ) -> str:
         
-        audio_float = audio.astype(np.float32) / 32768.0
+        # frames from the pipeline carry the float32 samples the VAD already made
+        audio_float = as_frame(audio, sample_rate).float32
 
         # Run transcription
         segments, info = self.model.transcribe(
@@ -43,17 +63,117 @@ class Transcriber:
             patience=1,
             condition_on_previous_text=False,
             temperature=0.0,
-            compression_ratio_threshold=2.4,
-            no_speech_threshold=0.6,
-            log_prob_threshold=-1.0,
+            compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
+            no_speech_threshold=NO_SPEECH_THRESHOLD,
+            log_prob_threshold=LOG_PROB_THRESHOLD,
             vad_filter=True,          # 🔥 important
-            vad_parameters=dict(min_silence_duration_ms=200)
+            vad_parameters=VAD_PARAMETERS
         )
 
         # Collect all segment texts
         text = " ".join([segment.text for segment in segments])
         return text.strip()
 
-  
+    def transcribe_words(
+        self,
+        audio: Union[np.ndarray, AudioFrame],
+        initial_prompt: Optional[str] = None,
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Transcribe with word timestamps.
+
+        Returns:
+            List of (word, start_sec, end_sec) relative to the start of `audio`.
+        """
+        audio_float = as_frame(audio).float32
 
+        segments, info = self.model.transcribe(
+            audio_float,
+            language=self.language,
+            initial_prompt=initial_prompt,
+            beam_size=1,
+            best_of=1,
+            condition_on_previous_text=False,
+            temperature=0.0,
+            word_timestamps=True,
+            vad_filter=False,
+        )
+
+        words = []
+        for segment in segments:
+            for w in segment.words or []:
+                words.append((w.word.strip(), w.start, w.end))
+        return words
+
+    @staticmethod
+    def _speech_only(audio_float: np.ndarray) -> np.ndarray:
+        """The vad_filter step of transcribe_array: silence between speech removed."""
+        chunks = get_speech_timestamps(audio_float, VadOptions(**VAD_PARAMETERS))
+        if not chunks:
+            return np.zeros(0, dtype=np.float32)
+        speech = collect_chunks(audio_float, chunks)
+        if isinstance(speech, tuple):
+            # faster-whisper >= 1.1 returns (chunk list, metadata)
+            speech = np.concatenate(speech[0]) if speech[0] else np.zeros(0, dtype=np.float32)
+        return speech
+
+    def transcribe_batch(self, audios: List[Union[np.ndarray, AudioFrame]]) -> List[str]:
+        """
+        Greedy-decode several utterances (each <= 30 s) in one encoder/decoder call,
+        with the VAD filter and thresholds of transcribe_array. An utterance whose
+        greedy result fails the compression-ratio or log-prob check (where
+        transcribe_array would retry at a higher temperature) goes through
+        transcribe_array, as does a batch of one, so load does not change the text.
+
+        Args:
+            audios: int16 arrays or AudioFrames at 16 kHz, typically from different calls.
+
+        Returns:
+            One transcript per input, in the same order.
+        """
+        if len(audios) <= 1:
+            return [self.transcribe_array(a) for a in audios]
+
+        texts = [""] * len(audios)
+        speech = {}
+        for i, a in enumerate(audios):
+            audio_float = self._speech_only(as_frame(a).float32)
+            if len(audio_float):
+                speech[i] = audio_float
+        if not speech:
+            return texts
+
+        extractor = self.model.feature_extractor
+        features = np.stack([pad_or_trim(extractor(audio_float)) for audio_float in speech.values()])
+
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            self.model.model.is_multilingual,
+            task="transcribe",
+            language=self.language or "en",
+        )
+        prompt = list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+
+        encoder_output = self.model.encode(features)
+        results = self.model.model.generate(
+            encoder_output,
+            [prompt] * len(speech),
+            beam_size=1,
+            max_length=self.model.max_length,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
 
+        for i, result in zip(speech, results):
+            tokens = [t for t in result.sequences_ids[0] if t < tokenizer.eot]
+            # same average log-prob as faster-whisper (length_penalty 1)
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+                continue
+            text = tokenizer.decode(tokens).strip()
+            if avg_logprob < LOG_PROB_THRESHOLD or get_compression_ratio(text) > COMPRESSION_RATIO_THRESHOLD:
+                text = self.transcribe_array(audios[i])
+            texts[i] = text
+        return texts
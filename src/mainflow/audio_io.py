@@ -0,0 +1,278 @@
+"""
+- the audio contract VoiceAssistant runs on: a source of input chunks
+  (generate_chunks) and a sink for TTS audio (play_audio_chunk), both closeable
+- AudioStream (microphone/speaker) and AudioSocketStream (phone line) implement it
+- headless backends: WAV files, in-memory queues and null, no audio device needed
+- file and null sources are paced on a Clock: real time on the wall clock,
+  instant on a SimulatedClock, or not at all (as fast as the pipeline reads)
+- CallAudio pairs any source with any sink
+"""
+
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Generator, List, Optional
+
+import numpy as np
+
+from configs import settings
+from utils.audio_utils import load_wav, resample, save_wav
+from utils.clock import SYSTEM_CLOCK, Clock, SimulatedClock
+
+
+class AudioSource(ABC):
+    """Caller audio: int16 chunks of CHUNK samples at RATE."""
+
+    RATE: int = settings.SAMPLE_RATE
+    CHUNK: int = settings.CHUNK_SIZE
+    # a live source cannot wait for the pipeline, so capture drops the oldest
+    # audio when it falls behind; a replayed one is read with back-pressure
+    live: bool = True
+
+    def start_input_stream(self, device_index: Optional[int] = None):
+        pass
+
+    def stop_input_stream(self):
+        pass
+
+    @abstractmethod
+    def generate_chunks(self) -> Generator[np.ndarray, None, None]:
+        """Yield chunks until the caller is gone."""
+
+    def close(self):
+        self.stop_input_stream()
+
+
+class AudioSink(ABC):
+    """
+    Assistant audio, at the synthesizer's rate. A sink that queues audio ahead
+    of the listener also implements flush_output() to drop it on barge-in.
+    """
+
+    @abstractmethod
+    def play_audio_chunk(self, audio_chunk: np.ndarray):
+        """Queue or write one chunk; should not block longer than the chunk plays."""
+
+    def play_audio(self, audio_data: np.ndarray):
+        self.play_audio_chunk(audio_data)
+
+    def close(self):
+        pass
+
+
+class CallAudio(AudioSource, AudioSink):
+    """
+    One object with both halves, what VoiceAssistant expects as `audio`.
+
+    Usage:
+        audio = CallAudio(WavFileSource(["caller.wav"], clock=clock), WavFileSink("reply.wav", 22050))
+        VoiceAssistant(audio=audio, clock=clock).run()
+    """
+
+    def __init__(self, source: AudioSource, sink: AudioSink):
+        self.source = source
+        self.sink = sink
+        self.RATE = source.RATE
+        self.CHUNK = source.CHUNK
+        self.live = source.live
+        if hasattr(sink, "flush_output"):
+            self.flush_output = sink.flush_output
+
+    def start_input_stream(self, device_index: Optional[int] = None):
+        self.source.start_input_stream(device_index)
+
+    def stop_input_stream(self):
+        self.source.stop_input_stream()
+
+    def generate_chunks(self) -> Generator[np.ndarray, None, None]:
+        return self.source.generate_chunks()
+
+    def play_audio_chunk(self, audio_chunk: np.ndarray):
+        self.sink.play_audio_chunk(audio_chunk)
+
+    def close(self):
+        self.source.close()
+        self.sink.close()
+
+
+# ---------------- sources ----------------
+
+class ArraySource(AudioSource):
+    """
+    Chunks of a fixed int16 array.
+
+    Args:
+        paced: advance `clock` by each chunk's duration (real time on the wall
+            clock, instant on a SimulatedClock); False reads as fast as possible.
+    """
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        rate: int = settings.SAMPLE_RATE,
+        chunk: int = settings.CHUNK_SIZE,
+        clock: Clock = SYSTEM_CLOCK,
+        paced: bool = True,
+    ):
+        self.audio = np.asarray(audio, dtype=np.int16)
+        self.RATE = rate
+        self.CHUNK = chunk
+        self.clock = clock
+        self.paced = paced
+        self.live = paced and not isinstance(clock, SimulatedClock)
+        self.is_recording = False
+        self.position = 0  # samples handed out
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.RATE
+
+    def start_input_stream(self, device_index: Optional[int] = None):
+        self.is_recording = True
+
+    def stop_input_stream(self):
+        self.is_recording = False
+
+    def generate_chunks(self) -> Generator[np.ndarray, None, None]:
+        self.is_recording = True
+        chunk_seconds = self.CHUNK / self.RATE
+        deadline = self.clock.monotonic()
+        while self.is_recording and self.position + self.CHUNK <= len(self.audio):
+            if self.paced:
+                deadline += chunk_seconds
+                self.clock.sleep(deadline - self.clock.monotonic())
+            chunk = self.audio[self.position:self.position + self.CHUNK]
+            self.position += self.CHUNK
+            yield chunk
+        self.is_recording = False
+
+
+class WavFileSource(ArraySource):
+    """One or more recordings played back to back as one call, resampled to `rate`."""
+
+    def __init__(
+        self,
+        paths: List[str],
+        rate: int = settings.SAMPLE_RATE,
+        chunk: int = settings.CHUNK_SIZE,
+        clock: Clock = SYSTEM_CLOCK,
+        paced: bool = True,
+        gap_ms: int = 1000,
+    ):
+        parts = []
+        for path in paths:
+            audio, sr = load_wav(path)
+            parts.append(resample(audio, sr, rate) if sr != rate else audio)
+            parts.append(np.zeros(rate * gap_ms // 1000, dtype=np.int16))  # silence between recordings
+        audio = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+        super().__init__(audio, rate, chunk, clock, paced)
+        self.paths = list(paths)
+
+
+class NullSource(ArraySource):
+    """`seconds` of silence, e.g. to run the inactivity timers on a simulated clock."""
+
+    def __init__(
+        self,
+        seconds: float,
+        rate: int = settings.SAMPLE_RATE,
+        chunk: int = settings.CHUNK_SIZE,
+        clock: Clock = SYSTEM_CLOCK,
+        paced: bool = True,
+    ):
+        super().__init__(np.zeros(int(seconds * rate), dtype=np.int16), rate, chunk, clock, paced)
+
+
+class MemorySource(AudioSource):
+    """
+    Fed from another thread (a test, a network transport); any chunk size,
+    re-chunked to CHUNK. end() finishes the call.
+    """
+
+    def __init__(self, rate: int = settings.SAMPLE_RATE, chunk: int = settings.CHUNK_SIZE):
+        self.RATE = rate
+        self.CHUNK = chunk
+        self.is_recording = False
+        self._q: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._lock = threading.Lock()
+
+    def push(self, audio: np.ndarray):
+        with self._lock:
+            self._pending = np.concatenate([self._pending, np.asarray(audio, dtype=np.int16)])
+            while len(self._pending) >= self.CHUNK:
+                self._q.put(self._pending[:self.CHUNK].copy())
+                self._pending = self._pending[self.CHUNK:]
+
+    def end(self):
+        self._q.put(None)
+
+    def start_input_stream(self, device_index: Optional[int] = None):
+        self.is_recording = True
+
+    def stop_input_stream(self):
+        self.is_recording = False
+
+    def generate_chunks(self) -> Generator[np.ndarray, None, None]:
+        self.is_recording = True
+        while True:
+            chunk = self._q.get()
+            if chunk is None:
+                break
+            yield chunk
+        self.is_recording = False
+
+    def close(self):
+        self.stop_input_stream()
+        self.end()
+
+
+# ---------------- sinks ----------------
+
+class NullSink(AudioSink):
+    """Counts and drops the audio."""
+
+    def __init__(self):
+        self.samples = 0
+        self.chunks = 0
+
+    def play_audio_chunk(self, audio_chunk: np.ndarray):
+        self.samples += len(audio_chunk)
+        self.chunks += 1
+
+
+class MemorySink(AudioSink):
+    """Keeps every chunk; audio() returns them joined."""
+
+    def __init__(self):
+        self.chunks: List[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def play_audio_chunk(self, audio_chunk: np.ndarray):
+        with self._lock:
+            self.chunks.append(np.array(audio_chunk, dtype=np.int16))
+
+    def audio(self) -> np.ndarray:
+        with self._lock:
+            if not self.chunks:
+                return np.zeros(0, dtype=np.int16)
+            return np.concatenate(self.chunks)
+
+
+class WavFileSink(MemorySink):
+    """
+    Writes everything played to a WAV file on close(). sample_rate is the
+    synthesizer's (Piper voices are usually 22050 Hz) and can be set up to then.
+    """
+
+    def __init__(self, path: str, sample_rate: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        self.sample_rate = sample_rate
+        self.closed = False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        save_wav(self.audio(), self.path, self.sample_rate or settings.SAMPLE_RATE)
@@ -0,0 +1,279 @@
+"""
+- AudioSocket-style TCP media endpoint for phone calls (Asterisk AudioSocket framing)
+- every message is: 1 byte kind | 2 bytes big-endian length | payload
+- caller audio arrives as 8 kHz mu-law (or slin) 20 ms frames, is decoded, upsampled
+  and re-chunked for the VAD/STT pipeline
+- TTS audio is downsampled to 8 kHz and streamed back in paced 20 ms frames
+"""
+
+import asyncio
+import struct
+import threading
+import time
+import uuid
+import numpy as np
+from typing import Awaitable, Callable, Generator, Optional, Tuple
+
+from configs import settings
+from mainflow.audio_io import AudioSink, AudioSource
+from mainflow.stages import StageQueue
+from utils.audio_utils import Resampler, mulaw_to_pcm, pcm_to_mulaw
+from utils.logger import logger
+
+
+KIND_HANGUP = 0x00
+KIND_UUID = 0x01
+KIND_AUDIO = 0x10
+KIND_ERROR = 0xFF
+
+HEADER = struct.Struct(">BH")
+
+
+def encode_message(kind: int, payload: bytes = b"") -> bytes:
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one framed message. Raises asyncio.IncompleteReadError on EOF."""
+    header = await reader.readexactly(HEADER.size)
+    kind, length = HEADER.unpack(header)
+    payload = await reader.readexactly(length) if length else b""
+    return kind, payload
+
+
+def decode_audio(payload: bytes, codec: str) -> np.ndarray:
+    if codec == "ulaw":
+        return mulaw_to_pcm(payload)
+    return np.frombuffer(payload, dtype=np.int16)
+
+
+def encode_audio(pcm: np.ndarray, codec: str) -> bytes:
+    if codec == "ulaw":
+        return pcm_to_mulaw(pcm)
+    return np.ascontiguousarray(pcm, dtype=np.int16).tobytes()
+
+
+class AudioSocketStream(AudioSource, AudioSink):
+    """
+    Per-call audio object implementing the AudioSource/AudioSink contract
+    (start_input_stream / generate_chunks / play_audio_chunk / close),
+    so VoiceAssistant can run on a phone call unchanged.
+
+    generate_chunks and play_audio_chunk are called from the call's worker
+    thread; the socket side runs on the asyncio loop.
+    """
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        loop: asyncio.AbstractEventLoop,
+        output_rate: int,
+        rate: int = settings.SAMPLE_RATE,
+        chunk: int = settings.CHUNK_SIZE,
+        line_rate: int = settings.AUDIOSOCKET_LINE_RATE,
+        codec: str = settings.AUDIOSOCKET_CODEC,
+        frame_ms: int = settings.AUDIOSOCKET_FRAME_MS,
+    ):
+        self.writer = writer
+        self.loop = loop
+        self.RATE = rate
+        self.CHUNK = chunk
+        self.output_rate = output_rate
+        self.line_rate = line_rate
+        self.codec = codec
+        self.frame_samples = line_rate * frame_ms // 1000
+        self.frame_seconds = frame_ms / 1000.0
+
+        self.call_uuid: Optional[str] = None
+        self.is_recording = False
+        self.closed = False
+
+        # stateful resamplers: frames are converted one by one without edge artefacts
+        self._in_resampler = Resampler(line_rate, rate)
+        self._out_resampler = Resampler(output_rate, line_rate)
+        self._out_lock = threading.Lock()
+
+        # bounded like the capture queue: while the call waits for a free slot in
+        # CallServer nothing reads it, and only the freshest audio is worth keeping
+        self._in_q = StageQueue("line_in", settings.CAPTURE_QUEUE_CHUNKS)
+        self._in_pending = np.zeros(0, dtype=np.int16)
+        self._out_q: "asyncio.Queue[Optional[np.ndarray]]" = asyncio.Queue()
+
+    # ---------------- socket side (event loop) ----------------
+
+    def feed_line_audio(self, payload: bytes):
+        """Decode one line frame, upsample and queue pipeline-sized chunks (oldest dropped when full)."""
+        pcm = decode_audio(payload, self.codec)
+        pcm = self._in_resampler.process(pcm)
+        self._in_pending = np.concatenate([self._in_pending, pcm])
+        while len(self._in_pending) >= self.CHUNK:
+            if not self._in_q.offer(self._in_pending[: self.CHUNK].copy()) and self._in_q.dropped == 1:
+                logger.warning(f"AudioSocket call {self.call_uuid}: caller audio not consumed, dropping the oldest")
+            self._in_pending = self._in_pending[self.CHUNK:]
+
+    def end_input(self):
+        self.is_recording = False
+        self._in_q.offer(None)
+
+    async def write_frames(self):
+        """Pace queued TTS audio out as fixed 20 ms frames."""
+        pending = np.zeros(0, dtype=np.int16)
+        next_deadline = time.monotonic()
+        while True:
+            try:
+                timeout = self.frame_seconds * 3 if len(pending) else None
+                audio = await asyncio.wait_for(self._out_q.get(), timeout)
+            except asyncio.TimeoutError:
+                # utterance finished mid-frame: pad the tail with silence
+                audio = np.zeros(self.frame_samples - len(pending), dtype=np.int16)
+            if audio is None:
+                break
+            pending = np.concatenate([pending, audio])
+
+            now = time.monotonic()
+            if next_deadline < now:
+                next_deadline = now
+            while len(pending) >= self.frame_samples:
+                frame, pending = pending[: self.frame_samples], pending[self.frame_samples:]
+                try:
+                    self.writer.write(encode_message(KIND_AUDIO, encode_audio(frame, self.codec)))
+                    await self.writer.drain()
+                except (ConnectionError, RuntimeError):
+                    return
+                next_deadline += self.frame_seconds
+                await asyncio.sleep(max(0.0, next_deadline - time.monotonic()))
+
+    # ---------------- pipeline side (call thread) ----------------
+
+    def start_input_stream(self, device_index: Optional[int] = None):
+        self.is_recording = True
+
+    def stop_input_stream(self):
+        self.is_recording = False
+
+    def read_chunk(self) -> Optional[np.ndarray]:
+        return self._in_q.get()
+
+    def generate_chunks(self) -> Generator[np.ndarray, None, None]:
+        while True:
+            chunk = self.read_chunk()
+            if chunk is None:  # caller hung up
+                break
+            yield chunk
+
+    def play_audio_chunk(self, audio_chunk: np.ndarray):
+        if self.closed:
+            return
+        with self._out_lock:
+            pcm = self._out_resampler.process(audio_chunk)
+        self.loop.call_soon_threadsafe(self._out_q.put_nowait, pcm)
+
+    def play_audio(self, audio_data: np.ndarray):
+        self.play_audio_chunk(audio_data)
+
+    def flush_output(self):
+        """Drop TTS audio queued for the line but not sent yet (barge-in)."""
+        self.loop.call_soon_threadsafe(self._drain_output)
+
+    def _drain_output(self):
+        closing = False
+        while not self._out_q.empty():
+            if self._out_q.get_nowait() is None:
+                closing = True
+        if closing:
+            self._out_q.put_nowait(None)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.is_recording = False
+        self.loop.call_soon_threadsafe(self._out_q.put_nowait, None)
+
+
+class AudioSocketGateway:
+    """
+    TCP listener that turns every AudioSocket connection into a call.
+
+    Args:
+        handle_call: coroutine (audio, call_id) -> anything, e.g. CallServer.handle_call
+        output_rate: sample rate of the TTS audio handed to play_audio_chunk
+    """
+
+    def __init__(
+        self,
+        handle_call: Callable[..., Awaitable],
+        output_rate: int,
+        host: str = settings.ASTERISK_HOST,
+        port: int = settings.ASTERISK_PORT,
+    ):
+        self.handle_call = handle_call
+        self.output_rate = output_rate
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._on_connection, self.host, self.port)
+        logger.system(f"AudioSocket gateway listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        stream = AudioSocketStream(writer, loop, output_rate=self.output_rate)
+
+        # first message must identify the call
+        try:
+            kind, payload = await read_message(reader)
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+        if kind != KIND_UUID or len(payload) != 16:
+            logger.error(f"AudioSocket: expected UUID message, got kind 0x{kind:02x}")
+            writer.close()
+            return
+        stream.call_uuid = str(uuid.UUID(bytes=payload))
+
+        writer_task = asyncio.create_task(stream.write_frames())
+        reader_task = asyncio.create_task(self._read_loop(reader, stream))
+        call_task = asyncio.create_task(self.handle_call(stream, f"call_{stream.call_uuid}"))
+
+        try:
+            await asyncio.wait({reader_task, call_task}, return_when=asyncio.FIRST_COMPLETED)
+            await call_task
+        except Exception as e:
+            logger.error(f"AudioSocket call {stream.call_uuid} failed: {e}")
+        finally:
+            # call over (or failed): stop reading, hang up after the farewell
+            reader_task.cancel()
+            stream.end_input()
+            stream.close()
+            await writer_task
+            try:
+                writer.write(encode_message(KIND_HANGUP))
+                await writer.drain()
+            except (ConnectionError, RuntimeError):
+                pass
+            writer.close()
+
+    async def _read_loop(self, reader: asyncio.StreamReader, stream: AudioSocketStream):
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == KIND_AUDIO:
+                    stream.feed_line_audio(payload)
+                elif kind == KIND_HANGUP:
+                    break
+                elif kind == KIND_ERROR:
+                    logger.error(f"AudioSocket error from peer: {payload.hex()}")
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # lets generate_chunks return so the call can wrap up
+            stream.end_input()
@@ -0,0 +1,116 @@
+"""
+- cross-call batching in front of the shared Transcriber
+- calls submit utterances, a single worker collects them for a short window
+  and runs them through whisper as one batch, results go back to each caller
+- exposes queue depth, wait time and batch size metrics
+"""
+
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+
+from configs import settings
+from mainflow.audio2text import Transcriber
+from utils.audio_frame import AudioFrame
+from utils.logger import logger
+from utils.metrics import LatencyStats
+
+
+# whisper's encoder window; longer utterances take the regular path
+MAX_BATCH_SAMPLES = 30 * 16000
+
+
+class BatchTranscriber:
+    """
+    Drop-in for Transcriber.transcribe_array that batches across calls.
+
+    Usage:
+        stt = BatchTranscriber(Transcriber(num_workers=2), batch_size=8, window_ms=30)
+        text = stt.transcribe_array(audio)  # blocks this call's thread only
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        batch_size: int = settings.STT_BATCH_SIZE,
+        window_ms: int = settings.STT_BATCH_WINDOW_MS,
+    ):
+        self.transcriber = transcriber
+        self.batch_size = batch_size
+        self.window = window_ms / 1000.0
+
+        self._queue: "queue.Queue[Tuple[np.ndarray, float, Future]]" = queue.Queue()
+        self.wait_time = LatencyStats()
+        self.batch_sizes: List[int] = []
+        self.max_queue_depth = 0
+
+        self._worker = threading.Thread(target=self._run, name="stt-batcher", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name):
+        # model_size, language, ... come from the wrapped transcriber; before
+        # __init__ has set it (failed init, copy, unpickling) there is nothing to forward to
+        if name == "transcriber" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.transcriber, name)
+
+    def transcribe_array(
+        self,
+        audio: Union[np.ndarray, AudioFrame],
+        sample_rate: int = 16000,
+        initial_prompt: Optional[str] = None,
+    ) -> str:
+        if initial_prompt or sample_rate != 16000 or len(audio) > MAX_BATCH_SAMPLES:
+            return self.transcriber.transcribe_array(audio, sample_rate, initial_prompt)
+
+        future: Future = Future()
+        self._queue.put((audio, time.perf_counter(), future))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future.result()
+
+    def _collect(self) -> List[Tuple[np.ndarray, float, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, submitted, _ in batch:
+                self.wait_time.record(started - submitted)
+            self.batch_sizes.append(len(batch))
+            if len(self.batch_sizes) > 10000:
+                del self.batch_sizes[:5000]
+
+            try:
+                texts = self.transcriber.transcribe_batch([audio for audio, _, _ in batch])
+            except Exception as e:
+                logger.error(f"Batched transcription failed: {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future), text in zip(batch, texts):
+                future.set_result(text)
+
+    def stats(self) -> Dict:
+        sizes = self.batch_sizes[-1000:]
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "wait": self.wait_time.summary(),
+            "batches": len(self.batch_sizes),
+            "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else 0,
+        }
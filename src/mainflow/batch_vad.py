@@ -0,0 +1,156 @@
+"""
+- multi-stream VAD engine in front of the shared Silero model
+- every call keeps its own recurrent state and trigger/hysteresis logic (VAD),
+  only the forward pass is shared
+- calls submit one frame each, a single worker collects the frames of one tick
+  and evaluates them with one batched tensor call
+- process_tick() does the same synchronously for callers that own all streams
+"""
+
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+
+from configs import settings
+from mainflow.vad import VAD, VADModel
+from utils.audio_frame import AudioFrame, as_frame
+from utils.logger import logger
+from utils.metrics import LatencyStats
+
+
+class MultiStreamVAD:
+    """
+    Drop-in for VADModel.infer that batches across streams.
+
+    Usage:
+        engine = MultiStreamVAD(VADModel(), window_ms=8)
+        vad = engine.create_stream(on_speech_end=...)   # per call
+        vad.process_chunk(chunk)                        # blocks this call's thread only
+
+        # or, when one thread owns every stream:
+        engine.process_tick(vads, chunks)
+    """
+
+    def __init__(
+        self,
+        model: Optional[VADModel] = None,
+        max_batch: int = settings.VAD_BATCH_SIZE,
+        window_ms: int = settings.VAD_BATCH_WINDOW_MS,
+    ):
+        self.model = model if model is not None else VADModel()
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+
+        self._queue: "queue.Queue[Tuple[np.ndarray, int, Optional[Tuple], float, Future]]" = queue.Queue()
+        self._streams = 0
+        self._streams_lock = threading.Lock()
+        self.wait_time = LatencyStats()
+        self.batch_sizes: List[int] = []
+        self.frames = 0
+
+        self._worker = threading.Thread(target=self._run, name="vad-batcher", daemon=True)
+        self._worker.start()
+
+    def create_stream(self, **kwargs) -> VAD:
+        """New VAD stream whose inference goes through this engine."""
+        with self._streams_lock:
+            self._streams += 1
+        return VAD(model=self, **kwargs)
+
+    def release_stream(self):
+        """Call when a stream from create_stream() is finished, so ticks stop waiting for it."""
+        with self._streams_lock:
+            self._streams = max(0, self._streams - 1)
+
+    def infer(self, audio_float: np.ndarray, sample_rate: int, state: Optional[Tuple] = None) -> Tuple[float, Tuple]:
+        future: Future = Future()
+        self._queue.put((audio_float, sample_rate, state, time.perf_counter(), future))
+        return future.result()
+
+    def process_tick(self, vads: List[VAD], chunks: List[Union[np.ndarray, AudioFrame]]) -> List[bool]:
+        """
+        Advance every stream by one chunk with a single forward call.
+
+        Returns:
+            Speech state of each stream after the chunk.
+        """
+        frames = [as_frame(c, vad.sample_rate).float32 for vad, c in zip(vads, chunks)]
+        probs = [0.0] * len(vads)
+        # gated (clearly silent) streams stay out of the forward pass
+        active = [i for i, vad in enumerate(vads) if not vad.gate(frames[i])]
+        if active:
+            batch_probs, states = self.model.infer_batch(
+                np.stack([frames[i] for i in active]),
+                vads[0].sample_rate,
+                [vads[i]._model_state for i in active],
+            )
+            self._record(len(active))
+            for i, prob, state in zip(active, batch_probs, states):
+                vads[i]._model_state = state
+                probs[i] = float(prob)
+        return [vad.update(prob, len(chunk)) for vad, prob, chunk in zip(vads, probs, chunks)]
+
+    def _record(self, size: int):
+        self.frames += size
+        self.batch_sizes.append(size)
+        if len(self.batch_sizes) > 10000:
+            del self.batch_sizes[:5000]
+
+    def _collect(self) -> List[Tuple[np.ndarray, int, Optional[Tuple], float, Future]]:
+        batch = [self._queue.get()]
+        # a tick ends once every active stream has a frame in it or the window runs out
+        expected = min(self.max_batch, max(1, self._streams))
+        deadline = time.perf_counter() + self.window
+        while len(batch) < expected:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, _, submitted, _ in batch:
+                self.wait_time.record(started - submitted)
+
+            # frames can only share a forward pass at the same rate and length
+            groups: Dict[Tuple[int, int], list] = {}
+            for item in batch:
+                groups.setdefault((item[1], len(item[0])), []).append(item)
+
+            for (sample_rate, _), items in groups.items():
+                self._record(len(items))
+                try:
+                    if len(items) == 1:
+                        audio, _, state, _, future = items[0]
+                        future.set_result(self.model.infer(audio, sample_rate, state))
+                        continue
+                    frames = np.stack([audio for audio, _, _, _, _ in items])
+                    probs, states = self.model.infer_batch(frames, sample_rate, [s for _, _, s, _, _ in items])
+                except Exception as e:
+                    logger.error(f"Batched VAD inference failed: {e}")
+                    for _, _, _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, _, _, _, future), prob, state in zip(items, probs, states):
+                    future.set_result((float(prob), state))
+
+    def stats(self) -> Dict:
+        sizes = self.batch_sizes[-1000:]
+        return {
+            "streams": self._streams,
+            "frames": self.frames,
+            "wait": self.wait_time.summary(),
+            "batches": len(self.batch_sizes),
+            "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else 0,
+        }
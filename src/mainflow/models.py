@@ -0,0 +1,54 @@
+"""
+- loads the heavy models (whisper, silero, piper) once per process
+- every call gets its own VAD / Synthesizer objects that point at these shared weights
+"""
+
+from typing import Optional
+from configs import settings
+from configs.prompts import FIXED_PHRASES
+from mainflow.vad import VAD, VADModel
+from mainflow.batch_vad import MultiStreamVAD
+from mainflow.audio2text import Transcriber
+from mainflow.batch_transcriber import BatchTranscriber
+from mainflow.text2audio import Synthesizer, load_voice
+from mainflow.tts_cache import TTSCache
+
+
+class SharedModels:
+
+    def __init__(
+        self,
+        whisper_workers: int = 1,
+        voice_path: Optional[str] = None,
+        stt_batch_size: int = settings.STT_BATCH_SIZE,
+    ):
+        self.transcriber = Transcriber(
+            model_size=settings.WHISPER_MODEL,
+            num_workers=whisper_workers,
+        )
+        if stt_batch_size > 1:
+            # utterances from concurrent calls share one whisper pass
+            self.transcriber = BatchTranscriber(self.transcriber, batch_size=stt_batch_size)
+        self.vad_model = VADModel()
+        # frames from concurrent calls share one silero pass per tick
+        self.vad_engine = MultiStreamVAD(self.vad_model) if settings.VAD_BATCHING else None
+        self.voice_path = voice_path
+        self.voice = load_voice(voice_path)
+        self.tts_cache = TTSCache() if settings.TTS_CACHE else None
+        # fixed prompts play from memory on every call
+        self.create_synthesizer().prerender(FIXED_PHRASES)
+
+    def create_vad(self, **kwargs) -> VAD:
+        """New VAD stream with its own trigger and recurrent state."""
+        if self.vad_engine is not None:
+            return self.vad_engine.create_stream(**kwargs)
+        return VAD(model=self.vad_model, **kwargs)
+
+    def release_vad(self, vad: VAD):
+        """Tell the batched engine a call's stream is gone."""
+        if self.vad_engine is not None and vad.model is self.vad_engine:
+            self.vad_engine.release_stream()
+
+    def create_synthesizer(self) -> Synthesizer:
+        """New Synthesizer with its own stop flag."""
+        return Synthesizer(model_path=self.voice_path, voice=self.voice, cache=self.tts_cache)
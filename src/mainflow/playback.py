@@ -0,0 +1,280 @@
+"""
+- playback engine: writes TTS audio to the output in small frames
+- paced a little ahead of the listener, so at most `lead_ms` of audio sits in
+  the output when the caller barges in
+- stop() aborts within one frame, the result says how many samples were heard
+  (per synthesis segment, so the spoken part of the text can be recovered)
+- interrupt-to-silence latency is recorded per engine
+- playback actor: the single owner of a call's output, plays prioritized,
+  cancellable jobs (response, reminder, farewell) one at a time and publishes
+  whether the assistant is speaking
+"""
+
+import threading
+import numpy as np
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from configs import settings
+from utils.clock import SYSTEM_CLOCK, Clock
+from utils.logger import logger
+from utils.metrics import LatencyStats
+
+
+class PlaybackResult:
+    """What one play() call actually got out to the listener."""
+
+    __slots__ = ("samples_written", "samples_played", "interrupted", "segments")
+
+    def __init__(self):
+        self.samples_written = 0
+        self.samples_played = 0    # offset at which playback stopped
+        self.interrupted = False
+        self.segments: Dict[int, int] = {}  # segment id -> samples heard
+
+    def __repr__(self):
+        return (
+            f"PlaybackResult(played={self.samples_played}, written={self.samples_written}, "
+            f"interrupted={self.interrupted})"
+        )
+
+
+class PlaybackEngine:
+    """
+    One instance per call.
+
+    Args:
+        sink: writes one frame to the output (e.g. audio.play_audio_chunk).
+        sample_rate: rate of the audio handed to play().
+        flush: optional, drops audio the output has queued but not played yet.
+        clock: paces the frames; a SimulatedClock plays without waiting.
+
+    Usage:
+        engine = PlaybackEngine(audio.play_audio_chunk, 22050, flush=audio.flush_output)
+        result = engine.play(pipeline.iter_audio())   # blocks; engine.stop() from any thread
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[np.ndarray], None],
+        sample_rate: int,
+        frame_ms: int = settings.PLAYBACK_FRAME_MS,
+        lead_ms: int = settings.PLAYBACK_LEAD_MS,
+        flush: Optional[Callable[[], None]] = None,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.lead = lead_ms / 1000.0
+        self.flush = flush
+        self.clock = clock
+        self.interrupt_latency = LatencyStats()
+        self.playing = threading.Event()  # set from the first frame written until play() returns
+
+        self._stop = threading.Event()
+        self._stop_requested = 0.0
+
+    def stop(self):
+        """Abort the current play() call; returns immediately."""
+        if not self._stop.is_set():
+            self._stop_requested = self.clock.monotonic()
+            self._stop.set()
+
+    def play(self, audio: Iterable[Tuple[int, np.ndarray]]) -> PlaybackResult:
+        """
+        Play (segment id, chunk) pairs until they run out or stop() is called.
+        """
+        self._stop.clear()
+        result = PlaybackResult()
+        frames = []          # (segment, samples) in write order, to attribute what was heard
+        play_end = 0.0       # when the audio written so far finishes playing
+
+        for segment, chunk in audio:
+            for start in range(0, len(chunk), self.frame_samples):
+                if self._stop.is_set():
+                    break
+                now = self.clock.monotonic()
+                ahead = play_end - now
+                if ahead > self.lead and self.clock.wait(self._stop, ahead - self.lead):
+                    break
+                frame = chunk[start:start + self.frame_samples]
+                self.playing.set()
+                self.sink(frame)
+                now = self.clock.monotonic()
+                play_end = max(play_end, now) + len(frame) / self.sample_rate
+                result.samples_written += len(frame)
+                frames.append((segment, len(frame)))
+            if self._stop.is_set():
+                break
+
+        self.playing.clear()
+        now = self.clock.monotonic()
+        unplayed = max(0.0, play_end - now)
+        if self._stop.is_set():
+            result.interrupted = True
+            if self.flush is not None:
+                self.flush()
+                heard = result.samples_written - int(unplayed * self.sample_rate)
+                unplayed = 0.0
+            else:
+                heard = result.samples_written  # already in the output, will still be heard
+            self.interrupt_latency.record(now - self._stop_requested + unplayed)
+        else:
+            heard = result.samples_written
+
+        result.samples_played = max(0, heard)
+        remaining = result.samples_played
+        for segment, n in frames:
+            if remaining <= 0:
+                break
+            result.segments[segment] = result.segments.get(segment, 0) + min(n, remaining)
+            remaining -= n
+        return result
+
+
+# lower plays first; equal priority queues in order
+PRIORITIES = {"farewell": 0, "greeting": 1, "response": 1, "fallback": 1, "reminder": 2}
+
+
+class PlaybackJob:
+    """One utterance for the playback actor. done resolves to a PlaybackResult (None if dropped)."""
+
+    __slots__ = ("kind", "priority", "pipeline", "done", "cancelled")
+
+    def __init__(self, kind: str, pipeline):
+        self.kind = kind
+        self.priority = PRIORITIES[kind]
+        self.pipeline = pipeline
+        self.done: Future = Future()
+        self.cancelled = False
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[PlaybackResult]:
+        return self.done.result(timeout)
+
+
+class PlaybackActor:
+    """
+    The only writer to a call's output. Jobs are played one at a time on the
+    actor's thread, highest priority first.
+
+    - a response or greeting drops queued reminders and cuts a playing one
+    - a farewell drops everything else and is played last
+    - a reminder is dropped unless the actor is idle
+    - interrupt() (barge-in) cuts the current job and drops queued ones
+
+    Usage:
+        actor = PlaybackActor(engine, synthesizer, on_idle=...)
+        job = actor.submit("response", pipeline)  # pipeline may still be receiving text
+        job.wait()
+        actor.say(FAREWELL_TEXT, "farewell").wait()
+        actor.close()
+    """
+
+    def __init__(
+        self,
+        engine: PlaybackEngine,
+        synthesizer,
+        on_idle: Optional[Callable[[], None]] = None,
+        name: str = "playback",
+    ):
+        self.engine = engine
+        self.synthesizer = synthesizer
+        self.on_idle = on_idle
+        self.speaking = engine.playing      # audio is actually going out
+        self._jobs: List[PlaybackJob] = []
+        self._current: Optional[PlaybackJob] = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """A job is playing or waiting (a response counts from the moment it is submitted)."""
+        with self._cond:
+            return self._current is not None or bool(self._jobs)
+
+    def say(self, text: str, kind: str) -> PlaybackJob:
+        pipeline = self.synthesizer.open_pipeline(self.engine.sink)
+        pipeline.push(text)
+        pipeline.close()
+        return self.submit(kind, pipeline)
+
+    def submit(self, kind: str, pipeline) -> PlaybackJob:
+        job = PlaybackJob(kind, pipeline)
+        with self._cond:
+            if self._closed:
+                self._drop(job)
+                return job
+            if kind == "reminder" and (self._current is not None or self._jobs):
+                self._drop(job)
+                return job
+            for queued in [j for j in self._jobs if j.priority > job.priority or kind == "farewell"]:
+                self._jobs.remove(queued)
+                self._drop(queued)
+            current = self._current
+            if current is not None and (current.priority > job.priority or kind == "farewell"):
+                self._cancel(current)
+            self._jobs.append(job)
+            self._jobs.sort(key=lambda j: j.priority)  # stable: FIFO within a priority
+            self._cond.notify()
+        return job
+
+    def interrupt(self) -> bool:
+        """Barge-in: cut what is playing and drop what is queued, except a farewell."""
+        with self._cond:
+            victims = [j for j in self._jobs if j.kind != "farewell"]
+            for job in victims:
+                self._jobs.remove(job)
+                self._drop(job)
+            current = self._current
+            if current is not None and current.kind != "farewell":
+                self._cancel(current)
+                victims.append(current)
+        return bool(victims)
+
+    def _cancel(self, job: PlaybackJob):
+        job.cancelled = True
+        self.engine.stop()
+        job.pipeline.cancel()
+
+    def _drop(self, job: PlaybackJob):
+        job.cancelled = True
+        job.pipeline.cancel()
+        if not job.done.done():
+            job.done.set_result(None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._closed:
+                    self._cond.wait()
+                if not self._jobs:
+                    return
+                job = self._current = self._jobs.pop(0)
+
+            result = None
+            try:
+                if not job.cancelled:
+                    result = self.synthesizer.play_pipeline(job.pipeline, self.engine)
+                    if job.cancelled and result is not None:
+                        result.interrupted = True
+            except Exception as e:
+                logger.error(f"Playback failed: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                    idle = not self._jobs
+                if not job.done.done():
+                    job.done.set_result(result)
+                if idle and self.on_idle is not None:
+                    self.on_idle()
+
+    def close(self, timeout: Optional[float] = None):
+        """Finish queued jobs, then stop the actor thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
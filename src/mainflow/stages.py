@@ -0,0 +1,90 @@
+"""
+- bounded queues that connect the per-call pipeline stages
+  (capture -> VAD -> ASR -> reasoning -> playback)
+- offer(): never blocks, drops the oldest item when full (capture side, audio must stay fresh)
+- put(): blocks while full (back-pressure between inner stages)
+- drain(): empties the queue at shutdown, releasing a producer blocked in put()
+- every queue counts items, drops and time spent blocked
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class StageQueue:
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.put_count = 0
+        self.dropped = 0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+
+    def offer(self, item: Any) -> bool:
+        """Non-blocking put. Returns False if an older item had to be dropped."""
+        dropped = False
+        while True:
+            try:
+                self._q.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    self._q.get_nowait()
+                    dropped = True
+                    with self._lock:
+                        self.dropped += 1
+                except queue.Empty:
+                    pass
+        self._count()
+        return not dropped
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """Blocking put (back-pressure). Returns False and counts a drop on timeout."""
+        start = time.perf_counter()
+        try:
+            self._q.put(item, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self.blocked_seconds += time.perf_counter() - start
+            return False
+        with self._lock:
+            self.blocked_seconds += time.perf_counter() - start
+        self._count()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Raises queue.Empty on timeout."""
+        return self._q.get(timeout=timeout)
+
+    def drain(self) -> int:
+        """Discard everything queued; returns how many items were dropped."""
+        drained = 0
+        while True:
+            try:
+                self._q.get_nowait()
+                drained += 1
+            except queue.Empty:
+                return drained
+
+    def _count(self):
+        with self._lock:
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, self._q.qsize())
+
+    def qsize(self) -> int:
+        return self._q.qsize()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "items": self.put_count,
+                "dropped": self.dropped,
+                "depth": self._q.qsize(),
+                "max_depth": self.max_depth,
+                "blocked_ms": round(self.blocked_seconds * 1000, 1),
+            }
@@ -0,0 +1,136 @@
+"""
+- incremental transcription while the caller is still speaking
+- re-transcribes the uncommitted part of the growing utterance every few hundred ms
+- words that two consecutive passes agree on are committed (local agreement),
+  the audio window then starts after the last committed word
+- at end of speech only the uncommitted tail still has to be transcribed
+"""
+
+import re
+import threading
+import numpy as np
+from typing import Callable, List, Optional, Tuple, Union
+
+from utils.audio_frame import AudioFrame
+
+
+def _norm(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class StreamingTranscriber:
+    """
+    One instance per call; reset() between utterances.
+
+    Args:
+        transcriber: Transcriber (or BatchTranscriber) providing transcribe_words / transcribe_array.
+        on_partial: called with the current hypothesis (committed + unstable words).
+        guard_ms: words ending this close to the buffer end are never committed,
+                  whisper often revises the last word.
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        sample_rate: int = 16000,
+        on_partial: Optional[Callable[[str], None]] = None,
+        guard_ms: int = 300,
+        prompt_chars: int = 200,
+    ):
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.on_partial = on_partial
+        self.guard_samples = int(sample_rate * guard_ms / 1000)
+        self.prompt_chars = prompt_chars
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.committed: List[str] = []
+            self.commit_sample = 0
+            self._previous: List[Tuple[str, float, float]] = []
+            self.partial_text = ""
+
+    @property
+    def committed_text(self) -> str:
+        return " ".join(self.committed)
+
+    def _prompt(self) -> Optional[str]:
+        text = self.committed_text
+        return text[-self.prompt_chars:] if text else None
+
+    def update(self, audio: Union[np.ndarray, AudioFrame]) -> str:
+        """
+        Run one pass over the uncommitted part of `audio` (whole utterance so far).
+
+        Returns:
+            Current partial hypothesis.
+        """
+        with self._lock:
+            start = self.commit_sample
+            window = audio[start:]
+            if len(window) == 0:
+                return self.partial_text
+
+            words = self.transcriber.transcribe_words(window, initial_prompt=self._prompt())
+
+            # longest prefix both passes agree on
+            agreed = 0
+            for prev, cur in zip(self._previous, words):
+                if _norm(prev[0]) != _norm(cur[0]):
+                    break
+                agreed += 1
+
+            limit = len(window) - self.guard_samples
+            commit_upto = 0
+            for i in range(agreed):
+                if int(words[i][2] * self.sample_rate) > limit:
+                    break
+                commit_upto = i + 1
+
+            if commit_upto:
+                self.committed.extend(w for w, _, _ in words[:commit_upto])
+                self.commit_sample = start + int(words[commit_upto - 1][2] * self.sample_rate)
+                # remaining words are only compared by text in the next pass
+                self._previous = words[commit_upto:]
+            else:
+                self._previous = words
+
+            unstable = " ".join(w for w, _, _ in self._previous)
+            self.partial_text = " ".join(t for t in (self.committed_text, unstable) if t)
+
+        if self.on_partial and self.partial_text:
+            self.on_partial(self.partial_text)
+        return self.partial_text
+
+    def detach(self) -> Tuple[str, int, Optional[str]]:
+        """
+        Hand the finished utterance's state to whoever runs the final pass and
+        reset, so partial passes for the next utterance can start right away.
+
+        Returns:
+            (committed text, commit sample, prompt for the tail)
+        """
+        with self._lock:
+            state = (self.committed_text, self.commit_sample, self._prompt())
+        self.reset()
+        return state
+
+    def finish(self, audio: Union[np.ndarray, AudioFrame], state: Optional[Tuple[str, int, Optional[str]]] = None) -> str:
+        """
+        Final transcript for the utterance: committed prefix + transcription of the tail.
+
+        Args:
+            audio: the whole utterance.
+            state: result of detach(); taken from (and resets) this instance if omitted.
+        """
+        committed, commit_sample, prompt = state if state is not None else self.detach()
+        tail = audio[commit_sample:]
+
+        if not committed:
+            return self.transcriber.transcribe_array(audio)
+        if len(tail) < self.sample_rate // 10:
+            return committed
+        tail_text = self.transcriber.transcribe_array(tail, initial_prompt=prompt)
+        return f"{committed} {tail_text}".strip()
@@ -1,34 +1,265 @@
+import queue
+import threading
+import time
 from piper import PiperVoice
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import numpy as np
 from configs import settings
+from mainflow.tts_cache import TTSCache
+from utils.text_stream import split_clauses
 
 
-class Synthesizer:
-    def __init__(self, model_path: Optional[str] = None):
+def voice_path(model_path: Optional[str] = None) -> Path:
+    return Path(model_path) if model_path else Path(settings.PIPER_VOICE)
+
+
+def load_voice(model_path: Optional[str] = None) -> PiperVoice:
+    model_file = voice_path(model_path)
+
+    if not model_file.exists():
+        raise FileNotFoundError(
+            f"Voice model not found at: {model_file}"
+        )
+
+    voice = PiperVoice.load(str(model_file))
+    voice.config.length_scale = 0.8
+    return voice
+
+
+def iter_frames(audio: np.ndarray, sample_rate: int, frame_ms: int = 100):
+    """Slice cached audio so playback can still be stopped between frames."""
+    step = max(1, sample_rate * frame_ms // 1000)
+    for start in range(0, len(audio), step):
+        yield audio[start:start + step]
+
+
+class SynthesisPipeline:
+    """
+    Lookahead synthesis: a worker thread runs Piper on the next sentences while
+    play() feeds already synthesized PCM to the output, so the device never waits
+    on inference between sentences.
 
-        if model_path:
-            model_file = Path(model_path)
-        else:
-            model_file = Path(settings.PIPER_VOICE)
+    Usage:
+        pipeline = synthesizer.open_pipeline(play_chunk)
+        pipeline.push("First sentence.")   # any time, from any thread
+        pipeline.close()                   # no more text
+        pipeline.play()                    # blocks until played or cancelled
 
-        if not model_file.exists():
-            raise FileNotFoundError(
-                f"Voice model not found at: {model_file}"
-            )
+    Audio is tagged with the index of the clause it belongs to (iter_audio),
+    so spoken_text() can tell how much of the text a listener heard.
+    """
 
-        self.voice = PiperVoice.load(str(model_file))
-        self.voice.config.length_scale = 0.8
+    def __init__(
+        self,
+        voice: PiperVoice,
+        chunk_callback: Callable[[np.ndarray], None],
+        lookahead: int = settings.TTS_LOOKAHEAD,
+        max_clause_chars: int = settings.TTS_MAX_CLAUSE_CHARS,
+        cache: Optional[TTSCache] = None,
+        voice_id: str = "",
+        on_cancel: Optional[Callable[["SynthesisPipeline"], None]] = None,
+    ):
+        self.voice = voice
+        self.cache = cache
+        self.on_cancel = on_cancel  # lets the Synthesizer forget a pipeline that never plays
+        self.voice_id = voice_id
+        self.chunk_callback = chunk_callback
+        self.max_clause_chars = max_clause_chars
+        self.cancelled = threading.Event()
+        self.first_text_at: Optional[float] = None   # perf_counter of the first push()
+        self.first_audio_at: Optional[float] = None  # first synthesized audio ready
+        self.clauses: List[str] = []
+        self.clause_samples: Dict[int, int] = {}  # filled in as clauses are synthesized
+        self._texts: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._audio: "queue.Queue[Optional[Tuple[int, np.ndarray]]]" = queue.Queue(maxsize=lookahead)
+        self._worker = threading.Thread(target=self._synthesize, daemon=True)
+        self._worker.start()
+
+    def push(self, text: str):
+        if not self.cancelled.is_set():
+            if self.first_text_at is None:
+                self.first_text_at = time.perf_counter()
+            self._texts.put(text)
+
+    def close(self):
+        self._texts.put(None)
+
+    def cancel(self):
+        """Stop synthesis and drop everything already queued."""
+        self.cancelled.set()
+        self._texts.put(None)
+        while True:
+            try:
+                self._audio.get_nowait()
+            except queue.Empty:
+                break
+        # unblock play() if it is waiting on an empty queue
+        try:
+            self._audio.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.on_cancel is not None:
+            self.on_cancel(self)
+
+    def _put_audio(self, item: Optional[Tuple[int, np.ndarray]]) -> bool:
+        if item is not None and self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+        while not self.cancelled.is_set():
+            try:
+                self._audio.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _synthesize(self):
+        try:
+            while not self.cancelled.is_set():
+                text = self._texts.get()
+                if text is None:
+                    break
+                for clause in split_clauses(text, self.max_clause_chars):
+                    self.clauses.append(clause)
+                    if not self._synthesize_clause(len(self.clauses) - 1, clause):
+                        return
+        except Exception as e:
+            print(f"TTS error: {e}")
+        self._put_audio(None)
+
+    def _synthesize_clause(self, index: int, clause: str) -> bool:
+        key = None
+        if self.cache is not None:
+            key = TTSCache.make_key(clause, self.voice_id, self.voice.config.length_scale, self.voice.config.sample_rate)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.clause_samples[index] = len(cached)
+                return all(self._put_audio((index, part)) for part in iter_frames(cached, self.voice.config.sample_rate))
+
+        parts = []
+        for chunk in self.voice.synthesize(clause):
+            if self.cancelled.is_set():
+                return False
+            chunk_np = np.asarray(chunk.audio_int16_array, dtype=np.int16)
+            parts.append(chunk_np)
+            if not self._put_audio((index, chunk_np)):
+                return False
+        self.clause_samples[index] = sum(len(p) for p in parts)
+        if key is not None and parts:
+            self.cache.put(key, np.concatenate(parts))
+        return True
+
+    def iter_audio(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """(clause index, PCM chunk) pairs until the text is spoken or cancelled."""
+        while not self.cancelled.is_set():
+            item = self._audio.get()
+            if item is None or self.cancelled.is_set():
+                break
+            yield item
+
+    def play(self):
+        for _, chunk in self.iter_audio():
+            self.chunk_callback(chunk)
+
+    def spoken_text(self, heard: Dict[int, int]) -> str:
+        """
+        The part of the text the listener heard, from samples heard per clause
+        (PlaybackResult.segments). A clause cut off midway keeps the share of
+        its words that was played.
+        """
+        spoken = []
+        for index, clause in enumerate(self.clauses):
+            played = heard.get(index, 0)
+            total = self.clause_samples.get(index)
+            if played <= 0:
+                break
+            if total and played >= total:
+                spoken.append(clause)
+                continue
+            words = clause.split()
+            if not total:
+                # clause still being synthesized, assume ~3 words per second
+                total = max(played, int(len(words) * self.voice.config.sample_rate / 3))
+            share = played / total
+            cut = int(len(words) * share)
+            if cut:
+                spoken.append(" ".join(words[:cut]))
+            break
+        return " ".join(spoken)
+
+
+class Synthesizer:
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        voice: Optional[PiperVoice] = None,
+        cache: Optional[TTSCache] = None,
+    ):
+
+        # a preloaded voice (and cache) can be shared between calls, only the stop flag is per call
+        self.voice = voice if voice is not None else load_voice(model_path)
+        self.voice_id = voice_path(model_path).stem
+        self.cache = cache if cache is not None else (TTSCache() if settings.TTS_CACHE else None)
         self.sample_rate = self.voice.config.sample_rate
+        self.pipelined = settings.TTS_PIPELINE
         self._stop_flag = False
+        self._pipelines = set()
+        self._lock = threading.Lock()
 
     def stop(self):
         self._stop_flag = True
+        with self._lock:
+            pipelines = list(self._pipelines)
+        for pipeline in pipelines:
+            pipeline.cancel()
+
+    def open_pipeline(self, chunk_callback) -> SynthesisPipeline:
+        pipeline = SynthesisPipeline(
+            self.voice, chunk_callback, cache=self.cache, voice_id=self.voice_id, on_cancel=self._forget,
+        )
+        with self._lock:
+            self._pipelines.add(pipeline)
+        return pipeline
+
+    def _forget(self, pipeline: SynthesisPipeline):
+        # cancelled before (or instead of) play_pipeline, e.g. a queued job dropped on barge-in
+        with self._lock:
+            self._pipelines.discard(pipeline)
+
+    def play_pipeline(self, pipeline: SynthesisPipeline, engine=None):
+        """
+        Play a pipeline on the calling thread and forget it afterwards.
+        With a PlaybackEngine the audio goes out through it and its result is returned.
+        """
+        try:
+            if engine is not None:
+                return engine.play(pipeline.iter_audio())
+            pipeline.play()
+        finally:
+            self._forget(pipeline)
 
     def synthesize_stream(self, text: str, chunk_callback):
+        if self.pipelined:
+            pipeline = self.open_pipeline(chunk_callback)
+            pipeline.push(text)
+            pipeline.close()
+            self.play_pipeline(pipeline)
+            return
+
         self._stop_flag = False
 
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                for part in iter_frames(cached, self.sample_rate):
+                    if self._stop_flag:
+                        break
+                    chunk_callback(part)
+                return
+
+        parts = []
         try:
             for chunk in self.voice.synthesize(text):
 
@@ -38,8 +269,30 @@ class Synthesizer:
                 # Piper chunk structure
                 chunk_np = chunk.audio_int16_array
                 chunk_np = np.asarray(chunk_np, dtype=np.int16)
+                parts.append(chunk_np)
 
                 chunk_callback(chunk_np)
+            else:
+                if key is not None and parts:
+                    self.cache.put(key, np.concatenate(parts))
 
         except Exception as e:
-            print(f"TTS error: {e}")
\ No newline at end of file
+            print(f"TTS error: {e}")
+
+    def _cache_key(self, text: str):
+        return TTSCache.make_key(text, self.voice_id, self.voice.config.length_scale, self.sample_rate)
+
+    def prerender(self, texts):
+        """Synthesize fixed phrases into the cache so they play with no synthesis delay."""
+        if self.cache is None:
+            return
+        for text in texts:
+            # same units the pipeline looks up, so cached clauses are hit in both modes
+            units = split_clauses(text, settings.TTS_MAX_CLAUSE_CHARS) if self.pipelined else [text]
+            for unit in units:
+                key = self._cache_key(unit)
+                if self.cache.get(key) is not None:
+                    continue
+                parts = [np.asarray(c.audio_int16_array, dtype=np.int16) for c in self.voice.synthesize(unit)]
+                if parts:
+                    self.cache.put(key, np.concatenate(parts))
@@ -0,0 +1,102 @@
+"""
+- cache of synthesized TTS audio (int16 PCM)
+- key: (text, voice model, length_scale, sample rate)
+- in-memory LRU bounded by size, optional on-disk store of raw .pcm files
+- shared by all calls in a process, fixed prompts are pre-rendered at startup
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from configs import settings
+
+
+CacheKey = Tuple[str, str, float, int]
+
+
+class TTSCache:
+
+    def __init__(
+        self,
+        max_bytes: int = settings.TTS_CACHE_MAX_MB * 1024 * 1024,
+        disk_dir: Optional[str] = settings.TTS_CACHE_DIR,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, length_scale: float, sample_rate: int) -> CacheKey:
+        return (" ".join(text.split()), voice_id, float(length_scale), int(sample_rate))
+
+    def _disk_path(self, key: CacheKey) -> Path:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.pcm"
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            if path.exists():
+                audio = np.fromfile(path, dtype=np.int16)
+                self._store(key, audio)
+                with self._lock:
+                    self.hits += 1
+                return audio
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, audio: np.ndarray):
+        audio = np.ascontiguousarray(audio, dtype=np.int16)
+        audio.setflags(write=False)  # shared between calls
+        self._store(key, audio)
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            if not path.exists():
+                tmp = path.with_suffix(".tmp")
+                audio.tofile(tmp)
+                tmp.replace(path)
+
+    def _store(self, key: CacheKey, audio: np.ndarray):
+        if audio.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = audio
+            self._bytes += audio.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "mb": round(self._bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,106 @@
+"""
+- per-call preallocated ring buffer of int16 samples
+- every captured chunk is written, so when the VAD triggers the utterance can
+  start `pre_roll_ms` earlier and the speech onset is not lost
+- the ring is stored twice back to back, any window up to the capacity is a
+  contiguous slice: the growing utterance is read without copying
+- the float32 samples the VAD already computed are kept alongside, so the
+  utterance reaches whisper without another conversion
+- utterances longer than `max_utterance_ms` are split (forced segmentation)
+"""
+
+import numpy as np
+from typing import Optional
+
+from utils.audio_frame import AudioFrame
+
+
+class UtteranceRingBuffer:
+    """
+    One instance per call; fixed memory footprint.
+
+    Usage:
+        ring.write(frame)                 # every AudioFrame, speech or not
+        if speaking and not ring.in_utterance:
+            ring.start_utterance()        # begins pre_roll before now
+        audio = ring.utterance()          # AudioFrame over views of the utterance so far
+        audio = ring.end_utterance()      # same, for the finished utterance
+    """
+
+    def __init__(self, sample_rate: int = 16000, pre_roll_ms: int = 500, max_utterance_ms: int = 20000):
+        self.sample_rate = sample_rate
+        self.pre_roll = int(sample_rate * pre_roll_ms / 1000)
+        self.max_utterance = int(sample_rate * max_utterance_ms / 1000)
+        # one second of slack: a partial pass may still be reading while audio arrives
+        self.capacity = self.pre_roll + self.max_utterance + sample_rate
+        self._data = np.zeros(2 * self.capacity, dtype=np.int16)
+        self._float = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._written = 0                 # total samples written (monotonic)
+        self._start: Optional[int] = None  # first sample of the current utterance
+
+    def write(self, frame: AudioFrame):
+        total = len(frame)
+        if total > self.capacity:
+            frame = frame[-self.capacity:]
+        n = len(frame)
+        pos = (self._written + total - n) % self.capacity
+        first = min(n, self.capacity - pos)
+        rest = n - first
+        # the VAD has converted this frame already, the cached view is reused
+        for ring, samples in ((self._data, frame.pcm), (self._float, frame.float32)):
+            for offset in (0, self.capacity):
+                ring[offset + pos:offset + pos + first] = samples[:first]
+                if rest:
+                    ring[offset:offset + rest] = samples[first:]
+        self._written += total
+
+    def view(self, start: int, end: int) -> AudioFrame:
+        """Read-only frame over samples [start, end) in absolute sample positions."""
+        start = max(start, self._written - self.capacity)
+        end = max(start, min(end, self._written))
+        offset = start % self.capacity
+        pcm = self._data[offset:offset + (end - start)]
+        audio_float = self._float[offset:offset + (end - start)]
+        pcm.flags.writeable = False
+        audio_float.flags.writeable = False
+        return AudioFrame(pcm, self.sample_rate, start, audio_float)
+
+    @property
+    def in_utterance(self) -> bool:
+        return self._start is not None
+
+    @property
+    def utterance_samples(self) -> int:
+        return self._written - self._start if self._start is not None else 0
+
+    @property
+    def utterance_full(self) -> bool:
+        return self.utterance_samples >= self.max_utterance
+
+    def start_utterance(self):
+        """Open an utterance that begins `pre_roll` samples before the newest audio."""
+        self._start = max(0, self._written - self.pre_roll, self._written - self.capacity)
+
+    def utterance(self) -> AudioFrame:
+        if self._start is None:
+            return self.view(self._written, self._written)
+        return self.view(self._start, self._written)
+
+    def end_utterance(self) -> AudioFrame:
+        """
+        Close the current utterance and return it. The view stays valid until the
+        ring wraps over it, copy it before handing it to another thread.
+        """
+        audio = self.utterance()
+        self._start = None
+        return audio
+
+    def split_utterance(self) -> AudioFrame:
+        """Return the utterance so far and continue a new one right after it (no pre-roll)."""
+        audio = self.utterance()
+        self._start = self._written
+        return audio
+
+    def reset(self):
+        self._written = 0
+        self._start = None
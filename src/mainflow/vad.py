@@ -1,9 +1,183 @@
 # voice activity detection whether user is silent or speaking 
 
+import threading
 import torch
 import silero_vad
 import numpy as np
-from typing import Optional, Callable
+from typing import Optional, Callable, List, Tuple, Union
+
+from utils.audio_frame import AudioFrame, as_frame
+from utils.logger import logger
+
+# private recurrent state of silero-vad 5.x (JIT and ONNX wrapper), stacked per
+# stream by infer_batch; pinned in requirements.txt
+_SILERO_STATE_ATTRS = ("_state", "_context", "_last_sr", "_last_batch_size")
+
+
+class VADModel:
+    """
+    Silero model that can be shared by many VAD streams.
+    The recurrent state lives with each stream, the weights are loaded once.
+    """
+
+    def __init__(self, model=None):
+        self.model = model if model is not None else silero_vad.load_silero_vad()
+        self._lock = threading.Lock()
+        self.model.reset_states()
+        self.batched = all(hasattr(self.model, attr) for attr in _SILERO_STATE_ATTRS)
+        if not self.batched:
+            logger.warning(
+                "Silero VAD model has no batchable state "
+                f"({', '.join(_SILERO_STATE_ATTRS)}); batched inference runs stream by stream"
+            )
+
+    def infer(self, audio_float: np.ndarray, sample_rate: int, state: Optional[Tuple] = None) -> Tuple[float, Tuple]:
+        """
+        Run one frame through the model using the caller's recurrent state.
+
+        Returns:
+            (speech probability, updated state)
+        """
+        with self._lock:
+            if state is None:
+                self.model.reset_states()
+            else:
+                self._load_state(state)
+            with torch.no_grad():
+                prob = self.model(torch.from_numpy(audio_float), sample_rate).item()
+            return prob, self._save_state()
+
+    def infer_batch(
+        self,
+        frames: np.ndarray,
+        sample_rate: int,
+        states: List[Optional[Tuple]],
+    ) -> Tuple[np.ndarray, List[Tuple]]:
+        """
+        Run one frame from each of several streams in a single forward call.
+
+        Args:
+            frames: float32 array (streams, samples), all frames the same length.
+            states: each stream's recurrent state (None for a fresh stream).
+
+        Returns:
+            (speech probability per stream, updated state per stream)
+        """
+        if not self.batched:
+            results = [self.infer(frame, sample_rate, state) for frame, state in zip(frames, states)]
+            return np.array([prob for prob, _ in results], dtype=np.float32), [state for _, state in results]
+
+        batch = len(states)
+        fresh_state = torch.zeros((2, 1, 128))
+        fresh_context = torch.zeros((1, 64 if sample_rate == 16000 else 32))
+
+        with self._lock:
+            m = self.model
+            # silero keeps (2, batch, 128) state and (batch, context) samples,
+            # stack the streams along the batch dimension
+            m._state = torch.cat([s[0] if s is not None else fresh_state for s in states], dim=1)
+            m._context = torch.cat([s[1] if s is not None else fresh_context for s in states], dim=0)
+            m._last_sr = sample_rate
+            m._last_batch_size = batch
+            with torch.no_grad():
+                probs = m(torch.from_numpy(frames), sample_rate).reshape(-1).numpy().copy()
+            new_states = [
+                (m._state[:, i:i + 1].clone(), m._context[i:i + 1].clone(), sample_rate, 1)
+                for i in range(batch)
+            ]
+        return probs, new_states
+
+    def _save_state(self) -> Tuple:
+        m = self.model
+        return (m._state, m._context, m._last_sr, m._last_batch_size)
+
+    def _load_state(self, state: Tuple):
+        m = self.model
+        m._state, m._context, m._last_sr, m._last_batch_size = state
+
+
+class EnergyGate:
+    """
+    Cheap RMS / zero-crossing check in front of the neural VAD.
+    Tracks the line's noise floor (in dB) and flags frames that are clearly
+    silent, so they can skip Silero inference. The floor only learns from
+    frames the VAD judged to be non-speech (learn()), and nothing is skipped
+    until it has seen `warmup_frames` of them.
+
+    Args:
+        margin_db: frames quieter than noise floor + margin are silent.
+        noise_margin_db: up to this far above the floor, noise-like frames
+                         (high zero-crossing rate) are silent too.
+        min_db / max_db: bounds of the floor, dBFS. Below min_db a frame is always silent.
+        warmup_frames: non-speech frames to learn the floor from before gating.
+    """
+
+    def __init__(
+        self,
+        margin_db: float = 4.0,
+        noise_margin_db: float = 10.0,
+        zcr_threshold: float = 0.35,
+        min_db: float = -55.0,
+        max_db: float = -25.0,
+        attack: float = 0.2,
+        release: float = 0.005,
+        warmup_frames: int = 15,
+    ):
+        self.margin_db = margin_db
+        self.noise_margin_db = noise_margin_db
+        self.zcr_threshold = zcr_threshold
+        self.min_db = min_db
+        self.max_db = max_db
+        self.attack = attack      # how fast the floor follows quieter frames
+        self.release = release    # how fast it creeps up under louder ones
+        self.warmup_frames = warmup_frames
+        self.noise_floor_db: Optional[float] = None
+        self.learned = 0  # non-speech frames the floor has seen
+        self._pending_db: Optional[float] = None  # level of the last frame, until learn()
+        self.frames = 0
+        self.skipped = 0
+
+    def is_silent(self, audio_float: np.ndarray) -> bool:
+        x = audio_float
+        level_db = 10 * float(np.log10(np.mean(x * x) + 1e-10))
+        self._pending_db = level_db
+        self.frames += 1
+        floor = self.noise_floor_db
+        if floor is None or self.learned < self.warmup_frames:
+            return False
+
+        zcr = np.count_nonzero(np.signbit(x[1:]) != np.signbit(x[:-1])) / max(1, len(x) - 1)
+        silent = (
+            level_db < self.min_db
+            or level_db < floor + self.margin_db
+            or (level_db < floor + self.noise_margin_db and zcr > self.zcr_threshold)
+        )
+        if silent:
+            self.skipped += 1
+        return silent
+
+    def learn(self, speech: bool):
+        """Verdict for the frame last passed to is_silent(); non-speech frames move the floor."""
+        level_db, self._pending_db = self._pending_db, None
+        if level_db is None or speech:
+            return
+        floor = self.noise_floor_db
+        if floor is None:
+            floor = level_db
+        elif level_db < floor:
+            floor += self.attack * (level_db - floor)
+        else:
+            floor += self.release * (level_db - floor)
+        self.noise_floor_db = min(max(floor, self.min_db), self.max_db)
+        self.learned += 1
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skipped_fraction": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "noise_floor_db": round(self.noise_floor_db, 1) if self.noise_floor_db is not None else None,
+        }
 
 
 class VAD:
@@ -16,6 +190,8 @@ class VAD:
         min_silence_duration_ms: int = 700,
         on_speech_start: Optional[Callable[[], None]] = None,
         on_speech_end: Optional[Callable[[], None]] = None,
+        model: Optional[VADModel] = None,
+        energy_gate: Optional[EnergyGate] = None,
     ):
        
         self.sample_rate = sample_rate
@@ -26,7 +202,12 @@ class VAD:
         self.min_speech_samples = int(sample_rate * min_speech_duration_ms / 1000)
         self.min_silence_samples = int(sample_rate * min_silence_duration_ms / 1000)
 
-        self.model = silero_vad.load_silero_vad()
+        self.model = model if model is not None else VADModel()
+        self._model_state = None  # per-stream recurrent state
+        self.energy_gate = energy_gate
+        self._skipped_run = 0
+        # after this much gated silence the recurrent state starts fresh
+        self._skip_reset_chunks = max(1, sample_rate // 512)
 
         self.triggered = False
         self.speech_start_sample = 0
@@ -41,19 +222,57 @@ class VAD:
         self.speech_start_sample = 0
         self.silence_start_sample = 0
         self.current_sample = 0
+        self._model_state = None
+        self._skipped_run = 0
 
-    def process_chunk(self, audio_chunk: np.ndarray) -> bool:
+    def gate(self, audio_float: np.ndarray) -> bool:
+        """
+        Run the energy gate on a chunk. A gated chunk is not shown to the model,
+        so the model's audio context is moved past it here; after a longer run
+        of gated chunks the recurrent state is dropped, which is the state
+        Silero starts from on a silent line. Inside an utterance every chunk
+        goes to the model, so quiet syllables cannot end it early.
+
+        Returns:
+            True if the chunk is silent and inference should be skipped.
+        """
+        if self.energy_gate is None or self.triggered or not self.energy_gate.is_silent(audio_float):
+            self._skipped_run = 0
+            return False
+
+        self._skipped_run += 1
+        if self._skipped_run >= self._skip_reset_chunks:
+            self._model_state = None
+        elif self._model_state is not None:
+            state, context, last_sr, batch = self._model_state
+            tail = torch.from_numpy(audio_float[-context.shape[-1]:].copy()).reshape(context.shape)
+            self._model_state = (state, tail, last_sr, batch)
+        return True
+
+    def process_chunk(self, audio_chunk: Union[np.ndarray, AudioFrame]) -> bool:
         """
         Returns:
             True if currently in speech state, False otherwise.
         """
-        audio_float = audio_chunk.astype(np.float32) / 32768.0
+        # the float32 view is cached on the frame for the later stages
+        audio_float = as_frame(audio_chunk, self.sample_rate).float32
+        if self.gate(audio_float):
+            return self.update(0.0, len(audio_chunk))
 
-        with torch.no_grad():
-            prob = self.model(torch.from_numpy(audio_float), self.sample_rate).item()
+        prob, self._model_state = self.model.infer(audio_float, self.sample_rate, self._model_state)
+        return self.update(prob, len(audio_chunk))
 
-        chunk_len = len(audio_chunk)
+    def update(self, prob: float, chunk_len: int) -> bool:
+        """
+        Advance the trigger/hysteresis state with a speech probability that was
+        computed elsewhere (e.g. in a batched pass over many streams).
+
+        Returns:
+            True if currently in speech state, False otherwise.
+        """
         self.current_sample += chunk_len
+        if self.energy_gate is not None:
+            self.energy_gate.learn(speech=prob >= self.threshold or self.triggered)
 
         if prob >= self.threshold:
             if not self.triggered:
@@ -0,0 +1,118 @@
+# src/server.py
+"""
+Multi-call server.
+- loads whisper / silero / piper once (SharedModels)
+- runs every call as an independent VoiceAssistant (own Session, VAD state, buffers)
+- reports per-call and aggregate turn latency
+- accepts phone calls over the AudioSocket gateway (ASTERISK_HOST:ASTERISK_PORT)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from main import VoiceAssistant
+from mainflow.models import SharedModels
+from mainflow.audiosocket import AudioSocketGateway
+from mainflow.batch_transcriber import BatchTranscriber
+from utils.logger import logger
+from utils.metrics import LatencyStats
+from utils.tracing import StageHistograms
+from configs import settings
+
+
+class CallServer:
+
+    def __init__(self, models: Optional[SharedModels] = None, max_calls: int = settings.SERVER_MAX_CALLS):
+        logger.info("Loading shared models...")
+        self.models = models if models is not None else SharedModels(whisper_workers=settings.WHISPER_NUM_WORKERS)
+        self.max_calls = max_calls
+        self.active_calls: Dict[str, VoiceAssistant] = {}
+        self.aggregate_latency = LatencyStats()
+        self.interrupt_latency = LatencyStats()
+        self.stage_latency = StageHistograms()
+        self.completed_calls = 0
+        self._slots = asyncio.Semaphore(max_calls)
+        self._call_counter = 0
+
+    def _next_call_id(self) -> str:
+        self._call_counter += 1
+        return f"call_{int(time.time())}_{self._call_counter}"
+
+    async def handle_call(self, audio, call_id: Optional[str] = None) -> Dict:
+        """
+        Run one call to completion on a worker thread.
+
+        Args:
+            audio: per-call audio object (generate_chunks / play_audio_chunk / close).
+            call_id: optional id, generated if missing.
+
+        Returns:
+            Latency summary of the call.
+        """
+        call_id = call_id or self._next_call_id()
+        async with self._slots:
+            assistant = VoiceAssistant(models=self.models, audio=audio, call_id=call_id)
+            self.active_calls[call_id] = assistant
+            logger.system(f"Call {call_id} started ({len(self.active_calls)} active)")
+            try:
+                await asyncio.to_thread(assistant.run)
+            except Exception as e:
+                logger.error(f"Call {call_id} failed: {e}")
+            finally:
+                self.models.release_vad(assistant.vad)
+                self.active_calls.pop(call_id, None)
+                self.completed_calls += 1
+                self.aggregate_latency.extend(assistant.turn_latency)
+                self.interrupt_latency.extend(assistant.playback.interrupt_latency)
+                self.stage_latency.merge(assistant.tracer.histograms)
+
+        summary = assistant.turn_latency.summary()
+        logger.system(f"Call {call_id} finished, turn latency: {summary}")
+        return summary
+
+    def stats(self) -> Dict:
+        stats = {
+            "active_calls": len(self.active_calls),
+            "completed_calls": self.completed_calls,
+            "per_call": {cid: a.turn_latency.summary() for cid, a in list(self.active_calls.items())},
+            "aggregate": self.aggregate_latency.summary(),
+            "interrupt_to_silence": self.interrupt_latency.summary(),
+            "stages": self.stage_latency.summary(),
+        }
+        if self.models.tts_cache is not None:
+            stats["tts_cache"] = self.models.tts_cache.stats()
+        if isinstance(self.models.transcriber, BatchTranscriber):
+            stats["stt_batching"] = self.models.transcriber.stats()
+        if self.models.vad_engine is not None:
+            stats["vad_batching"] = self.models.vad_engine.stats()
+        return stats
+
+    def prometheus(self) -> str:
+        """Stage latency of all completed calls in Prometheus text format."""
+        return self.stage_latency.to_prometheus()
+
+    async def report_stats(self, interval: float = settings.SERVER_STATS_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"Server stats: {self.stats()}")
+
+
+async def main():
+    server = CallServer()
+    gateway = AudioSocketGateway(
+        handle_call=server.handle_call,
+        output_rate=server.models.voice.config.sample_rate,
+    )
+    reporter = asyncio.create_task(server.report_stats())
+    try:
+        await gateway.serve_forever()
+    finally:
+        reporter.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+audio_frame.py - Audio passed between pipeline stages.
+
+Provides:
+- AudioFrame: int16 samples plus a float32 view that is computed once, on
+  first use, and shared by every stage that needs it (VAD, ASR).
+- as_frame: wrap a plain int16 array (no copy) unless it already is a frame.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+
+_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioFrame:
+    """
+    A chunk or an utterance of mono audio.
+
+    Slicing returns a frame over views of the same buffers, so a slice of a
+    frame whose float32 view is already cached never converts again.
+
+    Usage:
+        frame = AudioFrame(chunk, 16000)
+        frame.float32          # converted on first access, cached afterwards
+        tail = frame[16000:]   # AudioFrame, no copy
+    """
+
+    __slots__ = ("pcm", "sample_rate", "start_sample", "_float")
+
+    def __init__(
+        self,
+        pcm: np.ndarray,
+        sample_rate: int = 16000,
+        start_sample: int = 0,
+        float32: Optional[np.ndarray] = None,
+    ):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.start_sample = start_sample  # position in the call, for timing
+        self._float = float32
+
+    @classmethod
+    def from_bytes(cls, data: bytes, sample_rate: int = 16000, start_sample: int = 0) -> "AudioFrame":
+        return cls(np.frombuffer(data, dtype=np.int16), sample_rate, start_sample)
+
+    @property
+    def float32(self) -> np.ndarray:
+        if self._float is None:
+            # one allocation: int16 -> float32 and scaling in a single ufunc
+            self._float = np.multiply(self.pcm, _SCALE, dtype=np.float32)
+        return self._float
+
+    @property
+    def has_float(self) -> bool:
+        return self._float is not None
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / self.sample_rate
+
+    @property
+    def end_sample(self) -> int:
+        return self.start_sample + len(self.pcm)
+
+    def __len__(self) -> int:
+        return len(self.pcm)
+
+    def __getitem__(self, index: slice) -> "AudioFrame":
+        if not isinstance(index, slice):
+            raise TypeError("AudioFrame only supports slicing")
+        start, _, _ = index.indices(len(self.pcm))
+        return AudioFrame(
+            self.pcm[index],
+            self.sample_rate,
+            self.start_sample + start,
+            self._float[index] if self._float is not None else None,
+        )
+
+    def copy(self) -> "AudioFrame":
+        """Own copy of the samples, e.g. before the underlying ring buffer is reused."""
+        return AudioFrame(
+            self.pcm.copy(),
+            self.sample_rate,
+            self.start_sample,
+            self._float.copy() if self._float is not None else None,
+        )
+
+    def tobytes(self) -> bytes:
+        return self.pcm.tobytes()
+
+
+def as_frame(audio: Union[np.ndarray, AudioFrame], sample_rate: int = 16000) -> AudioFrame:
+    if isinstance(audio, AudioFrame):
+        return audio
+    return AudioFrame(np.asarray(audio, dtype=np.int16), sample_rate)
@@ -8,10 +8,10 @@ Provides functions to:
 - Convert between numpy arrays and bytes.
 """
 
+import math
 import numpy as np
 import wave
 import audioop
-from pydub import AudioSegment
 from typing import Union, BinaryIO
 import io
 
@@ -45,7 +45,7 @@ def pcm_to_mulaw(pcm: np.ndarray) -> bytes:
         Raw mu-law bytes.
     """
     # Convert numpy array to bytes
-    pcm_bytes = pcm.astype(np.int16).tobytes()
+    pcm_bytes = np.ascontiguousarray(pcm, dtype=np.int16).tobytes()
     # audioop's linear to mulaw conversion
     mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
     return mulaw_bytes
@@ -53,6 +53,70 @@ def pcm_to_mulaw(pcm: np.ndarray) -> bytes:
 
 # ------------------- Resampling -------------------
 
+class Resampler:
+    """
+    Streaming polyphase resampler (windowed-sinc FIR, pure NumPy).
+
+    Keeps the filter history between calls, so 20-30 ms frames can be fed one
+    by one without edge artefacts. Works for any integer rate pair, e.g.
+    8k <-> 16k, 22.05k -> 16k/8k, 24k/48k -> 16k.
+
+    Usage:
+        rs = Resampler(8000, 16000)
+        for frame in frames:
+            out = rs.process(frame)   # int16 in, int16 out
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int, taps_per_phase: int = 16, beta: float = 8.0):
+        g = math.gcd(orig_sr, target_sr)
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.up = target_sr // g
+        self.down = orig_sr // g
+        self.taps = taps_per_phase
+
+        L, K = self.up, self.taps
+        # centre on an integer tap so the delay is exactly half the filter
+        n = np.arange(L * K) - (L * K) // 2
+        cutoff = 0.5 / max(L, self.down) * 0.95  # cycles per upsampled sample
+        h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(L * K + 1, beta)[:-1]
+        h *= L / h.sum()
+        # phases[p, k] = h[p + k*L]: taps applied to x[i - k] for output phase p
+        self._phases = h.reshape(K, L).T.astype(np.float32).copy()
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        # next output as an upsampled index into history+chunk; starting half a filter
+        # in keeps output sample 0 aligned with input sample 0 (no group delay)
+        self._pos = (self.taps - 1) * self.up + (self.taps * self.up) // 2
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        if self.up == self.down:
+            return np.asarray(chunk, dtype=np.int16)
+
+        buf = np.concatenate([self._history, np.asarray(chunk, dtype=np.float32)])
+        last = len(buf) * self.up - 1
+        count = (last - self._pos) // self.down + 1 if self._pos <= last else 0
+
+        if count > 0:
+            pos = self._pos + self.down * np.arange(count)
+            idx = pos // self.up
+            phase = pos % self.up
+            window = idx[:, None] - np.arange(self.taps)[None, :]
+            out = np.einsum("ij,ij->i", self._phases[phase], buf[window])
+            next_pos = int(pos[-1]) + self.down
+        else:
+            out = np.zeros(0, dtype=np.float32)
+            next_pos = self._pos
+
+        keep = self.taps - 1
+        dropped = len(buf) - keep
+        self._history = buf[dropped:]
+        self._pos = next_pos - dropped * self.up
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+
 def resample(
     audio: np.ndarray,
     orig_sr: int,
@@ -60,7 +124,8 @@ def resample(
     dtype: type = np.int16
 ) -> np.ndarray:
     """
-    Resample audio from orig_sr to target_sr using pydub (simple quality).
+    Resample a complete clip from orig_sr to target_sr.
+    For streams use a Resampler instance so state carries across chunks.
 
     Args:
         audio: numpy array of samples.
@@ -71,19 +136,11 @@ def resample(
     Returns:
         Resampled audio as numpy array.
     """
-    # Convert numpy to AudioSegment
-    audio_bytes = audio.astype(dtype).tobytes()
-    seg = AudioSegment(
-        data=audio_bytes,
-        sample_width=2,  # 16-bit
-        frame_rate=orig_sr,
-        channels=1
-    )
-    # Resample
-    resampled = seg.set_frame_rate(target_sr)
-    # Convert back to numpy
-    samples = np.frombuffer(resampled.raw_data, dtype=dtype)
-    return samples
+    resampler = Resampler(orig_sr, target_sr)
+    # pad with half a filter of zeros so the tail of the clip is flushed out
+    padded = np.concatenate([np.asarray(audio), np.zeros(resampler.taps, dtype=np.int16)])
+    expected = int(round(len(audio) * target_sr / orig_sr))
+    return resampler.process(padded)[:expected].astype(dtype)
 
 
 # ------------------- File I/O -------------------
@@ -98,7 +155,7 @@ def save_wav(
     Save numpy array as a WAV file.
 
     Args:
-        audio: numpy array of samples.
+        audio: numpy array of samples (or an AudioFrame).
         filename: Output file path.
         sample_rate: Sample rate in Hz.
         dtype: Data type (should match audio.dtype).
@@ -107,7 +164,7 @@ def save_wav(
         wf.setnchannels(1)
         wf.setsampwidth(2)  # 2 bytes for int16
         wf.setframerate(sample_rate)
-        wf.writeframes(audio.astype(dtype).tobytes())
+        wf.writeframes(np.ascontiguousarray(getattr(audio, "pcm", audio), dtype=dtype).tobytes())
 
 
 def load_wav(filename: str) -> (np.ndarray, int):
@@ -137,4 +194,4 @@ def bytes_to_pcm(audio_bytes: bytes, dtype: type = np.int16) -> np.ndarray:
 
 def pcm_to_bytes(pcm: np.ndarray) -> bytes:
     """Convert numpy PCM array to bytes."""
-    return pcm.astype(np.int16).tobytes()
+    return np.ascontiguousarray(pcm, dtype=np.int16).tobytes()
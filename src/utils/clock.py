@@ -0,0 +1,72 @@
+"""
+clock.py - Time source for call timers and playback pacing.
+
+Provides:
+- Clock: wall-clock time (time.time / time.perf_counter), the default.
+- SimulatedClock: time that only moves when something sleeps or advances it,
+  so a recorded call replays at full CPU speed while the reminder and
+  inactivity timers still see the call's own timeline.
+- SYSTEM_CLOCK: the shared wall clock.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class Clock:
+    """
+    Usage:
+        clock.time()                  # epoch seconds, for timers
+        clock.monotonic()             # for pacing and durations
+        clock.sleep(0.02)
+        clock.wait(stop_event, 0.02)  # True if the event was set
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        return event.wait(timeout)
+
+
+class SimulatedClock(Clock):
+    """
+    Sleeping moves the clock forward instead of blocking. Every thread shares
+    one timeline, so time jumps to whichever deadline is asked for.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = start if start is not None else time.time()
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        with self._lock:
+            return self._now
+
+    def monotonic(self) -> float:
+        return self.time()
+
+    def advance(self, seconds: float):
+        if seconds > 0:
+            with self._lock:
+                self._now += seconds
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return event.is_set()
+
+
+SYSTEM_CLOCK = Clock()
@@ -0,0 +1,62 @@
+"""
+metrics.py - Small in-process latency statistics.
+
+Provides:
+- LatencyStats: thread-safe collector of latency samples with percentile summary.
+"""
+
+import threading
+from typing import Dict, List
+
+
+class LatencyStats:
+    """
+    Collects latency samples (seconds) and summarises them.
+
+    Usage:
+        stats = LatencyStats()
+        stats.record(0.42)
+        stats.summary()  # {'count': 1, 'mean_ms': 420.0, ...}
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self._samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            if len(self._samples) > self.max_samples:
+                # keep the most recent window only
+                del self._samples[: len(self._samples) - self.max_samples]
+
+    def extend(self, other: "LatencyStats") -> None:
+        for value in other.samples():
+            self.record(value)
+
+    def samples(self) -> List[float]:
+        with self._lock:
+            return list(self._samples)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def summary(self) -> Dict[str, float]:
+        values = sorted(self.samples())
+        if not values:
+            return {"count": 0}
+
+        def pct(p: float) -> float:
+            idx = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+            return round(values[idx] * 1000, 1)
+
+        return {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values) * 1000, 1),
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(values[-1] * 1000, 1),
+        }
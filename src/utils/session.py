@@ -22,6 +22,7 @@ class Turn:
     entities: Dict[str, Any] = field(default_factory=dict)
     action_items: List[str] = field(default_factory=list)
     decisions: List[str] = field(default_factory=list)
+    interrupted: bool = False  # caller barged in, text is only the part that was heard
 
 
 class Session:
@@ -31,7 +32,9 @@ class Session:
         self.call_id = call_id
         self.start_time = start_time or time.time()
         self.history: List[Turn] = []
-        self.summary: str = ""
+        self.summary: str = ""  # running summary of history[:summarized_turns]
+        self.summarized_turns = 0
+        self.call_state: str = ""  # customer profile and lead stage, rewritten every turn
         self.action_items: List[str] = []
         self.decisions: List[str] = []
         self.sentiment_timeline: List[tuple] = []  # (timestamp, sentiment)
@@ -65,7 +68,7 @@ class Session:
         )
         self.history.append(turn)
 
-    def add_ai_message(self, text: str, metadata: Dict[str, Any]) -> None:
+    def add_ai_message(self, text: str, metadata: Dict[str, Any]) -> Turn:
         turn = Turn(
             role='ai',
             text=text,
@@ -74,7 +77,8 @@ class Session:
             sentiment=metadata.get('sentiment'),
             entities=metadata.get('entities', {}),
             action_items=metadata.get('action_items', []),
-            decisions=metadata.get('decisions', [])
+            decisions=metadata.get('decisions', []),
+            interrupted=metadata.get('interrupted', False),
         )
         self.history.append(turn)
 
@@ -141,6 +145,7 @@ class Session:
             pid = metadata["entities"]["property_id"]
             if pid not in self.insights["properties_discussed"]:
                 self.insights["properties_discussed"].append(pid)
+        return turn
 
     def get_recent_history(self, n: int = 5) -> List[Turn]:
         """
@@ -154,6 +159,18 @@ class Session:
         """
         return self.history[-n:]
 
+    def unsummarized_history(self, max_turns: int) -> List[Turn]:
+        """The last `max_turns` turns that are not folded into the summary yet."""
+        start = max(self.summarized_turns, len(self.history) - max_turns)
+        return self.history[start:]
+
+    def should_summarize(self, every_turns: int, every_tokens: int, keep_recent: int) -> bool:
+        """True once enough turns (or text, ~4 chars per token) wait to be folded in."""
+        pending = self.history[self.summarized_turns:len(self.history) - keep_recent]
+        if not pending:
+            return False
+        return len(pending) >= every_turns or sum(len(t.text) for t in pending) >= every_tokens * 4
+
     def get_context_for_prompt(self, max_turns: int = 5) -> str:
         recent = self.get_recent_history(max_turns)
         context = f"Conversation summary: {self.summary}\n\nRecent exchanges:\n"
@@ -162,18 +179,32 @@ class Session:
             context += f"{speaker}: {turn.text}\n"
         return context
 
-    def update_summary(self, summarizer_func) -> None:
+    def update_summary(self, summarizer_func, keep_recent: int = 4) -> bool:
         """
-        Update the running summary by calling an external summarizer (LLM).
+        Fold all turns but the last `keep_recent` into the running summary.
 
         Args:
-            summarizer_func: A function that takes the full history and returns
-                             a condensed summary string.
+            summarizer_func: (summary so far, transcript of the new turns) -> new
+                             summary; an LLM call, so run this off the turn path.
+
+        Returns:
+            False if there was nothing to fold in.
         """
-        # This method is optional; you may call it periodically (e.g., every 3 turns)
-        # The actual summarisation is delegated to an LLM call.
-        # For now, we just set a placeholder; you'll implement it in main.
-        pass
+        start = self.summarized_turns
+        end = len(self.history) - keep_recent
+        if end <= start:
+            return False
+        lines = []
+        for turn in self.history[start:end]:
+            speaker = "User" if turn.role == 'user' else "Assistant"
+            suffix = " [interrupted]" if turn.interrupted else ""
+            lines.append(f"{speaker}: {turn.text}{suffix}")
+        summary = summarizer_func(self.summary, "\n".join(lines))
+        # summary before the index: a prompt built in between repeats a few turns
+        # instead of losing them
+        self.summary = summary
+        self.summarized_turns = end
+        return True
 
     def to_dict(self) -> Dict:
         """Export session data as a dictionary (for saving)."""
@@ -183,6 +214,7 @@ class Session:
             'duration': time.time() - self.start_time,
             'history': [asdict(t) for t in self.history],
             'summary': self.summary,
+            'summarized_turns': self.summarized_turns,
             'action_items': self.action_items,
             'decisions': self.decisions,
             'sentiment_timeline': self.sentiment_timeline,
@@ -194,7 +226,8 @@ class Session:
         lines = []
         for turn in self.history:
             speaker = "User" if turn.role == "user" else "Assistant"
-            lines.append(f"{speaker}: {turn.text}")
+            suffix = " [interrupted]" if turn.interrupted else ""
+            lines.append(f"{speaker}: {turn.text}{suffix}")
         return "\n".join(lines)
 
     def save_to_file(self, filepath: str) -> None:
@@ -0,0 +1,200 @@
+"""
+text_stream.py - Helpers for text that arrives in pieces (LLM token streams).
+
+Provides:
+- JSONFieldStreamer: pulls the value of one string field out of a JSON
+  document while the document is still streaming in.
+- SentenceBuffer: accumulates text and yields complete sentences.
+- split_sentences / split_clauses: the same rules applied to complete text.
+"""
+
+import re
+from typing import List, Optional
+
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class JSONFieldStreamer:
+    """
+    Incremental extractor for one top-level string field.
+
+    Usage:
+        streamer = JSONFieldStreamer("final_response")
+        for chunk in stream:
+            new_text = streamer.feed(chunk)  # decoded characters of the field, may be ''
+        streamer.done    # True once the field's value has ended
+        streamer.closed  # True once the top-level object has ended
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.text = ""        # everything extracted so far
+        self.done = False     # the field's string value has ended
+        self.closed = False   # top-level object finished
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: Optional[str] = None  # pending \\uXXXX digits
+        self._string_is_key = False
+        self._current = []    # current string being read (key or non-target value)
+        self._last_key: Optional[str] = None
+        self._expect_key = False
+        self._capturing = False
+
+    def feed(self, chunk: str) -> str:
+        out = []
+        for ch in chunk:
+            if self.closed:
+                break
+            if self._in_string:
+                self._feed_string_char(ch, out)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_is_key = self._expect_key and self._depth == 1
+                self._capturing = (
+                    not self._string_is_key
+                    and self._depth == 1
+                    and self._last_key == self.field
+                )
+                self._current = []
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0 and ch == "}":
+                    self.closed = True
+            elif ch == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch == ":":
+                self._expect_key = False
+
+        new_text = "".join(out)
+        self.text += new_text
+        return new_text
+
+    def _feed_string_char(self, ch: str, out: List[str]):
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                try:
+                    self._emit(chr(int(self._unicode, 16)), out)
+                except ValueError:
+                    pass
+                self._unicode = None
+            return
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(ch, ch), out)
+            return
+        if ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._capturing:
+                self.done = True
+            if self._string_is_key:
+                self._last_key = "".join(self._current)
+            elif self._depth == 1:
+                self._last_key = None
+            self._capturing = False
+        else:
+            self._emit(ch, out)
+
+    def _emit(self, ch: str, out: List[str]):
+        if self._capturing:
+            out.append(ch)
+        elif self._string_is_key:
+            self._current.append(ch)
+
+
+# words that end with a dot but do not end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "rs", "no", "sq", "ft", "approx", "vs", "e.g", "i.e", "sq.ft"}
+
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s")
+
+
+class SentenceBuffer:
+    """
+    Accumulates streamed text and hands back complete sentences.
+
+    Usage:
+        buf = SentenceBuffer()
+        for piece in pieces:
+            for sentence in buf.push(piece):
+                speak(sentence)
+        rest = buf.flush()
+    """
+
+    def __init__(self, min_chars: int = 0):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def push(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences = []
+        search_from = 0
+        while True:
+            match = _BOUNDARY.search(self._buffer, search_from)
+            if not match:
+                break
+            candidate = self._buffer[: match.end()].strip()
+            last_word = candidate.rstrip(".!?\"')]").split()[-1].lower() if candidate.split() else ""
+            if (
+                (candidate.endswith(".") and last_word in ABBREVIATIONS)
+                or len(candidate) < self.min_chars
+            ):
+                search_from = match.end()
+                continue
+            sentences.append(candidate)
+            self._buffer = self._buffer[match.end():]
+            search_from = 0
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a complete text into sentences with the same rules as SentenceBuffer."""
+    buf = SentenceBuffer()
+    sentences = buf.push(text)
+    rest = buf.flush()
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+_CLAUSE = re.compile(r"(?<=[,;:])\s+")
+
+
+def split_clauses(text: str, max_chars: int = 120) -> List[str]:
+    """
+    Sentences, with any sentence longer than `max_chars` further split at
+    clause punctuation (, ; :) so synthesis units stay short.
+    """
+    pieces = []
+    for sentence in split_sentences(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        current = ""
+        for clause in _CLAUSE.split(sentence):
+            if current and len(current) + len(clause) + 1 > max_chars:
+                pieces.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}".strip()
+        if current:
+            pieces.append(current)
+    return pieces
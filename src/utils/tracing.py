@@ -0,0 +1,183 @@
+"""
+tracing.py - Per-turn stage spans and latency histograms.
+
+Provides:
+- TurnTrace: spans (stage, start, end) of one turn, monotonic clock
+  (time.perf_counter), origin = the moment the caller stopped speaking.
+- StageHistograms: per-stage bucketed histograms plus p50/p95/p99, mergeable
+  across calls, exportable in Prometheus text format.
+- Tracer: one per call; collects finished turns and writes them next to the
+  call's analytics file.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.metrics import LatencyStats
+
+
+# seconds; covers VAD hangover (~0.2 s) up to slow LLM turns
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class TurnTrace:
+    """
+    Usage:
+        trace = tracer.new_turn()
+        trace.span("vad_end", start, end)
+        with trace.stage("asr"):
+            ...
+        tracer.finish(trace)
+    """
+
+    def __init__(self, turn: int, origin: Optional[float] = None):
+        self.turn = turn
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, start: Optional[float], end: Optional[float] = None):
+        """Record a finished span; ignored if start is unknown."""
+        if start is None:
+            return
+        end = end if end is not None else time.perf_counter()
+        with self._lock:
+            self.spans.append((stage, start, end))
+
+    @contextmanager
+    def stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.span(stage, start)
+
+    def has(self, stage: str) -> bool:
+        with self._lock:
+            return any(name == stage for name, _, _ in self.spans)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s[1])
+        return {
+            "turn": self.turn,
+            "spans": [
+                {
+                    "stage": name,
+                    "start_ms": round((start - self.origin) * 1000, 1),
+                    "duration_ms": round((end - start) * 1000, 1),
+                }
+                for name, start, end in spans
+            ],
+        }
+
+
+class StageHistograms:
+    """Latency per stage: cumulative bucket counts for export, samples for percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._samples: Dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            counts = self._counts.setdefault(stage, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[stage] = self._sums.get(stage, 0.0) + seconds
+            samples = self._samples.setdefault(stage, LatencyStats())
+        samples.record(seconds)
+
+    def merge(self, other: "StageHistograms"):
+        with other._lock:
+            stages = {name: list(counts) for name, counts in other._counts.items()}
+            sums = dict(other._sums)
+            samples = dict(other._samples)
+        with self._lock:
+            for name, counts in stages.items():
+                mine = self._counts.setdefault(name, [0] * (len(self.buckets) + 1))
+                for i, c in enumerate(counts):
+                    mine[i] += c
+                self._sums[name] = self._sums.get(name, 0.0) + sums[name]
+            targets = {name: self._samples.setdefault(name, LatencyStats()) for name in samples}
+        for name, stats in samples.items():
+            targets[name].extend(stats)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            samples = dict(self._samples)
+        return {name: stats.summary() for name, stats in sorted(samples.items())}
+
+    def to_prometheus(self, metric: str = "voice_stage_latency_seconds", labels: Optional[Dict[str, str]] = None) -> str:
+        base = "".join(f',{k}="{v}"' for k, v in (labels or {}).items())
+        lines = [
+            f"# HELP {metric} Latency of each stage of a conversation turn.",
+            f"# TYPE {metric} histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._counts)
+            for name in stages:
+                cumulative = 0
+                for bound, count in zip(self.buckets, self._counts[name]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{name}"{base},le="{bound}"}} {cumulative}')
+                cumulative += self._counts[name][-1]
+                lines.append(f'{metric}_bucket{{stage="{name}"{base},le="+Inf"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{name}"{base}}} {self._sums[name]:.6f}')
+                lines.append(f'{metric}_count{{stage="{name}"{base}}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+class Tracer:
+    """One per call: hands out turn traces and aggregates the finished ones."""
+
+    def __init__(self, call_id: str, max_turns: int = 500):
+        self.call_id = call_id
+        self.max_turns = max_turns
+        self.histograms = StageHistograms()
+        self.turns: List[TurnTrace] = []
+        self._next_turn = 0
+        self._lock = threading.Lock()
+
+    def new_turn(self, origin: Optional[float] = None) -> TurnTrace:
+        with self._lock:
+            self._next_turn += 1
+            return TurnTrace(self._next_turn, origin)
+
+    def finish(self, trace: TurnTrace):
+        with trace._lock:
+            spans = list(trace.spans)
+        for stage, start, end in spans:
+            self.histograms.observe(stage, max(0.0, end - start))
+        with self._lock:
+            self.turns.append(trace)
+            if len(self.turns) > self.max_turns:
+                del self.turns[0]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return self.histograms.summary()
+
+    def to_prometheus(self) -> str:
+        return self.histograms.to_prometheus(labels={"call_id": self.call_id})
+
+    def save(self, directory: str = "mom"):
+        """Write <call_id>_trace.json and <call_id>_metrics.prom into `directory`."""
+        out = Path(directory)
+        out.mkdir(exist_ok=True)
+        with self._lock:
+            turns = [t.to_dict() for t in self.turns]
+        with open(out / f"{self.call_id}_trace.json", "w", encoding="utf-8") as f:
+            json.dump({"call_id": self.call_id, "stages": self.summary(), "turns": turns}, f, indent=2)
+        with open(out / f"{self.call_id}_metrics.prom", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())